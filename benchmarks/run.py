@@ -0,0 +1,267 @@
+"""Benchmark suite for the client, models, exporters and GUI data paths.
+
+Everything runs offline, against synthetic pages and a local `MockIdealistaServer`.
+
+Usage:
+    python benchmarks/run.py [-o results.json] [-k filter] [--repeat N] [--compare baseline.json]
+
+Results are written as JSON (to stdout, or to the `-o` file) and a summary table is printed to
+stderr. With `--compare`, benchmarks more than `--threshold` slower than in the baseline file are
+reported and the script exits with status 1.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from idealista_api import Idealista, Search  # noqa: E402
+from idealista_api.crawl import load_location_ids  # noqa: E402
+from idealista_api.export import match_keywords, write_csv, write_json  # noqa: E402
+from idealista_api.mock_server import MockIdealistaServer, synthetic_listing  # noqa: E402
+from idealista_api.models import Response  # noqa: E402
+
+CATALOG = ROOT / "idealista_api_ui" / "locationId_list.json"
+KEYWORDS = ["Energy", "Certificate", "Energy Certificate", "Energy Certificate B", "Certificado Energético"]
+SEARCH = Search(
+    "es",
+    operation="sale",
+    property_type="homes",
+    location_id="0-EU-ES-28",
+    max_items=50,
+    num_page=1,
+    max_price=500000,
+    order="price",
+    sort="desc",
+    has_multimedia=True,
+    custom_filters={"bedrooms": "2,3", "elevator": True},
+)
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark.
+
+    The decorated generator prepares its fixtures and yields `(run, ops)`: a callable performing
+    one measured round, and the number of operations that round performs. Code after the `yield`
+    releases the fixtures once the benchmark is measured.
+    """
+
+    def decorator(func):
+        BENCHMARKS[name] = contextlib.contextmanager(func)
+        return func
+
+    return decorator
+
+
+def synthetic_page(page: int = 1, items: int = 50, total: int = 5000) -> dict:
+    form = {key: str(value) for key, value in SEARCH.to_json().items()}
+    first = (page - 1) * items
+    return {
+        "actualPage": page,
+        "itemsPerPage": items,
+        "lowerRangePosition": first,
+        "upperRangePosition": first + items,
+        "paginable": True,
+        "summary": [],
+        "total": total,
+        "totalPages": -(-total // items),
+        "elementList": [synthetic_listing("es", form, i) for i in range(first, first + items)],
+    }
+
+
+def synthetic_responses(pages: int) -> list[Response]:
+    return [Response(synthetic_page(page)) for page in range(1, pages + 1)]
+
+
+@benchmark("search_to_json")
+def bench_search_to_json():
+    def run():
+        for _ in range(10000):
+            SEARCH.to_json()
+
+    yield run, 10000
+
+
+@benchmark("search_canonical_bytes")
+def bench_search_canonical_bytes():
+    def run():
+        for _ in range(10000):
+            SEARCH.canonical_bytes()
+
+    yield run, 10000
+
+
+@benchmark("json_decode_page")
+def bench_json_decode():
+    body = json.dumps(synthetic_page()).encode()
+
+    def run():
+        for _ in range(200):
+            json.loads(body)
+
+    yield run, 200
+
+
+@benchmark("response_construction")
+def bench_response_construction():
+    page = synthetic_page()
+
+    def run():
+        for _ in range(200):
+            Response(page)
+
+    yield run, 200
+
+
+@benchmark("keyword_matching")
+def bench_keyword_matching():
+    properties = [prop for response in synthetic_responses(100) for prop in response.element_list]
+
+    def run():
+        for prop in properties:
+            match_keywords(prop["description"], KEYWORDS)
+
+    yield run, len(properties)
+
+
+@benchmark("export_csv")
+def bench_export_csv():
+    properties = [prop for response in synthetic_responses(100) for prop in response.element_list]
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "export.csv"
+
+        def run():
+            write_csv(path, properties, keywords=KEYWORDS)
+
+        yield run, len(properties)
+
+
+@benchmark("export_json")
+def bench_export_json():
+    responses = synthetic_responses(100)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "export.json"
+
+        def run():
+            write_json(path, responses, keywords=KEYWORDS)
+
+        yield run, sum(len(response.element_list) for response in responses)
+
+
+@benchmark("location_catalog_load")
+def bench_location_catalog():
+    def run():
+        load_location_ids(CATALOG)
+
+    yield run, 1
+
+
+def _fetch_benchmark(concurrency: int, pages: int = 40, latency: float = 0.01):
+    search = replace(SEARCH, custom_filters={})
+    with MockIdealistaServer(listings=pages * 50, latency=latency) as server, contextlib.closing(
+        Idealista(token=server.issue_token())
+    ) as client:
+
+        def fetch(page):
+            return client.query(replace(search, num_page=page))
+
+        def run():
+            with server.patch_urls(), ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(fetch, range(1, pages + 1)))
+
+        yield run, pages
+
+
+for _concurrency in (1, 4, 16):
+    benchmark(f"fetch_pages_concurrency_{_concurrency}")(lambda c=_concurrency: _fetch_benchmark(c))
+
+
+def measure(name: str, repeat: int) -> dict:
+    with BENCHMARKS[name]() as (run, ops):
+        run()  # Warm-up
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "name": name,
+        "ops": ops,
+        "repeat": repeat,
+        "seconds_min": min(timings),
+        "seconds_median": median,
+        "us_per_op": median / ops * 1e6,
+        "ops_per_second": ops / median,
+    }
+
+
+def compare(results: list[dict], baseline_path: str, threshold: float) -> list[str]:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {result["name"]: result for result in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["name"])
+        if previous is None:
+            continue
+        ratio = result["us_per_op"] / previous["us_per_op"]
+        result["baseline_ratio"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(f"{result['name']}: {ratio:.2f}x slower than baseline")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="Write results to this JSON file instead of stdout")
+    parser.add_argument("-k", "--filter", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5, help="Measured rounds per benchmark")
+    parser.add_argument("--compare", help="Baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Slowdown reported as a regression (default 10%%)")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    results = []
+    for name in names:
+        result = measure(name, args.repeat)
+        results.append(result)
+        print(f"{name:<32} {result['us_per_op']:>12.2f} us/op {result['ops_per_second']:>12.1f} ops/s", file=sys.stderr)
+
+    regressions = compare(results, args.compare, args.threshold) if args.compare else []
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+        "regressions": regressions,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
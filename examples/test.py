@@ -1,15 +1,16 @@
 from idealista_api import Idealista, Search
+from idealista_api.mock_server import MockIdealistaServer
 
-idealista = Idealista(
-    api_key="xgz27wkan54zkyb5l3pzpzra0o3n1y1b", api_secret="xJ57kvmCyzFs"
-)
+# Runs against a local stand-in for the API, so no credentials or network are needed
+with MockIdealistaServer(listings=79) as server, server.patch_urls():
+    idealista = Idealista(api_key="mock_key", api_secret="mock_secret")
 
-s = Search(
-    country="asd",
-    location_id="0-EU-ES-01",
-    property_type="homes",
-    operation="sale",
-    max_items=50,
-    num_page=2
-)
-print(idealista.query(s))
+    s = Search(
+        country="es",
+        location_id="0-EU-ES-01",
+        property_type="homes",
+        operation="sale",
+        max_items=50,
+        num_page=2
+    )
+    print(idealista.query(s))
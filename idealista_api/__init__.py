@@ -1,4 +1,22 @@
-from .client import Idealista
+from .client import AsyncIdealista, Idealista
+from .credentials import Credential, CredentialPool
+from .hooks import Hooks, MetricsCollector
 from .models import Search
+from .ratelimit import RateLimiter
+from .sessions import SessionPool
+from .transport import AsyncTransport, RequestsTransport, Transport
 
-__all__ = ["Idealista", "Search"]
+__all__ = [
+    "Idealista",
+    "AsyncIdealista",
+    "Search",
+    "RateLimiter",
+    "Credential",
+    "CredentialPool",
+    "Hooks",
+    "MetricsCollector",
+    "SessionPool",
+    "Transport",
+    "AsyncTransport",
+    "RequestsTransport",
+]
@@ -0,0 +1,180 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field, replace
+
+from .hooks import RequestEvent, emit
+from .models import Response, Search
+from .store import canonical_payload
+
+
+@dataclass(frozen=True)
+class PageSignature:
+    """Cheap summary of a results page, used to tell whether cached pages are still current"""
+
+    total: int
+    total_pages: int
+    first_code: str | None
+    last_code: str | None
+    page_hash: str
+
+    @classmethod
+    def of(cls, page: dict) -> "PageSignature":
+        elements = page.get("elementList", [])
+        return cls(
+            total=page.get("total", 0),
+            total_pages=page.get("totalPages", 0),
+            first_code=elements[0].get("propertyCode") if elements else None,
+            last_code=elements[-1].get("propertyCode") if elements else None,
+            page_hash=hashlib.blake2b(canonical_payload(elements), digest_size=16).hexdigest(),
+        )
+
+
+@dataclass
+class CachedResult:
+    """Pages of a search, as last fetched"""
+
+    pages: list[dict]
+    signatures: list[PageSignature]
+    fetched_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class CacheStats:
+    """Requests made and avoided by a `ResultCache`"""
+
+    fetches: int = 0  # Calls to `fetch`
+    requests: int = 0  # Pages requested from the API
+    pages_from_cache: int = 0  # Pages served from the cache
+
+
+class ResultCache:
+    """Caches every page of a search, and revalidates them with as few requests as possible.
+
+    When a cached search is fetched again, page 1 is requested and compared with the cached
+    one (`total`, `totalPages`, first and last `propertyCode` and a hash of the listings):
+
+    - If it's unchanged, the other pages are served from the cache: one request instead of N.
+    - If only the listings changed, pages are refetched in order until one matches its cached
+      version; the pages after it are assumed to be unchanged too. This suits orderings where
+      changes concentrate at the top, like the most recent listings first.
+    - If the totals changed, listings have shifted across pages and every page is refetched.
+
+    Args:
+        max_age (float | None): Seconds during which cached pages are returned without revalidating.
+        max_entries (int | None): Searches to keep, dropping the least recently fetched.
+    """
+
+    def __init__(self, max_age: float | None = None, max_entries: int | None = None):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: dict[bytes, CachedResult] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(search: Search) -> bytes:
+        """Return the cache key of a search (every parameter but the page number)"""
+        return replace(search, num_page=None).canonical_bytes()
+
+    def invalidate(self, search: Search | None = None):
+        """Drop a search from the cache, or every search if none is given"""
+        with self._lock:
+            if search is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self.key(search), None)
+
+    def fetch(self, client, search: Search, max_pages: int | None = None) -> list[Response]:
+        """Return every page of a search, from the cache where it's still current.
+
+        Args:
+            client (Idealista): Client used for the requests that can't be avoided.
+            search (Search): Search to fetch. Its `num_page` is ignored.
+            max_pages (int | None): Fetch at most this many pages.
+        """
+        key = self.key(search)
+        with self._lock:
+            cached = self._entries.get(key)
+            self.stats.fetches += 1
+
+        if (
+            cached is not None
+            and self.max_age is not None
+            and time.time() - cached.fetched_at < self.max_age
+            and len(cached.pages) >= self._wanted(cached.signatures[0], max_pages)
+        ):
+            pages = cached.pages[: self._wanted(cached.signatures[0], max_pages)]
+            self._hit(client, search, len(pages))
+            return [Response(page) for page in pages]
+
+        first = self._request(client, search, 1)
+        pages = [first]
+        last_page = first.get("totalPages", 0)
+        if max_pages is not None:
+            last_page = min(last_page, max_pages)
+
+        if cached is not None:
+            signature = PageSignature.of(first)
+            previous = cached.signatures[0]
+            same_totals = (signature.total, signature.total_pages) == (previous.total, previous.total_pages)
+            if signature == previous:
+                reuse_from = 2
+            elif same_totals:
+                reuse_from = None
+                for page in range(2, last_page + 1):
+                    fetched = self._request(client, search, page)
+                    pages.append(fetched)
+                    if page <= len(cached.signatures) and PageSignature.of(fetched) == cached.signatures[page - 1]:
+                        reuse_from = page + 1
+                        break
+            else:
+                reuse_from = None
+            if reuse_from is not None:
+                reused = cached.pages[reuse_from - 1:last_page]
+                pages.extend(reused)
+                self._hit(client, search, len(reused))
+
+        for page in range(len(pages) + 1, last_page + 1):
+            pages.append(self._request(client, search, page))
+
+        self._store(key, pages, cached, max_pages)
+        return [Response(page) for page in pages]
+
+    @staticmethod
+    def _wanted(first: PageSignature, max_pages: int | None) -> int:
+        """Return the number of pages a fetch of `max_pages` returns, given the signature of page 1"""
+        wanted = max(first.total_pages, 1)  # A search without results still has its first page
+        return wanted if max_pages is None else min(wanted, max_pages)
+
+    def _request(self, client, search: Search, page: int) -> dict:
+        with self._lock:
+            self.stats.requests += 1
+        return client.query(replace(search, num_page=page)).raw_data
+
+    def _hit(self, client, search: Search, pages: int):
+        with self._lock:
+            self.stats.pages_from_cache += pages
+        for _ in range(pages):
+            emit(getattr(client, "hooks", []), "on_cache_hit", RequestEvent(country=search.country, endpoint="search"))
+
+    def _store(self, key: bytes, pages: list[dict], cached: CachedResult | None, max_pages: int | None):
+        signatures = [PageSignature.of(page) for page in pages]
+        if cached is not None and max_pages is not None and len(cached.pages) > len(pages):
+            first, previous = signatures[0], cached.signatures[0]
+            if (first.total, first.total_pages) == (previous.total, previous.total_pages):
+                # Keep the cached pages beyond `max_pages`; they'll be revalidated when fetched.
+                # If the totals changed, listings have shifted and those pages are stale.
+                pages = pages + cached.pages[len(pages):]
+                signatures = signatures + cached.signatures[len(signatures):]
+        # Never keep more pages than the search now has
+        last_page = max(signatures[0].total_pages, 1)
+        entry = CachedResult(pages[:last_page], signatures[:last_page])
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            if self.max_entries is not None and len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from .models import Property, Response
+
+# Fields whose changes are reported as `updated` events (price changes have their own event)
+KEY_FIELDS = ("size", "rooms", "bathrooms", "floor", "address", "description", "status", "numPhotos", "hasVideo", "hasPlan")
+
+EVENT_TYPES = ("new", "price_changed", "updated", "removed", "relisted")
+
+
+@dataclass
+class ChangeEvent:
+    """A change detected in a listing"""
+
+    type: str  # One of `EVENT_TYPES`
+    property_code: str
+    property: Property | None = None  # Current listing (None for `removed` events)
+    price: float | None = None
+    previous_price: float | None = None
+
+
+def fingerprint(prop: Property) -> int:
+    """Return a 64-bit hash of the key fields of a listing"""
+    values = [prop[key] for key in KEY_FIELDS]
+    digest = hashlib.blake2b(json.dumps(values, default=str).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class ChangeDetector:
+    """Detects new, changed, removed and relisted listings across repeated runs of a search.
+
+    Only a compact fingerprint is kept per `propertyCode`: the price, a hash of `KEY_FIELDS`, the
+    scan in which it was last seen and whether it's currently listed. Each listing is checked in
+    constant time, so pages can be processed as they're fetched.
+
+    Listings are only reported as removed at the end of a scan (`end_scan`), so a scan should
+    cover every page of the search; use one detector per search.
+    """
+
+    def __init__(self):
+        # propertyCode -> (price, fingerprint, last scan seen, listed)
+        self._state: dict[str, tuple[float | None, int, int, bool]] = {}
+        self.scan_number = 0
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def begin_scan(self):
+        """Start a new run of the search"""
+        self.scan_number += 1
+
+    def update(self, properties: Iterable[Property]) -> list[ChangeEvent]:
+        """Process listings of the current scan and return the changes found"""
+        if self.scan_number == 0:
+            self.begin_scan()
+        events = []
+        state = self._state
+        scan = self.scan_number
+        for prop in properties:
+            code = prop.property_code
+            if code is None:
+                continue
+            price = prop.price
+            digest = fingerprint(prop)
+            previous = state.get(code)
+            state[code] = (price, digest, scan, True)
+            if previous is None:
+                events.append(ChangeEvent("new", code, prop, price))
+                continue
+            previous_price, previous_digest, _, listed = previous
+            if not listed:
+                events.append(ChangeEvent("relisted", code, prop, price, previous_price))
+            elif price != previous_price:
+                events.append(ChangeEvent("price_changed", code, prop, price, previous_price))
+            elif digest != previous_digest:
+                events.append(ChangeEvent("updated", code, prop, price, previous_price))
+        return events
+
+    def end_scan(self) -> list[ChangeEvent]:
+        """Finish the current scan, returning `removed` events for listings it didn't see"""
+        events = []
+        for code, (price, digest, last_seen, listed) in self._state.items():
+            if listed and last_seen != self.scan_number:
+                self._state[code] = (price, digest, last_seen, False)
+                events.append(ChangeEvent("removed", code, None, None, price))
+        return events
+
+    def scan(self, responses: Iterable[Response]) -> Iterator[ChangeEvent]:
+        """Run a whole scan over fetched pages, yielding events as each page is processed.
+
+        Example:
+            `for event in detector.scan(client.iter_pages(search)): ...`
+        """
+        self.begin_scan()
+        for response in responses:
+            yield from self.update(response.element_list)
+        yield from self.end_scan()
+
+    def save(self, path: str | os.PathLike):
+        """Save the fingerprints to a JSON file"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"scan_number": self.scan_number, "listings": self._state}, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "ChangeDetector":
+        """Load fingerprints saved with `save`"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        detector = cls()
+        detector.scan_number = data["scan_number"]
+        detector._state = {code: tuple(values) for code, values in data["listings"].items()}
+        return detector
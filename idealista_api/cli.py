@@ -0,0 +1,513 @@
+"""Command line crawler: `idealista-crawl`.
+
+Runs searches from a JSON/YAML spec file or from flags through a concurrent, rate-limited and
+resumable fetch pipeline, streaming listings to NDJSON, Parquet or SQLite.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+import typing
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+
+from .client import Idealista
+from .crawl import load_location_ids
+from .exceptions import APIException, AuthenticationException
+from .export import CSV_PROJECTION
+from .models import Property, Response, Search
+from .projection import Field, Projection
+from .ratelimit import RateLimiter
+from .sessions import SessionPool
+
+# Seconds between checkpoint writes (it's also written when the crawl ends)
+CHECKPOINT_INTERVAL = 1.0
+
+# Columns of the SQLite `listings` table, between the page and the fetch time
+SQLITE_PROJECTION = Projection([Field("property_code", "propertyCode", None, str), Field("price", None, None, float)])
+# Columns of Parquet files, between the page and the listing as JSON
+PARQUET_PROJECTION = Projection(
+    [Field("property_code", "propertyCode", None, str)]
+    + [Field(f.name, f.path, "", str) for f in CSV_PROJECTION.fields]
+    + [Field("latitude", None, None, float), Field("longitude", None, None, float)]
+)
+SQLITE_TYPES = {str: "TEXT", int: "INTEGER", float: "REAL", bool: "INTEGER"}
+
+
+def _field_type(annotation) -> type:
+    """Return the type of a `Search` field, without its `None` option"""
+    for option in typing.get_args(annotation) or (annotation,):
+        if option is not type(None):
+            return typing.get_origin(option) or option
+    return str
+
+
+def _parse_bool(value: str) -> bool:
+    if value.lower() in ("1", "true", "yes", "y"):
+        return True
+    if value.lower() in ("0", "false", "no", "n"):
+        return False
+    raise argparse.ArgumentTypeError(f"Invalid boolean: {value}")
+
+
+def _parse_filter(value: str) -> tuple[str, str | bool | int | float]:
+    key, sep, raw = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Filters must look like key=value, got {value}")
+    for parse in (int, float):
+        try:
+            return key, parse(raw)
+        except ValueError:
+            pass
+    if raw.lower() in ("true", "false"):
+        return key, raw.lower() == "true"
+    return key, raw
+
+
+def load_specs(path: str | os.PathLike) -> list[dict]:
+    """Read search specs from a JSON or YAML file.
+
+    The file holds either a list of searches, or an object with optional `defaults` applied to
+    every entry of `searches`. Keys are `Search` field names.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if str(path).endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("YAML spec files require PyYAML (pip install pyyaml).") from e
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    if isinstance(data, list):
+        return data
+    defaults = data.get("defaults", {})
+    return [{**defaults, **spec} for spec in data.get("searches", [])]
+
+
+def build_searches(specs: list[dict]) -> list[Search]:
+    """Build searches from specs, expanding list-valued `location_id`s into one search each"""
+    searches = []
+    for spec in specs:
+        spec = dict(spec)
+        location_ids = spec.pop("location_id", None)
+        if not isinstance(location_ids, list):
+            location_ids = [location_ids]
+        for location_id in location_ids:
+            searches.append(Search(**spec, location_id=location_id))
+    return searches
+
+
+def search_key(search: Search) -> str:
+    """Identify a search across runs, regardless of the page"""
+    return replace(search, num_page=None).canonical_bytes().decode()
+
+
+class Checkpoint:
+    """Pages completed so far, saved to a JSON file so interrupted crawls can be resumed"""
+
+    def __init__(self, path: str | os.PathLike | None):
+        self.path = path
+        self.searches: dict[str, dict] = {}
+        if path is not None and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.searches = json.load(f)["searches"]
+
+    def total_pages(self, key: str) -> int | None:
+        return self.searches.get(key, {}).get("total_pages")
+
+    def done(self, key: str) -> set[int]:
+        return set(self.searches.get(key, {}).get("done", []))
+
+    def mark(self, key: str, page: int, total_pages: int):
+        entry = self.searches.setdefault(key, {"total_pages": total_pages, "done": []})
+        entry["total_pages"] = total_pages
+        entry["done"].append(page)
+
+    def save(self):
+        if self.path is None:
+            return
+        # Write atomically, so a crash mid-write doesn't lose the progress
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"searches": self.searches}, f)
+        os.replace(tmp, self.path)
+
+
+class NDJSONSink:
+    """Appends listings to a newline-delimited JSON file"""
+
+    def __init__(self, path: str | os.PathLike):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, key: str, page: int, properties: list[Property]):
+        self.file.writelines(json.dumps(prop.to_dict(), ensure_ascii=False) + "\n" for prop in properties)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def _typed(projection: Projection, reserved: set[str]) -> Projection:
+    """Return the projection with untyped fields stored as text, checking its column names"""
+    clashes = reserved.intersection(projection.columns)
+    if clashes:
+        raise ValueError(f"Column names reserved by the output: {', '.join(sorted(clashes))}")
+    return Projection(f if f.type is not None else replace(f, type=str) for f in projection.fields)
+
+
+def _quote(name: str) -> str:
+    """Quote an SQL identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLiteSink:
+    """Inserts listings into a `listings` table, one row per listing and fetch.
+
+    Args:
+        path (str | os.PathLike): Database file.
+        projection (Projection): Columns extracted from each listing (untyped ones are stored as text).
+            Columns missing from an existing table are added to it.
+    """
+
+    def __init__(self, path: str | os.PathLike, projection: Projection = SQLITE_PROJECTION):
+        self.projection = _typed(projection, {"search", "page", "fetched_at", "data"})
+        self.connection = sqlite3.connect(path)
+        columns = [("search", "TEXT"), ("page", "INTEGER")]
+        columns += [(f.name, SQLITE_TYPES[f.type]) for f in self.projection.fields]
+        columns += [("fetched_at", "REAL"), ("data", "TEXT")]
+        self.connection.execute("CREATE TABLE IF NOT EXISTS listings (" + ", ".join(f"{_quote(name)} {kind}" for name, kind in columns) + ")")
+        existing = {row[1] for row in self.connection.execute("PRAGMA table_info(listings)")}
+        for name, kind in columns:
+            if name not in existing:
+                self.connection.execute(f"ALTER TABLE listings ADD COLUMN {_quote(name)} {kind}")
+        self.insert = (
+            "INSERT INTO listings (" + ", ".join(_quote(name) for name, _ in columns) + ") VALUES (" + ", ".join("?" * len(columns)) + ")"
+        )
+
+    def write(self, key: str, page: int, properties: list[Property]):
+        now = time.time()
+        row_of = self.projection.row
+        with self.connection:
+            self.connection.executemany(
+                self.insert,
+                [(key, page, *row_of(prop), now, json.dumps(prop.to_dict(), ensure_ascii=False)) for prop in properties],
+            )
+
+    def close(self):
+        self.connection.close()
+
+
+class ParquetSink:
+    """Writes listings to a Parquet file, one row group per page. Requires `pyarrow`.
+
+    Parquet files can't be appended to, so when resuming into an existing file the new listings
+    go to a numbered file next to it (`listings.1.parquet`, ...).
+
+    Args:
+        path (str | os.PathLike): Output file.
+        projection (Projection): Columns extracted from each listing (untyped ones are stored as text).
+    """
+
+    def __init__(self, path: str | os.PathLike, projection: Projection = PARQUET_PROJECTION):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow (pip install idealista_api[parquet]).") from e
+        self._pa = pyarrow
+        path = Path(path)
+        candidate, n = path, 0
+        while candidate.exists():
+            n += 1
+            candidate = path.with_suffix(f".{n}{path.suffix}")
+        self.path = candidate
+        self.projection = _typed(projection, {"search", "page", "data"})
+        arrow_types = {str: pyarrow.string(), int: pyarrow.int64(), float: pyarrow.float64(), bool: pyarrow.bool_()}
+        self.schema = pyarrow.schema(
+            [("search", pyarrow.string()), ("page", pyarrow.int32())]
+            + [(f.name, arrow_types[f.type]) for f in self.projection.fields]
+            + [("data", pyarrow.string())]
+        )
+        self.writer = pyarrow.parquet.ParquetWriter(str(self.path), self.schema)
+
+    def write(self, key: str, page: int, properties: list[Property]):
+        columns = [[key] * len(properties), [page] * len(properties)]
+        columns += self.projection.columnar(properties)
+        columns.append([json.dumps(prop.to_dict(), ensure_ascii=False) for prop in properties])
+        self.writer.write_table(self._pa.Table.from_pydict(dict(zip(self.schema.names, columns)), schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def open_sink(path: str, output_format: str | None = None, columns: list[Field | str] | None = None):
+    """Open the output sink matching the format, or the file extension.
+
+    Args:
+        path (str): Output file.
+        output_format (str | None): `ndjson`, `sqlite` or `parquet` (by default, from the extension).
+        columns (list[Field | str] | None): Extra columns for the SQLite and Parquet sinks, as
+            `Field`s or `[name=]path[:type]` specs (see `idealista_api.projection`).
+    """
+    output_format = output_format or {".parquet": "parquet", ".db": "sqlite", ".sqlite": "sqlite"}.get(Path(path).suffix, "ndjson")
+    if output_format == "ndjson":
+        if columns:
+            raise ValueError("NDJSON output has no columns: it holds the listings as returned by the API.")
+        return NDJSONSink(path)
+    if output_format == "sqlite":
+        return SQLiteSink(path, SQLITE_PROJECTION + (columns or []))
+    return ParquetSink(path, PARQUET_PROJECTION + (columns or []))
+
+
+@dataclass
+class CrawlStats:
+    """Live counters of a crawl"""
+
+    started: float = field(default_factory=time.monotonic)
+    searches: int = 0
+    searches_done: int = 0
+    pages: int = 0
+    pages_skipped: int = 0
+    listings: int = 0
+    errors: int = 0
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (
+            f"[{elapsed:7.1f}s] searches {self.searches_done}/{self.searches}  pages {self.pages} "
+            f"({self.pages / elapsed:.1f}/s)  listings {self.listings} ({self.listings / elapsed:.0f}/s)  "
+            f"skipped {self.pages_skipped}  errors {self.errors}"
+        )
+
+
+def run_crawl(
+    client: Idealista,
+    searches: list[Search],
+    sink,
+    workers: int = 4,
+    max_pages: int | None = None,
+    checkpoint: Checkpoint | None = None,
+    progress=None,
+    progress_interval: float = 2.0,
+) -> CrawlStats:
+    """Fetch every page of each search concurrently, writing listings to `sink`.
+
+    Page 1 of each search is fetched first; once it reports the number of pages, the remaining
+    pages are fetched in parallel. Pages recorded in the checkpoint are skipped, and failed pages
+    aren't recorded, so running the crawl again with the same checkpoint retries them.
+
+    Args:
+        client (Idealista): Client used for the requests (its rate limiter applies to all workers).
+        searches (list[Search]): Searches to crawl; their `num_page` is ignored.
+        sink: Output sink, see `open_sink`.
+        workers (int): Concurrent requests.
+        max_pages (int | None): Maximum pages to fetch per search.
+        checkpoint (Checkpoint | None): Progress of previous runs, updated as pages complete.
+        progress (Callable[[CrawlStats], None] | None): Called every `progress_interval` seconds.
+        progress_interval (float): Seconds between progress reports.
+    """
+    checkpoint = checkpoint or Checkpoint(None)
+    # Identical searches would only fetch the same pages twice
+    searches = {search_key(search): search for search in searches}
+    stats = CrawlStats(searches=len(searches))
+    pending: dict[Future, tuple[Search, str, int]] = {}
+    remaining_pages: dict[str, int] = {}
+    last_report = last_save = time.monotonic()
+
+    def limit(total_pages: int) -> int:
+        return min(total_pages, max_pages) if max_pages is not None else total_pages
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def submit(search: Search, key: str, page: int):
+        future = executor.submit(client.query, replace(search, num_page=page))
+        pending[future] = (search, key, page)
+
+    def submit_rest(search: Search, key: str, total_pages: int, done: set[int]):
+        pages = [page for page in range(2, limit(total_pages) + 1) if page not in done]
+        stats.pages_skipped += limit(total_pages) - 1 - len(pages)
+        remaining_pages[key] = len(pages)
+        for page in pages:
+            submit(search, key, page)
+        if not pages:
+            stats.searches_done += 1
+
+    try:
+        for key, search in searches.items():
+            done = checkpoint.done(key)
+            total_pages = checkpoint.total_pages(key)
+            if 1 in done and total_pages is not None:
+                stats.pages_skipped += 1
+                submit_rest(search, key, total_pages, done)
+            else:
+                submit(search, key, 1)
+
+        while pending:
+            finished, _ = wait(pending, timeout=progress_interval, return_when=FIRST_COMPLETED)
+            for future in finished:
+                search, key, page = pending.pop(future)
+                try:
+                    response: Response = future.result()
+                except AuthenticationException:
+                    raise
+                except (APIException, OSError, ValueError) as e:
+                    # Connection failures, API errors, and malformed responses or parameters
+                    stats.errors += 1
+                    reason = e if isinstance(e, APIException) else f"{type(e).__name__}: {e}"
+                    print(f"Error fetching page {page} of {search.location_id or search.center}: {reason}", file=sys.stderr)
+                    response = None
+                if response is not None:
+                    sink.write(key, page, response.element_list)
+                    checkpoint.mark(key, page, response.total_pages)
+                    stats.pages += 1
+                    stats.listings += len(response.element_list)
+                    if page == 1:
+                        submit_rest(search, key, response.total_pages, checkpoint.done(key))
+                        continue
+                elif page == 1:
+                    stats.searches_done += 1
+                    continue
+                remaining_pages[key] -= 1
+                if remaining_pages[key] == 0:
+                    stats.searches_done += 1
+            if time.monotonic() - last_save >= CHECKPOINT_INTERVAL:
+                checkpoint.save()
+                last_save = time.monotonic()
+            if progress is not None and time.monotonic() - last_report >= progress_interval:
+                progress(stats)
+                last_report = time.monotonic()
+    except BaseException:
+        # Don't wait for queued pages on errors or Ctrl+C; unfinished pages stay out of the checkpoint
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        checkpoint.save()
+    executor.shutdown()
+    return stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="idealista-crawl", description=__doc__.splitlines()[0])
+    parser.add_argument("output", help="Output file (.ndjson, .parquet, .db/.sqlite)")
+    parser.add_argument("--spec", help="JSON or YAML file with the searches to run")
+    parser.add_argument("--format", choices=["ndjson", "parquet", "sqlite"], help="Output format (by default, from the file extension)")
+    parser.add_argument(
+        "--columns", nargs="+", default=[], metavar="[NAME=]PATH[:TYPE]",
+        help="Extra listing fields to store as SQLite/Parquet columns, e.g. size:float detailedType.typology",
+    )
+
+    auth = parser.add_argument_group("authentication")
+    auth.add_argument("--api-key", default=os.getenv("IDEALISTA_API_KEY"), help="API key (default: $IDEALISTA_API_KEY)")
+    auth.add_argument("--api-secret", default=os.getenv("IDEALISTA_API_SECRET"), help="API secret (default: $IDEALISTA_API_SECRET)")
+    auth.add_argument("--token", default=os.getenv("IDEALISTA_TOKEN"), help="Bearer token, instead of a key and secret")
+
+    pipeline = parser.add_argument_group("pipeline")
+    pipeline.add_argument("--workers", type=int, default=4, help="Concurrent requests (default 4)")
+    pipeline.add_argument("--rps", type=float, help="Maximum requests per second")
+    pipeline.add_argument("--max-pages", type=int, help="Maximum pages per search")
+    pipeline.add_argument("--max-retries", type=int, default=3, help="Retries on connection errors, 429 and 5xx (default 3)")
+    pipeline.add_argument("--checkpoint", help="Progress file; rerun with the same file to resume an interrupted crawl")
+    pipeline.add_argument("--progress-interval", type=float, default=2.0, help="Seconds between stats lines (default 2)")
+    pipeline.add_argument("--quiet", action="store_true", help="Don't print progress")
+
+    search = parser.add_argument_group("search (used when no --spec is given, or as defaults for it)")
+    for f in fields(Search):
+        if f.name in ("custom_filters", "num_page"):
+            continue
+        flag = "--" + f.name.replace("_", "-")
+        kind = _field_type(f.type)
+        if f.name == "location_id":
+            search.add_argument(flag, action="append", help="Location ID (repeat for several searches)")
+        elif kind is bool:
+            search.add_argument(flag, type=_parse_bool, metavar="BOOL")
+        elif kind is list:
+            search.add_argument(flag, nargs="+")
+        else:
+            search.add_argument(flag, type=kind)
+    search.add_argument("--filter", action="append", type=_parse_filter, default=[], metavar="KEY=VALUE", help="Custom filter (repeatable)")
+    search.add_argument("--locations-file", help="Location catalog (e.g. locationId_list.json) to search every location of")
+    search.add_argument("--location-type", action="append", help="Only catalog locations of this type (repeatable)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    flag_values = {
+        f.name: getattr(args, f.name)
+        for f in fields(Search)
+        if f.name not in ("custom_filters", "num_page") and getattr(args, f.name, None) is not None
+    }
+    if args.filter:
+        flag_values["custom_filters"] = dict(args.filter)
+    if args.locations_file:
+        if not args.country:
+            parser.error("--locations-file requires --country")
+        flag_values["location_id"] = load_location_ids(args.locations_file, country=args.country, types=args.location_type)
+
+    if args.spec:
+        specs = [{**flag_values, **spec} for spec in load_specs(args.spec)]
+    else:
+        missing = [name for name in ("country", "operation", "property_type") if name not in flag_values]
+        if missing:
+            parser.error("without --spec, these are required: " + ", ".join("--" + name.replace("_", "-") for name in missing))
+        specs = [flag_values]
+    try:
+        searches = build_searches(specs)
+    except TypeError as e:
+        parser.error(f"invalid search: {e}")
+
+    if args.token is None and (args.api_key is None or args.api_secret is None):
+        parser.error("provide --token, or --api-key and --api-secret (or the IDEALISTA_* environment variables)")
+    try:
+        client = Idealista(
+            api_key=args.api_key,
+            api_secret=args.api_secret,
+            token=args.token,
+            rate_limiter=RateLimiter(args.rps) if args.rps else None,
+            max_retries=args.max_retries,
+            # Every worker thread shares the client, so its connection pool must hold them all
+            sessions=SessionPool(pool_maxsize=max(10, args.workers)),
+        )
+    except AuthenticationException as e:
+        print(f"Authentication failed: {e}", file=sys.stderr)
+        return 2
+
+    def progress(stats: CrawlStats):
+        end = "\r" if sys.stderr.isatty() else "\n"
+        print(stats.line(), end=end, file=sys.stderr, flush=True)
+
+    try:
+        sink = open_sink(args.output, args.format, args.columns)
+    except (ImportError, ValueError) as e:
+        parser.error(str(e))
+    checkpoint = Checkpoint(args.checkpoint)
+    try:
+        stats = run_crawl(
+            client,
+            searches,
+            sink,
+            workers=args.workers,
+            max_pages=args.max_pages,
+            checkpoint=checkpoint,
+            progress=None if args.quiet else progress,
+            progress_interval=args.progress_interval,
+        )
+    except KeyboardInterrupt:
+        print("\nInterrupted; rerun with the same --checkpoint to resume.", file=sys.stderr)
+        return 130
+    finally:
+        sink.close()
+    if not args.quiet:
+        print(stats.line(), file=sys.stderr)
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,205 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import replace
+
 import requests
-from .utils import get_bearer_token
+from .utils import TOKEN_FORM, get_bearer_token, parse_token_response, token_headers
 from .models import Response, Search
-from .exceptions import APIException
-from .consts import URL, ACCEPTED_COUNTRIES
+from .exceptions import APIException, AuthenticationException, QuotaExceededException, TransportError
+from . import consts
+from .credentials import Credential, CredentialPool
+from .debug import log_payload, trace_request
+from .hooks import Hooks, RequestEvent, emit
+from .ratelimit import RateLimiter
+from .sessions import SessionPool
+from .transport import AsyncTransport, LoopTransport, RequestsTransport, ThreadedTransport, Transport, TransportResponse
+
+# Content codings the client can decode: gzip and deflate, plus br (and zstd) when their decoders are installed
+ACCEPT_ENCODING = requests.utils.DEFAULT_ACCEPT_ENCODING
+
+# Status codes retried when `max_retries` is set (429 is retried only without a credential pool)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 time_format = "%Y-%m-%d %H:%M:%S"
 
 
-class Idealista:
+class _SearchClient:
+    """Request building and response handling shared by the sync and async clients"""
+
+    def _configure(
+        self,
+        rate_limiter: RateLimiter | None,
+        credentials: CredentialPool | None,
+        hooks: list[Hooks] | None,
+        max_retries: int,
+        retry_backoff: float,
+        compression: bool,
+        search_url: str | None,
+        base_url: str | None,
+    ):
+        self.credentials = credentials
+        self.hooks = list(hooks or [])
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.rate_limiter = rate_limiter
+        # None follows `consts.URL` and `consts.TOKEN_URL`, so overriding them redirects every client
+        if base_url is not None:
+            base_url = base_url.rstrip("/")
+            search_url = search_url or base_url + "/3.5/{country}/search"
+        self.search_url = search_url
+        self.token_url = base_url + "/oauth/token" if base_url is not None else None
+        self.headers = {
+            "User-Agent": "idealista_api_python/1.0",
+            "Accept-Encoding": ACCEPT_ENCODING if compression else "identity",
+        }
+
+    def _set_token(self, token: str | None):
+        self.token = token
+        if token is not None:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def _prepare(self, request: Search) -> tuple[dict, bytes, str]:
+        if request.country not in consts.ACCEPTED_COUNTRIES:
+            raise ValueError(f"Country '{request.country}' is not supported. Supported countries are: {', '.join(consts.ACCEPTED_COUNTRIES)}")
+        # Encoded once, and sent as is on every attempt
+        return request.to_json(), request.canonical_bytes(), (self.search_url or consts.URL).format(country=request.country)
+
+    def _request_headers(self, token: str | None) -> dict[str, str]:
+        headers = {**self.headers, "Content-Type": "application/x-www-form-urlencoded"}
+        if token is not None:
+            headers["Authorization"] = f"Bearer {token}"
+        return headers
+
+    def _failed(self, event: RequestEvent, error: TransportError, start: float, body: bytes, form: dict) -> float:
+        """Record a request that got no response, and return the delay before retrying it"""
+        event.elapsed = time.perf_counter() - start
+        event.bytes_sent = len(body)
+        event.error = str(error)
+        emit(self.hooks, "on_request_end", event)
+        trace_request(event, form)
+        if event.attempt > self.max_retries:
+            raise error
+        delay = self.retry_backoff * 2 ** (event.attempt - 1)
+        emit(self.hooks, "on_retry", event, delay)
+        return delay
+
+    def _received(
+        self,
+        event: RequestEvent,
+        response: TransportResponse,
+        start: float,
+        body: bytes,
+        form: dict,
+        credential: Credential | None,
+    ) -> tuple[dict | None, float | None]:
+        """Record a response, and return its payload and the delay before retrying (None if final).
+
+        The payload is None for error responses that aren't JSON, e.g. a proxy's HTML error page.
+        """
+        event.elapsed = time.perf_counter() - start
+        event.status_code = response.status_code
+        event.bytes_sent = len(body)
+        event.bytes_received = len(response.content)
+        event.wire_bytes_received = response.wire_bytes
+        emit(self.hooks, "on_request_end", event)
+
+        if response.status_code == 200:
+            response_dict = response.json()
+        else:
+            # Whether an error is retried depends only on its status, not on its body being JSON
+            try:
+                response_dict = response.json()
+            except ValueError:
+                response_dict = None
+        if response_dict is not None:
+            log_payload(event, response_dict)
+        trace_request(event, form, response_dict)
+        # With a credential pool, auth and quota errors are retried with another key. Throttled
+        # keys come back after a cooldown, so 429s are only retried until every key had a go.
+        if (
+            credential is not None
+            and self.credentials.report(credential, response.status_code, response_dict or {})
+            and (response.status_code != 429 or event.attempt <= self.max_retries + len(self.credentials))
+        ):
+            delay = 0.0
+        elif response.status_code in RETRY_STATUSES and event.attempt <= self.max_retries:
+            delay = self._retry_delay(response, event.attempt)
+        else:
+            return response_dict, None
+        emit(self.hooks, "on_retry", event, delay)
+        return response_dict, delay
+
+    def _result(self, response: TransportResponse, response_dict: dict | None) -> Response:
+        if response.status_code != 200:
+            exception_class = {401: AuthenticationException, 429: QuotaExceededException}.get(response.status_code, APIException)
+            if response_dict is None:
+                text = response.content[:500].decode("utf-8", errors="replace").strip() or "Empty response body"
+                raise exception_class(f"Error querying API: HTTP {response.status_code} - {text}", status_code=response.status_code)
+            error_description = response_dict.get("error_description") or response_dict.get("message") or "No description available"
+            raise exception_class(
+                f"Error querying API: {response_dict.get('error', 'Unknown error')} - {error_description}",
+                response=response_dict,
+                status_code=response.status_code,
+            )
+        return Response(response_dict)
+
+    def _retry_delay(self, response: TransportResponse, attempt: int) -> float:
+        """Return how long to wait before retrying, honouring the `Retry-After` header"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.retry_backoff * 2 ** (attempt - 1)
+
+
+class Idealista(_SearchClient):
     """Idealista API client."""
 
-    session: requests.Session
+    session: requests.Session | None
 
     def __init__(
         self,
         api_key: str | None = None,
         api_secret: str | None = None,
         token: str | None = None,
+        rate_limiter: RateLimiter | None = None,
+        credentials: CredentialPool | None = None,
+        hooks: list[Hooks] | None = None,
+        max_retries: int = 0,
+        retry_backoff: float = 0.5,
+        compression: bool = True,
+        sessions: SessionPool | None = None,
+        search_url: str | None = None,
+        base_url: str | None = None,
+        transport: Transport | None = None,
     ):
-        if token is not None:
-            self.token = token
+        if sessions is not None and transport is not None:
+            raise ValueError("Pass either sessions or a transport, not both (use RequestsTransport(sessions)).")
+        self._configure(rate_limiter, credentials, hooks, max_retries, retry_backoff, compression, search_url, base_url)
+        self.transport = transport or RequestsTransport(sessions)
+        # Sessions of the default transport, e.g. to mount adapters on
+        self.sessions = getattr(self.transport, "sessions", None)
+        self.session = self.sessions.session if self.sessions is not None else None
+
+        if credentials is not None:
+            # Tokens are managed per credential and sent with each request
+            self._set_token(None)
+        elif token is not None:
+            self._set_token(token)
         elif api_key is not None and api_secret is not None:
             self.api_key = api_key
             self.api_secret = api_secret
 
-            self.token = get_bearer_token(api_key=api_key, secret=api_secret)
+            start = time.perf_counter()
+            self._set_token(get_bearer_token(api_key=api_key, secret=api_secret, token_url=self.token_url, transport=self.transport))
+            emit(self.hooks, "on_token_refresh", api_key, time.perf_counter() - start)
         else:
             raise Exception(
-                "No valid authentication method provided. Either a token or an API key and secret are required."
+                "No valid authentication method provided. Either a token, an API key and secret, or a credential pool are required."
             )
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Authorization": f"Bearer {self.token}",
-                "User-Agent": "idealista_api_python/1.0",
-            }
-        )
 
     def query(self, request: Search) -> Response:
         """
@@ -47,19 +211,163 @@ class Idealista:
         Returns:
             list[Property]: List of properties returned by the API.
         """
-        if request.country not in ACCEPTED_COUNTRIES:
-            raise ValueError(f"Country '{request.country}' is not supported. Supported countries are: {', '.join(ACCEPTED_COUNTRIES)}")
-        else:
-            response = self.session.post(
-                url=URL.format(country=request.country),
-                data=request.to_json(),
-            )
-            
-        response_dict = response.json()
-        if response.status_code != 200:
-            error_description = response_dict.get("error_description") or response_dict.get("message") or "No description available"
-            raise APIException(
-                f"Error querying API: {response_dict.get('error', 'Unknown error')} - {error_description}",
-                response=response_dict
+        form, body, url = self._prepare(request)
+        attempt = 0
+        while True:
+            attempt += 1
+            event = RequestEvent(country=request.country, endpoint="search", attempt=attempt)
+            credential = token = None
+            if self.credentials is not None:
+                credential, token = self.credentials.acquire(self.hooks, self.token_url, self.transport)
+            headers = self._request_headers(token)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            emit(self.hooks, "on_request_start", event)
+            start = time.perf_counter()
+            try:
+                response = self.transport.post(url, body, headers, request.country)
+            except TransportError as e:
+                delay = self._failed(event, e, start, body, form)
+            else:
+                response_dict, delay = self._received(event, response, start, body, form, credential)
+                if delay is None:
+                    return self._result(response, response_dict)
+            if delay:
+                time.sleep(delay)
+
+    def iter_pages(self, request: Search, max_pages: int | None = None) -> Iterator[Response]:
+        """
+        Queries every page of a search, in order.
+
+        Args:
+            request (Search): Request data. Its `num_page` is used as the first page (1 if unset).
+            max_pages (int | None): Stop after this many pages, if given.
+
+        Yields:
+            Response: One response per fetched page.
+        """
+        page = request.num_page or 1
+        fetched = 0
+        while True:
+            response = self.query(replace(request, num_page=page))
+            yield response
+            fetched += 1
+            if page >= response.total_pages or (max_pages is not None and fetched >= max_pages):
+                return
+            page += 1
+
+    def close(self):
+        """Close the transport's connections"""
+        self.transport.close()
+
+
+class AsyncIdealista(_SearchClient):
+    """Idealista API client for asyncio applications.
+
+    Takes the same parameters as `Idealista`, but with an `AsyncTransport`. Tokens for an API key
+    and secret are requested on the first query, and queries can run concurrently with
+    `asyncio.gather`; the rate limiter and retries wait without blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        api_secret: str | None = None,
+        token: str | None = None,
+        rate_limiter: RateLimiter | None = None,
+        credentials: CredentialPool | None = None,
+        hooks: list[Hooks] | None = None,
+        max_retries: int = 0,
+        retry_backoff: float = 0.5,
+        compression: bool = True,
+        search_url: str | None = None,
+        base_url: str | None = None,
+        transport: AsyncTransport | None = None,
+    ):
+        if credentials is None and token is None and (api_key is None or api_secret is None):
+            raise Exception(
+                "No valid authentication method provided. Either a token, an API key and secret, or a credential pool are required."
             )
-        return Response(response_dict)
+        self._configure(rate_limiter, credentials, hooks, max_retries, retry_backoff, compression, search_url, base_url)
+        self.transport = transport or ThreadedTransport()
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self._set_token(token if credentials is None else None)
+        self._token_lock: asyncio.Lock | None = None
+
+    async def _ensure_token(self):
+        if self.token is not None or self.credentials is not None:
+            return
+        # Created lazily, so it binds to the loop running the queries
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            if self.token is not None:
+                return
+            start = time.perf_counter()
+            url = self.token_url or consts.TOKEN_URL
+            response = await self.transport.post(url, TOKEN_FORM, token_headers(self.api_key, self.api_secret))
+            self._set_token(parse_token_response(response.json())[0])
+            emit(self.hooks, "on_token_refresh", self.api_key, time.perf_counter() - start)
+
+    def _pool_transport(self) -> Transport:
+        """Return the blocking transport the credential pool requests tokens with"""
+        if isinstance(self.transport, ThreadedTransport):
+            # Sending directly from the pool's thread; going through the loop could wait for a
+            # free executor thread while the pool holds one
+            return self.transport.transport
+        return LoopTransport(self.transport, asyncio.get_running_loop())
+
+    async def query(self, request: Search) -> Response:
+        """Makes a query to Idealista's API, see `Idealista.query`"""
+        form, body, url = self._prepare(request)
+        await self._ensure_token()
+        attempt = 0
+        while True:
+            attempt += 1
+            event = RequestEvent(country=request.country, endpoint="search", attempt=attempt)
+            credential = token = None
+            if self.credentials is not None:
+                # The pool blocks (on token requests and cooldowns), so it runs in a worker thread
+                credential, token = await asyncio.to_thread(self.credentials.acquire, self.hooks, self.token_url, self._pool_transport())
+            headers = self._request_headers(token)
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve()
+                if wait:
+                    await asyncio.sleep(wait)
+
+            emit(self.hooks, "on_request_start", event)
+            start = time.perf_counter()
+            try:
+                response = await self.transport.post(url, body, headers, request.country)
+            except TransportError as e:
+                delay = self._failed(event, e, start, body, form)
+            else:
+                response_dict, delay = self._received(event, response, start, body, form, credential)
+                if delay is None:
+                    return self._result(response, response_dict)
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def iter_pages(self, request: Search, max_pages: int | None = None) -> AsyncIterator[Response]:
+        """Queries every page of a search, in order, see `Idealista.iter_pages`"""
+        page = request.num_page or 1
+        fetched = 0
+        while True:
+            response = await self.query(replace(request, num_page=page))
+            yield response
+            fetched += 1
+            if page >= response.total_pages or (max_pages is not None and fetched >= max_pages):
+                return
+            page += 1
+
+    async def aclose(self):
+        """Close the transport's connections"""
+        await self.transport.aclose()
+
+    async def __aenter__(self) -> "AsyncIdealista":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -1,2 +1,4 @@
-URL = "https://api.idealista.com/3.5/{country}/search"
-ACCEPTED_COUNTRIES = ["es", "pt", "it"]
\ No newline at end of file
+BASE_URL = "https://api.idealista.com"
+URL = BASE_URL + "/3.5/{country}/search"
+TOKEN_URL = BASE_URL + "/oauth/token"
+ACCEPTED_COUNTRIES = ["es", "pt", "it"]
@@ -0,0 +1,140 @@
+import json
+import multiprocessing
+import os
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from .client import Idealista
+from .exceptions import APIException
+from .models import Search
+from .ratelimit import RateLimiter
+
+# Client owned by the current worker process, created by `_init_worker`.
+_worker_client: Idealista | None = None
+_worker_shard_dir: Path | None = None
+
+
+@dataclass
+class CrawlResult:
+    """Summary of a multi-process crawl"""
+
+    locations: int = 0
+    pages: int = 0
+    properties: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def load_location_ids(
+    path: str | os.PathLike,
+    country: str | None = None,
+    types: list[str] | None = None,
+) -> list[str]:
+    """Read location IDs from a location catalog such as `locationId_list.json`.
+
+    Args:
+        path (str | os.PathLike): JSON file with a list of `{"type", "name", "id"}` objects.
+        country (str | None): Only keep locations of this country (e.g. `"pt"`).
+        types (list[str] | None): Only keep locations of these types (e.g. `["Concelho"]`).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        locations = json.load(f)
+
+    prefix = f"0-EU-{country.upper()}-" if country else ""
+    return [
+        loc["id"]
+        for loc in locations
+        if loc["id"].startswith(prefix) and (types is None or loc.get("type") in types)
+    ]
+
+
+def _init_worker(token: str, rate_limiter: RateLimiter | None, shard_dir: str | None):
+    global _worker_client, _worker_shard_dir
+    # Each worker gets its own client, and therefore its own `requests.Session`.
+    _worker_client = Idealista(token=token, rate_limiter=rate_limiter)
+    _worker_shard_dir = Path(shard_dir) if shard_dir else None
+
+
+def _crawl_location(task: tuple[Search, int | None]) -> tuple[str, int, int, list[str], str | None]:
+    """Fetch every page of one location. Runs inside a worker process."""
+    search, max_pages = task
+    pages = 0
+    lines = []
+    error = None
+    try:
+        for response in _worker_client.iter_pages(search, max_pages=max_pages):
+            pages += 1
+            lines.extend(json.dumps(prop.to_dict(), ensure_ascii=False) for prop in response.element_list)
+    except APIException as e:
+        error = str(e)
+    except (OSError, ValueError) as e:
+        # Connection failures and malformed (e.g. non-JSON) responses only lose this location
+        error = f"{type(e).__name__}: {e}"
+
+    if _worker_shard_dir is not None:
+        # Append to this worker's own shard so no two processes write to the same file
+        with open(_worker_shard_dir / f"part-{os.getpid()}.ndjson", "a", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in lines)
+        return search.location_id, pages, len(lines), [], error
+    return search.location_id, pages, len(lines), lines, error
+
+
+def crawl_locations(
+    token: str,
+    location_ids: list[str],
+    search: Search,
+    output: str | os.PathLike | None = None,
+    shard_dir: str | os.PathLike | None = None,
+    processes: int | None = None,
+    requests_per_second: float | None = None,
+    max_pages: int | None = None,
+) -> CrawlResult:
+    """Crawl every page of `search` for each location, sharding locations across worker processes.
+
+    Workers fetch and parse pages in parallel and share a single bearer token and rate limit.
+    Listings are written as NDJSON, either by the parent process to `output` or by each worker
+    to its own file in `shard_dir`.
+
+    Args:
+        token (str): Bearer token shared by all workers.
+        location_ids (list[str]): Locations to crawl, see `load_location_ids`.
+        search (Search): Base search; its `location_id` and `num_page` are overridden per location.
+        output (str | os.PathLike | None): Single NDJSON file written by the parent process.
+        shard_dir (str | os.PathLike | None): Directory for per-worker `part-<pid>.ndjson` files.
+        processes (int | None): Number of worker processes (defaults to the CPU count).
+        requests_per_second (float | None): Request budget shared by all workers.
+        max_pages (int | None): Maximum pages to fetch per location.
+
+    Returns:
+        CrawlResult: Counts of fetched locations, pages and properties, and per-location errors.
+    """
+    if (output is None) == (shard_dir is None):
+        raise ValueError("Exactly one of 'output' or 'shard_dir' must be provided.")
+    if shard_dir is not None:
+        os.makedirs(shard_dir, exist_ok=True)
+        # Workers append to their shards, so shards left by a previous run would duplicate listings
+        for stale in Path(shard_dir).glob("part-*.ndjson"):
+            stale.unlink()
+
+    rate_limiter = RateLimiter(requests_per_second, shared=True) if requests_per_second else None
+    tasks = [(replace(search, location_id=location_id, num_page=1), max_pages) for location_id in location_ids]
+    result = CrawlResult()
+
+    out = open(output, "w", encoding="utf-8") if output is not None else None
+    try:
+        with multiprocessing.Pool(
+            processes,
+            initializer=_init_worker,
+            initargs=(token, rate_limiter, str(shard_dir) if shard_dir is not None else None),
+        ) as pool:
+            for location_id, pages, count, lines, error in pool.imap_unordered(_crawl_location, tasks):
+                result.locations += 1
+                result.pages += pages
+                result.properties += count
+                if error is not None:
+                    result.errors[location_id] = error
+                if out is not None:
+                    out.writelines(line + "\n" for line in lines)
+    finally:
+        if out is not None:
+            out.close()
+    return result
@@ -0,0 +1,178 @@
+import threading
+import time
+from dataclasses import dataclass, field
+
+from .exceptions import AuthenticationException
+from .hooks import Hooks, emit
+from .utils import request_token
+
+# Refresh tokens slightly before they expire, so in-flight requests don't race the expiry.
+TOKEN_EXPIRY_MARGIN = 60
+
+# A throttled key rests for THROTTLE_COOLDOWN seconds, doubling with each consecutive 429
+# up to MAX_THROTTLE_COOLDOWN.
+THROTTLE_COOLDOWN = 1.0
+MAX_THROTTLE_COOLDOWN = 60.0
+
+
+@dataclass
+class Credential:
+    """An API key/secret pair, with its token and usage counters"""
+
+    api_key: str
+    api_secret: str
+    quota: int | None = None  # Requests allowed in the current period (None if unknown)
+    used: int = 0
+    last_used: float = 0.0
+    ejected: bool = False
+    ejected_reason: str | None = None
+    cooldown_until: float = 0.0  # time.monotonic() before which the key is not used after a 429
+
+    token: str | None = field(default=None, repr=False)
+    token_expires_at: float = field(default=0.0, repr=False)
+    auth_failures: int = field(default=0, repr=False)
+    throttles: int = field(default=0, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def remaining(self) -> float:
+        """Return the number of requests left in the quota"""
+        if self.quota is None:
+            return float("inf")
+        return self.quota - self.used
+
+    def get_token(self, hooks: list[Hooks] = (), token_url: str | None = None, transport=None) -> str:
+        """Return a valid bearer token, requesting a new one if needed.
+
+        Args:
+            hooks (list[Hooks]): Hooks notified if a new token has to be requested.
+            token_url (str | None): OAuth token URL (defaults to `consts.TOKEN_URL`).
+            transport (Transport | None): Transport to request tokens with.
+        """
+        with self._lock:
+            if self.token is None or time.monotonic() >= self.token_expires_at:
+                start = time.perf_counter()
+                token, expires_in = request_token(api_key=self.api_key, secret=self.api_secret, token_url=token_url, transport=transport)
+                emit(hooks, "on_token_refresh", self.api_key, time.perf_counter() - start)
+                self.token = token
+                # Tokens without a reported lifetime are kept until the API rejects them
+                self.token_expires_at = (
+                    time.monotonic() + expires_in - TOKEN_EXPIRY_MARGIN if expires_in else float("inf")
+                )
+            return self.token
+
+    def invalidate_token(self):
+        """Force a new token to be requested on next use"""
+        with self._lock:
+            self.token = None
+
+
+class CredentialPool:
+    """Balances requests across several API keys.
+
+    Each request goes to the key with the most remaining quota, and among equals to the least
+    recently used one. Keys whose tokens can't be obtained, that keep being rejected, or that
+    run out of quota are ejected from the pool. Keys that are only throttled (a `429` that
+    doesn't mention the quota) rest for a cooldown and come back into rotation.
+    """
+
+    def __init__(self, credentials: list[Credential | tuple[str, str]]):
+        if not credentials:
+            raise ValueError("At least one credential is required.")
+        self.credentials = [c if isinstance(c, Credential) else Credential(*c) for c in credentials]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    @property
+    def available(self) -> list[Credential]:
+        """Return the credentials that haven't been ejected"""
+        return [c for c in self.credentials if not c.ejected]
+
+    def acquire(self, hooks: list[Hooks] = (), token_url: str | None = None, transport=None) -> tuple[Credential, str]:
+        """Pick the credential to use for the next request and return it with its token.
+
+        Args:
+            hooks (list[Hooks]): Hooks notified if a new token has to be requested.
+            token_url (str | None): OAuth token URL (defaults to `consts.TOKEN_URL`).
+            transport (Transport | None): Transport to request tokens with.
+
+        If every usable credential is cooling down after a `429`, waits for the first one to be ready.
+
+        Raises:
+            AuthenticationException: If every credential has been ejected.
+        """
+        while True:
+            with self._lock:
+                candidates = [c for c in self.credentials if not c.ejected and c.remaining > 0]
+                if not candidates:
+                    reasons = "; ".join(f"{c.api_key[:6]}...: {c.ejected_reason or 'quota exhausted'}" for c in self.credentials)
+                    raise AuthenticationException(f"No usable credentials left in the pool ({reasons})")
+                now = time.monotonic()
+                ready = [c for c in candidates if c.cooldown_until <= now]
+                if ready:
+                    credential = min(ready, key=lambda c: (-c.remaining, c.last_used))
+                    credential.used += 1
+                    credential.last_used = now
+                else:
+                    wait = min(c.cooldown_until for c in candidates) - now
+            if not ready:
+                time.sleep(wait)
+                continue
+            try:
+                return credential, credential.get_token(hooks, token_url, transport)
+            except AuthenticationException as e:
+                self.eject(credential, str(e))
+
+    def eject(self, credential: Credential, reason: str):
+        """Remove a credential from rotation"""
+        with self._lock:
+            credential.ejected = True
+            credential.ejected_reason = reason
+
+    def restore(self, credential: Credential, reset_usage: bool = False):
+        """Put an ejected credential back into rotation, e.g. when its quota period restarts"""
+        with self._lock:
+            credential.ejected = False
+            credential.ejected_reason = None
+            credential.auth_failures = 0
+            credential.throttles = 0
+            credential.cooldown_until = 0.0
+            if reset_usage:
+                credential.used = 0
+
+    def report(self, credential: Credential, status_code: int, response: dict) -> bool:
+        """Record the outcome of a request made with `credential`.
+
+        A `429` ejects the key only if the API says its quota is exhausted; otherwise the key
+        is throttled and rests for a cooldown before being used again.
+
+        Returns:
+            bool: True if the request failed because of the credential and should be retried with another one.
+        """
+        description = response.get("error_description") or response.get("message") or str(status_code)
+        if status_code == 401:
+            # The first rejection is usually an expired token; a second one means the key is bad
+            with self._lock:
+                credential.auth_failures += 1
+                rejected = credential.auth_failures >= 2
+            if rejected:
+                self.eject(credential, f"Rejected by the API: {description}")
+            else:
+                credential.invalidate_token()
+            return True
+        if status_code == 429:
+            if "quota" in description.lower():
+                self.eject(credential, f"Quota exceeded: {description}")
+            else:
+                with self._lock:
+                    cooldown = min(THROTTLE_COOLDOWN * 2**credential.throttles, MAX_THROTTLE_COOLDOWN)
+                    credential.throttles += 1
+                    credential.cooldown_until = time.monotonic() + cooldown
+            return True
+        if status_code == 200:
+            with self._lock:
+                credential.auth_failures = 0
+                credential.throttles = 0
+        return False
@@ -0,0 +1,127 @@
+import json
+import logging
+import logging.handlers
+import os
+import random
+import time
+
+from .hooks import RequestEvent
+
+# Payloads are logged to "idealista_api.payload" at DEBUG level, and per-request traces to
+# "idealista_api.trace". Both cost a single level check when disabled.
+payload_logger = logging.getLogger("idealista_api.payload")
+trace_logger = logging.getLogger("idealista_api.trace")
+# Traces go only to the file set up by `enable_trace`, never to the application's handlers,
+# and stay off until then regardless of the root logger's level
+trace_logger.propagate = False
+trace_logger.setLevel(logging.CRITICAL + 1)
+
+DEFAULT_MAX_PAYLOAD_CHARS = 2000
+
+_settings = {"sample_rate": 1.0, "max_chars": DEFAULT_MAX_PAYLOAD_CHARS, "trace_payloads": False}
+_trace_handler: logging.Handler | None = None
+
+
+class LazyPayload:
+    """Defers serializing a payload until a log handler actually formats the record"""
+
+    __slots__ = ("payload", "max_chars")
+
+    def __init__(self, payload, max_chars: int | None):
+        self.payload = payload
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        text = json.dumps(self.payload, ensure_ascii=False, default=str)
+        if self.max_chars is not None and len(text) > self.max_chars:
+            return f"{text[:self.max_chars]}... [truncated, {len(text)} chars]"
+        return text
+
+
+def configure_payload_logging(sample_rate: float = 1.0, max_chars: int | None = DEFAULT_MAX_PAYLOAD_CHARS):
+    """Set how API payloads are logged when the "idealista_api.payload" logger is at DEBUG level.
+
+    Args:
+        sample_rate (float): Fraction of responses whose payload is logged.
+        max_chars (int | None): Truncate logged payloads to this many characters (None logs them whole).
+    """
+    if not 0 <= sample_rate <= 1:
+        raise ValueError("sample_rate must be between 0 and 1.")
+    _settings["sample_rate"] = sample_rate
+    _settings["max_chars"] = max_chars
+
+
+def log_payload(event: RequestEvent, payload: dict):
+    """Log an API response payload, if payload logging is enabled and the request is sampled"""
+    if not payload_logger.isEnabledFor(logging.DEBUG):
+        return
+    sample_rate = _settings["sample_rate"]
+    if sample_rate < 1 and random.random() >= sample_rate:
+        return
+    payload_logger.debug(
+        "%s/%s attempt %d -> %s: %s",
+        event.country,
+        event.endpoint,
+        event.attempt,
+        event.status_code,
+        LazyPayload(payload, _settings["max_chars"]),
+    )
+
+
+def enable_trace(
+    path: str | os.PathLike,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    include_payloads: bool = False,
+) -> logging.Handler:
+    """Write a JSON line per request to a rotating trace file.
+
+    Args:
+        path (str | os.PathLike): Trace file.
+        max_bytes (int): Size at which the file is rotated.
+        backup_count (int): Rotated files to keep.
+        include_payloads (bool): Include the (truncated) response payload in each trace line.
+
+    Returns:
+        logging.Handler: The file handler, in case it needs further configuration.
+    """
+    global _trace_handler
+    disable_trace()
+    _trace_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    _trace_handler.setFormatter(logging.Formatter("%(message)s"))
+    _settings["trace_payloads"] = include_payloads
+    trace_logger.addHandler(_trace_handler)
+    trace_logger.setLevel(logging.DEBUG)
+    return _trace_handler
+
+
+def disable_trace():
+    """Stop writing the request trace file"""
+    global _trace_handler
+    if _trace_handler is not None:
+        trace_logger.removeHandler(_trace_handler)
+        _trace_handler.close()
+        _trace_handler = None
+    trace_logger.setLevel(logging.CRITICAL + 1)
+
+
+def trace_request(event: RequestEvent, form: dict, payload: dict | None = None):
+    """Write a request to the trace file, if tracing is enabled"""
+    if not trace_logger.isEnabledFor(logging.DEBUG):
+        return
+    record = {
+        "time": time.time(),
+        "country": event.country,
+        "endpoint": event.endpoint,
+        "attempt": event.attempt,
+        "status_code": event.status_code,
+        "elapsed": round(event.elapsed, 6),
+        "bytes_sent": event.bytes_sent,
+        "bytes_received": event.bytes_received,
+        "wire_bytes_received": event.wire_bytes_received,
+        "error": event.error,
+        "request": form,
+    }
+    if payload is not None and _settings["trace_payloads"]:
+        record["response"] = str(LazyPayload(payload, _settings["max_chars"]))
+    trace_logger.debug(json.dumps(record, ensure_ascii=False, default=str))
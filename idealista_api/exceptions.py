@@ -1,8 +1,17 @@
 class APIException(Exception):
-    def __init__(self, message: str, response: dict | None = None):
+    def __init__(self, message: str, response: dict | None = None, status_code: int | None = None):
         super().__init__(message)
         self.response = response
+        self.status_code = status_code
 
 
 class AuthenticationException(APIException):
     pass
+
+
+class QuotaExceededException(APIException):
+    pass
+
+
+class TransportError(APIException):
+    """The request didn't get a response, e.g. the connection failed or timed out"""
@@ -0,0 +1,255 @@
+import csv
+import json
+import os
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+
+from .models import Property, Response
+from .projection import Projection
+
+# Columns written by `write_csv` by default, in order
+CSV_PROJECTION = Projection(
+    [
+        "url",
+        "suggested_title=suggestedTexts.title",
+        "suggested_subtitle=suggestedTexts.subtitle",
+        "price",
+        "operation",
+        "province",
+        "municipality",
+        "description",
+        "status",
+        "typology=detailedType.typology",
+    ]
+)
+CSV_FIELDS = CSV_PROJECTION.columns
+
+# Every field of a search result listing, named as in the API, with nested objects flattened and
+# values kept as returned
+LISTING_PROJECTION = Projection(
+    [
+        "propertyCode",
+        "thumbnail",
+        "numPhotos",
+        "floor",
+        "price",
+        "priceByArea",
+        "propertyType",
+        "operation",
+        "size",
+        "exterior",
+        "rooms",
+        "bathrooms",
+        "address",
+        "province",
+        "municipality",
+        "district",
+        "neighborhood",
+        "country",
+        "latitude",
+        "longitude",
+        "showAddress",
+        "url",
+        "distance",
+        "description",
+        "hasVideo",
+        "status",
+        "newDevelopment",
+        "hasLift",
+        "detailedType.typology",
+        "detailedType.subTypology",
+        "suggestedTexts.title",
+        "suggestedTexts.subtitle",
+        "hasPlan",
+        "has3DTour",
+        "has360",
+        "hasStaging",
+        "topNewDevelopment",
+    ]
+)
+
+# Properties written between calls to an export's `progress` callback
+PROGRESS_INTERVAL = 500
+
+
+class ExportCancelled(Exception):
+    """An export was stopped by its `should_cancel` callback; the output file was left untouched"""
+
+
+def match_keywords(description: str | None, keywords: list[str], case_sensitive: bool = False) -> list[str]:
+    """Return the keywords found in a property description.
+
+    Args:
+        description (str | None): Property description.
+        keywords (list[str]): Keywords to look for.
+        case_sensitive (bool): Whether matching is case sensitive.
+    """
+    if not description or not keywords:
+        return []
+    if case_sensitive:
+        return [keyword for keyword in keywords if keyword in description]
+    description = description.lower()
+    return [keyword for keyword in keywords if keyword.lower() in description]
+
+
+@contextmanager
+def atomic_open(path: str | os.PathLike, newline: str | None = None) -> Iterator:
+    """Open a text file for writing, replacing `path` only once the block completes.
+
+    The data goes to a temporary file next to `path`, renamed over it on success and deleted on
+    any error (including `ExportCancelled`), so readers never see a partially written file.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    # Not `tempfile.mkstemp`, whose private permissions would carry over to the export
+    tmp = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+    f = open(tmp, "x", newline=newline, encoding="utf-8")
+    try:
+        with f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _tracker(progress: Callable[[int], None] | None, should_cancel: Callable[[], bool] | None) -> Callable[[int], None]:
+    """Return a function to call every `PROGRESS_INTERVAL` properties written"""
+
+    def track(written: int):
+        if should_cancel is not None and should_cancel():
+            raise ExportCancelled(f"Export cancelled after {written} properties")
+        if progress is not None:
+            progress(written)
+
+    return track
+
+
+def flatten_property(prop: Property) -> dict:
+    """Return the CSV row of a property, with the columns in `CSV_FIELDS`"""
+    return CSV_PROJECTION.as_dict(prop)
+
+
+def write_csv(
+    path: str | os.PathLike,
+    properties: Iterable[Property],
+    keywords: list[str] | None = None,
+    case_sensitive: bool = False,
+    progress: Callable[[int], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    projection: Projection = CSV_PROJECTION,
+) -> int:
+    """Write properties to a CSV file.
+
+    If keywords are given, a `matched_keywords` column lists the ones found in each description.
+    Rows are written as the properties are read, to a temporary file renamed to `path` at the end.
+
+    Args:
+        path (str | os.PathLike): Output file.
+        properties (Iterable[Property]): Properties to write, e.g. `PageStore.properties()`.
+        keywords (list[str] | None): Keywords to look for in the descriptions.
+        case_sensitive (bool): Whether keyword matching is case sensitive.
+        progress (Callable[[int], None] | None): Called with the number of properties written,
+            every `PROGRESS_INTERVAL` properties and once at the end.
+        should_cancel (Callable[[], bool] | None): Polled as often as `progress`; if it returns
+            True, `ExportCancelled` is raised and `path` is left as it was.
+        projection (Projection): Columns to write (`CSV_FIELDS` by default).
+
+    Returns:
+        int: Number of properties whose description matched a keyword.
+    """
+    matched_count = 0
+    written = 0
+    track = _tracker(progress, should_cancel)
+    row_of = projection.row
+    with atomic_open(path, newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(projection.columns + (["matched_keywords"] if keywords else []))
+        for prop in properties:
+            row = row_of(prop)
+            if keywords:
+                matched = match_keywords(prop["description"], keywords, case_sensitive)
+                row.append(", ".join(matched))
+                matched_count += bool(matched)
+            writer.writerow(row)
+            written += 1
+            if not written % PROGRESS_INTERVAL:
+                track(written)
+    if progress is not None:
+        progress(written)
+    return matched_count
+
+
+def write_json(
+    path: str | os.PathLike,
+    responses: Iterable[Response],
+    keywords: list[str] | None = None,
+    case_sensitive: bool = False,
+    include_matches: bool = True,
+    multi_page: bool | None = None,
+    progress: Callable[[int], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+) -> int:
+    """Write the properties of one or several pages to a JSON file, with pagination metadata.
+
+    Properties are streamed to the file as the pages are read, so only one page is held in memory
+    at a time; the `metadata` object, which summarises them, comes after the `properties` list.
+
+    Args:
+        path (str | os.PathLike): Output file.
+        responses (Iterable[Response]): Fetched pages, e.g. a `PageStore`.
+        keywords (list[str] | None): Keywords to look for in the descriptions.
+        case_sensitive (bool): Whether keyword matching is case sensitive.
+        include_matches (bool): Add `keyword_match` and `matched_keywords` fields to each property.
+        multi_page (bool | None): Whether the pages come from a multi-page fetch (by default, if there are several).
+        progress (Callable[[int], None] | None): See `write_csv`.
+        should_cancel (Callable[[], bool] | None): See `write_csv`.
+
+    Returns:
+        int: Number of properties whose description matched a keyword.
+    """
+    matched_count = 0
+    written = 0
+    pages = 0
+    total = 0
+    first_response = None
+    track = _tracker(progress, should_cancel)
+    with atomic_open(path) as f:
+        f.write('{\n  "properties": [')
+        for response in responses:
+            pages += 1
+            total += response.total
+            if first_response is None:
+                first_response = response
+            for prop in response.element_list:
+                prop_dict = prop.to_dict()
+                if keywords:
+                    matched = match_keywords(prop["description"], keywords, case_sensitive)
+                    if include_matches:
+                        prop_dict = {**prop_dict, "keyword_match": bool(matched), "matched_keywords": matched}
+                    matched_count += bool(matched)
+                # Same layout as `json.dump(..., indent=2)` of the whole document
+                f.write(",\n    " if written else "\n    ")
+                f.write(json.dumps(prop_dict, indent=2, ensure_ascii=False).replace("\n", "\n    "))
+                written += 1
+                if not written % PROGRESS_INTERVAL:
+                    track(written)
+
+        is_multi_page = pages > 1 if multi_page is None else multi_page
+        metadata = {
+            "total": total if is_multi_page else first_response and first_response.total,
+            "pages_fetched": pages,
+            "total_pages": first_response and first_response.total_pages,
+            "items_per_page": first_response and first_response.items_per_page,
+            "properties_count": written,
+            "export_date": datetime.now().isoformat(),
+            "multi_page_fetch": is_multi_page,
+            "keyword_filters": keywords if keywords else None,
+            "properties_with_matches": matched_count if keywords else None,
+        }
+        f.write("\n  ],\n" if written else "],\n")
+        f.write('  "metadata": ' + json.dumps(metadata, indent=2, ensure_ascii=False).replace("\n", "\n  ") + "\n}")
+    if progress is not None:
+        progress(written)
+    return matched_count
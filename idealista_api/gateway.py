@@ -0,0 +1,311 @@
+"""Caching gateway in front of the Idealista API.
+
+Serves the same `/3.5/{country}/search` contract as the API, so any `Idealista` client can use it
+by overriding `consts.URL` (or with `search_url`). Requests are answered from a shared cache when
+possible, identical concurrent requests are coalesced into one upstream call, and upstream calls
+go through a single credential pool and rate limit.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode
+
+from . import consts
+from .client import Idealista
+from .credentials import Credential, CredentialPool
+from .exceptions import APIException, TransportError
+from .hooks import MetricsCollector, RequestEvent
+from .models import Search
+from .ratelimit import RateLimiter
+
+SEARCH_PATH = re.compile(r"^/3\.5/(?P<country>[a-z]{2})/search$")
+
+
+@dataclass
+class GatewayStats:
+    """Requests handled by an `IdealistaGateway`"""
+
+    requests: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0  # Requests that waited for an identical in-flight request
+    upstream_requests: int = 0
+    upstream_errors: int = 0
+    unauthorized: int = 0
+
+
+class IdealistaGateway:
+    """HTTP service fronting the Idealista API for many consumers.
+
+    Args:
+        credentials (CredentialPool): API keys used for the upstream requests.
+        cache_ttl (float): Seconds successful responses are served from the cache (0 disables caching).
+        max_cache_entries (int): Responses kept in the cache, dropping the least recently used.
+        requests_per_second (float | None): Upstream request budget shared by all consumers.
+        max_retries (int): Upstream retries on connection errors, `429` and `5xx` responses.
+        access_tokens (set[str] | None): Bearer tokens consumers must send. If None, the
+            gateway accepts any request, and should only be reachable from trusted networks.
+        upstream_url (str | None): Search URL template of the API (defaults to `consts.URL`).
+        host (str): Interface to listen on.
+        port (int): Port to listen on (0 picks a free port).
+    """
+
+    def __init__(
+        self,
+        credentials: CredentialPool,
+        cache_ttl: float = 300.0,
+        max_cache_entries: int = 10000,
+        requests_per_second: float | None = None,
+        max_retries: int = 2,
+        access_tokens: set[str] | None = None,
+        upstream_url: str | None = None,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+    ):
+        self.cache_ttl = cache_ttl
+        self.max_cache_entries = max_cache_entries
+        self.access_tokens = access_tokens
+        self.stats = GatewayStats()
+        self.metrics = MetricsCollector()
+        self.client = Idealista(
+            credentials=credentials,
+            rate_limiter=RateLimiter(requests_per_second) if requests_per_second else None,
+            hooks=[self.metrics],
+            max_retries=max_retries,
+            # Fixed now, so overriding `consts.URL` in this process doesn't point the gateway at itself
+            search_url=upstream_url or consts.URL,
+        )
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, tuple[float, int, bytes]] = OrderedDict()
+        self._in_flight: dict[str, Future] = {}
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Return the gateway's base URL"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def search_url(self) -> str:
+        """Return the search URL template to set as `consts.URL` in consumers"""
+        return self.url + "/3.5/{country}/search"
+
+    def start(self) -> "IdealistaGateway":
+        """Start serving requests in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve requests in the current thread, until interrupted"""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop the server"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "IdealistaGateway":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def is_authorized(self, headers) -> bool:
+        if self.access_tokens is None:
+            return True
+        return headers.get("Authorization", "").removeprefix("Bearer ") in self.access_tokens
+
+    def handle_search(self, country: str, form: dict[str, str | list[str]]) -> tuple[int, bytes]:
+        """Answer a search from the cache, an identical in-flight request, or the API"""
+        key = country + "?" + urlencode(sorted(form.items()), doseq=True)
+        with self._lock:
+            self.stats.requests += 1
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+                self._cache.move_to_end(key)
+                self.stats.cache_hits += 1
+                self.metrics.on_cache_hit(RequestEvent(country=country, endpoint="search"))
+                return cached[1], cached[2]
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.stats.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            status, body = result = self._fetch(country, form)
+        except BaseException as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            # Cache before leaving the in-flight table, so no request slips between the two
+            if status == 200 and self.cache_ttl > 0:
+                self._cache[key] = (time.monotonic(), status, body)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_cache_entries:
+                    self._cache.popitem(last=False)
+            self._in_flight.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def _fetch(self, country: str, form: dict[str, str | list[str]]) -> tuple[int, bytes]:
+        try:
+            if country not in consts.ACCEPTED_COUNTRIES:
+                raise ValueError(f"Country '{country}' is not supported. Supported countries are: {', '.join(consts.ACCEPTED_COUNTRIES)}")
+            search = Search.from_json({**form, "country": country})
+        except (TypeError, ValueError) as e:
+            # Unsupported country or malformed parameters (e.g. a repeated custom filter)
+            return 400, json.dumps({"error": "invalid_request", "error_description": str(e)}).encode()
+
+        with self._lock:
+            self.stats.upstream_requests += 1
+        try:
+            response = self.client.query(search)
+            return 200, json.dumps(response.raw_data, ensure_ascii=False).encode()
+        except TransportError as e:
+            with self._lock:
+                self.stats.upstream_errors += 1
+            return 502, json.dumps({"error": "bad_gateway", "error_description": str(e)}).encode()
+        except APIException as e:
+            with self._lock:
+                self.stats.upstream_errors += 1
+            # Pool exhaustion has no upstream status: the gateway itself can't serve requests
+            status = e.status_code or 503
+            return status, json.dumps(e.response or {"error": "gateway_error", "error_description": str(e)}).encode()
+        except ValueError as e:
+            # The upstream answered, but not with a valid search response (e.g. a non-JSON body)
+            with self._lock:
+                self.stats.upstream_errors += 1
+            return 502, json.dumps({"error": "bad_gateway", "error_description": f"{type(e).__name__}: {e}"}).encode()
+
+    def render_metrics(self) -> str:
+        """Return the gateway and upstream metrics in the Prometheus text exposition format"""
+        with self._lock:
+            stats = vars(self.stats).copy()
+            cache_entries = len(self._cache)
+        lines = [f"# TYPE idealista_gateway_{name}_total counter\nidealista_gateway_{name}_total {value}" for name, value in stats.items()]
+        lines.append(f"# TYPE idealista_gateway_cache_entries gauge\nidealista_gateway_cache_entries {cache_entries}")
+        available = len(self.client.credentials.available)
+        lines.append(f"# TYPE idealista_gateway_credentials_available gauge\nidealista_gateway_credentials_available {available}")
+        return "\n".join(lines) + "\n" + self.metrics.to_prometheus(prefix="idealista_upstream")
+
+
+def _parse_form(body: str) -> dict[str, str | list[str]]:
+    """Decode a form body, keeping every value of repeated keys (e.g. `adIds`) as a list"""
+    form: dict[str, str | list[str]] = {}
+    for key, value in parse_qsl(body, keep_blank_values=True):
+        if key not in form:
+            form[key] = value
+        elif isinstance(form[key], list):
+            form[key].append(value)
+        else:
+            form[key] = [form[key], value]
+    return form
+
+
+def _handler_for(gateway: IdealistaGateway) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are separate writes; with Nagle's algorithm the body waits for the
+        # client's delayed ACK, adding ~40 ms to every request
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+            match = SEARCH_PATH.match(self.path)
+            if not match:
+                self._reply(404, json.dumps({"message": f"Unknown path {self.path}"}).encode())
+            elif not gateway.is_authorized(self.headers):
+                with gateway._lock:
+                    gateway.stats.unauthorized += 1
+                self._reply(401, json.dumps({"error": "invalid_token", "error_description": "Invalid access token"}).encode())
+            else:
+                self._reply(*gateway.handle_search(match["country"], _parse_form(body)))
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                self._reply(200, gateway.render_metrics().encode(), "text/plain; version=0.0.4")
+            elif self.path == "/health":
+                healthy = bool(gateway.client.credentials.available)
+                self._reply(200 if healthy else 503, json.dumps({"healthy": healthy}).encode())
+            else:
+                self._reply(404, json.dumps({"message": f"Unknown path {self.path}"}).encode())
+
+        def _reply(self, status: int, data: bytes, content_type: str = "application/json;charset=UTF-8"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def load_credentials(path: str | os.PathLike) -> CredentialPool:
+    """Read API keys from a JSON file: a list of `[key, secret]` pairs or of `{"api_key", "api_secret", "quota"}` objects"""
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    return CredentialPool([Credential(**entry) if isinstance(entry, dict) else tuple(entry) for entry in entries])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="idealista-gateway", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default 8080)")
+    parser.add_argument("--credentials", help="JSON file with API keys (default: $IDEALISTA_API_KEY and $IDEALISTA_API_SECRET)")
+    parser.add_argument("--cache-ttl", type=float, default=300.0, help="Seconds responses are cached (default 300)")
+    parser.add_argument("--max-cache-entries", type=int, default=10000, help="Responses kept in the cache (default 10000)")
+    parser.add_argument("--rps", type=float, help="Upstream requests per second")
+    parser.add_argument("--max-retries", type=int, default=2, help="Upstream retries (default 2)")
+    parser.add_argument("--access-token", action="append", help="Token consumers must send (repeatable; default: no check)")
+    args = parser.parse_args(argv)
+
+    if args.credentials:
+        credentials = load_credentials(args.credentials)
+    elif os.getenv("IDEALISTA_API_KEY") and os.getenv("IDEALISTA_API_SECRET"):
+        credentials = CredentialPool([(os.environ["IDEALISTA_API_KEY"], os.environ["IDEALISTA_API_SECRET"])])
+    else:
+        parser.error("provide --credentials, or set IDEALISTA_API_KEY and IDEALISTA_API_SECRET")
+
+    gateway = IdealistaGateway(
+        credentials,
+        cache_ttl=args.cache_ttl,
+        max_cache_entries=args.max_cache_entries,
+        requests_per_second=args.rps,
+        max_retries=args.max_retries,
+        access_tokens=set(args.access_token) if args.access_token else None,
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Serving on {gateway.url} (set consts.URL to {gateway.search_url})", file=sys.stderr)
+    try:
+        gateway.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
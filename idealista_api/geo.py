@@ -0,0 +1,218 @@
+import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+
+from .client import Idealista
+from .models import Property, Search
+
+EARTH_RADIUS = 6371008.8  # Mean Earth radius, in meters
+
+# A circle is split when its results would need more pages than this to fetch
+DEFAULT_MAX_RESULTS_PER_CIRCLE = 500
+
+
+@dataclass(frozen=True)
+class BoundingBox:
+    """A latitude/longitude rectangle"""
+
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+
+    def to_polygon(self) -> list[tuple[float, float]]:
+        """Return the box corners as a polygon"""
+        return [
+            (self.min_lat, self.min_lon),
+            (self.min_lat, self.max_lon),
+            (self.max_lat, self.max_lon),
+            (self.max_lat, self.min_lon),
+        ]
+
+    @classmethod
+    def from_points(cls, points: list[tuple[float, float]]) -> "BoundingBox":
+        """Return the smallest box containing all `(lat, lon)` points"""
+        lats = [p[0] for p in points]
+        lons = [p[1] for p in points]
+        return cls(min(lats), min(lons), max(lats), max(lons))
+
+
+@dataclass(frozen=True)
+class Circle:
+    """A search circle, as used by the `center` and `distance` search parameters"""
+
+    lat: float
+    lon: float
+    radius: float  # In meters
+
+    @property
+    def center(self) -> str:
+        """Return the center in the `"lat,lon"` format expected by the API"""
+        return f"{self.lat:.6f},{self.lon:.6f}"
+
+
+@dataclass
+class AreaSearchResult:
+    """Merged results of a tiled area search"""
+
+    properties: list[Property] = field(default_factory=list)
+    circles: list[Circle] = field(default_factory=list)  # Circles whose results were fully fetched
+    requests: int = 0
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points, in meters"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def point_in_polygon(lat: float, lon: float, polygon: list[tuple[float, float]]) -> bool:
+    """Return whether a point lies inside a `(lat, lon)` polygon (ray casting)"""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        lat_i, lon_i = polygon[i]
+        lat_j, lon_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat) and lon < (lon_j - lon_i) * (lat - lat_i) / (lat_j - lat_i) + lon_i:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _to_meters(lat: float, lon: float, origin: tuple[float, float]) -> tuple[float, float]:
+    """Project a point to local planar coordinates (meters) around `origin`"""
+    x = math.radians(lon - origin[1]) * EARTH_RADIUS * math.cos(math.radians(origin[0]))
+    y = math.radians(lat - origin[0]) * EARTH_RADIUS
+    return x, y
+
+
+def circle_intersects_polygon(circle: Circle, polygon: list[tuple[float, float]]) -> bool:
+    """Return whether a circle overlaps a polygon"""
+    if point_in_polygon(circle.lat, circle.lon, polygon):
+        return True
+    origin = (circle.lat, circle.lon)
+    points = [_to_meters(lat, lon, origin) for lat, lon in polygon]
+    for (ax, ay), (bx, by) in zip(points, points[1:] + points[:1]):
+        # Distance from the circle center (the origin) to segment AB
+        dx, dy = bx - ax, by - ay
+        length = dx * dx + dy * dy
+        t = 0.0 if length == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / length))
+        if math.hypot(ax + t * dx, ay + t * dy) <= circle.radius:
+            return True
+    return False
+
+
+def cover_bbox(bbox: BoundingBox, radius: float) -> list[Circle]:
+    """Cover a bounding box with overlapping circles laid out on a hexagonal grid.
+
+    Args:
+        bbox (BoundingBox): Area to cover.
+        radius (float): Radius of each circle, in meters.
+    """
+    # Hexagonal packing: rows 1.5r apart, circles sqrt(3)r apart, odd rows shifted by half a step
+    row_step = math.degrees(1.5 * radius / EARTH_RADIUS)
+    mid_lat = math.radians((bbox.min_lat + bbox.max_lat) / 2)
+    col_step = math.degrees(math.sqrt(3) * radius / (EARTH_RADIUS * max(math.cos(mid_lat), 1e-6)))
+
+    circles = []
+    rows = max(1, math.ceil((bbox.max_lat - bbox.min_lat) / row_step) + 1)
+    cols = max(1, math.ceil((bbox.max_lon - bbox.min_lon) / col_step) + 1)
+    for row in range(rows):
+        lat = bbox.min_lat + row * row_step
+        offset = col_step / 2 if row % 2 else 0.0
+        for col in range(cols + (1 if row % 2 else 0)):
+            circles.append(Circle(lat, bbox.min_lon + col * col_step - offset, radius))
+    return circles
+
+
+def _circle_bbox(circle: Circle) -> BoundingBox:
+    d_lat = math.degrees(circle.radius / EARTH_RADIUS)
+    d_lon = math.degrees(circle.radius / (EARTH_RADIUS * max(math.cos(math.radians(circle.lat)), 1e-6)))
+    return BoundingBox(circle.lat - d_lat, circle.lon - d_lon, circle.lat + d_lat, circle.lon + d_lon)
+
+
+def _property_location(prop: Property) -> tuple[float, float] | None:
+    lat, lon = prop["latitude"], prop["longitude"]
+    if lat is None or lon is None:
+        return None
+    return float(lat), float(lon)
+
+
+def search_area(
+    client: Idealista,
+    search: Search,
+    area: BoundingBox | list[tuple[float, float]],
+    radius: float | None = None,
+    max_results_per_circle: int = DEFAULT_MAX_RESULTS_PER_CIRCLE,
+    min_radius: float = 100.0,
+    max_workers: int = 4,
+) -> AreaSearchResult:
+    """Search a whole bounding box or polygon with a set of overlapping `center`/`distance` searches.
+
+    The area is first covered with circles of `radius` (by default a single circle around the
+    whole area). Any circle with more than `max_results_per_circle` results is replaced by smaller
+    circles, sized from its result density, so dense areas are split finely while sparse ones
+    cost a single request. Circles are searched concurrently, and the results are deduplicated
+    by `propertyCode` and clipped to the exact area.
+
+    Args:
+        client (Idealista): Client used for the searches.
+        search (Search): Base search; its `center`, `distance`, `location_id` and `num_page` are overridden.
+        area (BoundingBox | list[tuple[float, float]]): Bounding box, or polygon as a list of `(lat, lon)` points.
+        radius (float | None): Initial circle radius in meters.
+        max_results_per_circle (int): Results above which a circle is split instead of paginated.
+        min_radius (float): Circles are never split below this radius, in meters.
+        max_workers (int): Number of concurrent searches.
+    """
+    polygon = area.to_polygon() if isinstance(area, BoundingBox) else list(area)
+    bbox = BoundingBox.from_points(polygon)
+    if radius is None:
+        radius = max(haversine(bbox.min_lat, bbox.min_lon, bbox.max_lat, bbox.max_lon) / 2, min_radius)
+        circles = [Circle((bbox.min_lat + bbox.max_lat) / 2, (bbox.min_lon + bbox.max_lon) / 2, radius)]
+    else:
+        circles = [c for c in cover_bbox(bbox, radius) if circle_intersects_polygon(c, polygon)]
+
+    base = replace(search, location_id=None, num_page=1)
+    result = AreaSearchResult()
+    seen = set()
+
+    def fetch_circle(circle: Circle) -> tuple[Circle, list[Property], int, int]:
+        """Fetch a circle's first page, and the rest of its pages unless it will be split."""
+        circle_search = replace(base, center=circle.center, distance=round(circle.radius))
+        properties = []
+        requests = 0
+        for response in client.iter_pages(circle_search):
+            requests += 1
+            properties.extend(response.element_list)
+            if response.total > max_results_per_circle and circle.radius / 2 >= min_radius:
+                return circle, [], response.total, requests
+        return circle, properties, 0, requests
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(fetch_circle, c) for c in circles}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                circle, properties, total, requests = future.result()
+                result.requests += requests
+                if total:
+                    # Shrink so each sub-circle is expected to hold ~80% of the limit, assuming uniform density
+                    sub_radius = circle.radius * math.sqrt(0.8 * max_results_per_circle / total)
+                    sub_radius = max(min_radius, min(sub_radius, circle.radius / 2))
+                    for sub in cover_bbox(_circle_bbox(circle), sub_radius):
+                        if haversine(circle.lat, circle.lon, sub.lat, sub.lon) <= circle.radius + sub_radius and circle_intersects_polygon(sub, polygon):
+                            pending.add(executor.submit(fetch_circle, sub))
+                    continue
+
+                result.circles.append(circle)
+                for prop in properties:
+                    if prop.property_code in seen:
+                        continue
+                    location = _property_location(prop)
+                    if location is not None and point_in_polygon(location[0], location[1], polygon):
+                        seen.add(prop.property_code)
+                        result.properties.append(prop)
+    return result
@@ -0,0 +1,225 @@
+import bisect
+import logging
+import threading
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class RequestEvent:
+    """Details of a request, passed to the hooks"""
+
+    country: str
+    endpoint: str
+    attempt: int = 1
+    status_code: int | None = None
+    elapsed: float = 0.0  # Seconds
+    bytes_sent: int = 0
+    bytes_received: int = 0  # Decoded response body
+    wire_bytes_received: int = 0  # Response body as transferred, possibly compressed
+    error: str | None = None
+
+
+class Hooks:
+    """Base class for instrumentation hooks.
+
+    Subclass it and override the events you're interested in, then pass instances to the client
+    with `Idealista(hooks=[...])`. Hooks are called synchronously from the thread making the
+    request, so they should be fast; exceptions raised by hooks are logged and ignored.
+    """
+
+    def on_request_start(self, event: RequestEvent):
+        """Called before a request is sent"""
+
+    def on_request_end(self, event: RequestEvent):
+        """Called when a request completes or fails, with its status, timing and size"""
+
+    def on_retry(self, event: RequestEvent, delay: float):
+        """Called when a failed request is going to be retried after `delay` seconds"""
+
+    def on_cache_hit(self, event: RequestEvent):
+        """Called when a request is answered from a cache instead of the API"""
+
+    def on_token_refresh(self, api_key: str | None, elapsed: float):
+        """Called after a new bearer token has been obtained"""
+
+
+def emit(hooks: list[Hooks], name: str, *args):
+    """Call an event on every hook, logging (but not raising) hook errors"""
+    for hook in hooks:
+        try:
+            getattr(hook, name)(*args)
+        except Exception:
+            logger.exception("Error in %s.%s hook", type(hook).__name__, name)
+
+
+@dataclass
+class EndpointMetrics:
+    """Metrics of the requests to one country/endpoint pair"""
+
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    cache_hits: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    wire_bytes_received: int = 0
+    latency_sum: float = 0.0
+    # Count per bucket of `LATENCY_BUCKETS`, plus one for slower requests
+    latency_buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    status_codes: dict[int, int] = field(default_factory=dict)
+
+
+class MetricsCollector(Hooks):
+    """In-process metrics: latency histograms, bytes, errors, retries and cache hits per country and endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints: dict[tuple[str, str], EndpointMetrics] = {}
+        self.token_refreshes = 0
+        self.token_refresh_seconds = 0.0
+
+    def _metrics(self, event: RequestEvent) -> EndpointMetrics:
+        key = (event.country, event.endpoint)
+        metrics = self.endpoints.get(key)
+        if metrics is None:
+            metrics = self.endpoints[key] = EndpointMetrics()
+        return metrics
+
+    def on_request_end(self, event: RequestEvent):
+        with self._lock:
+            metrics = self._metrics(event)
+            metrics.requests += 1
+            metrics.bytes_sent += event.bytes_sent
+            metrics.bytes_received += event.bytes_received
+            metrics.wire_bytes_received += event.wire_bytes_received
+            metrics.latency_sum += event.elapsed
+            metrics.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS, event.elapsed)] += 1
+            if event.status_code is not None:
+                metrics.status_codes[event.status_code] = metrics.status_codes.get(event.status_code, 0) + 1
+            if event.error is not None or (event.status_code is not None and event.status_code >= 400):
+                metrics.errors += 1
+
+    def on_retry(self, event: RequestEvent, delay: float):
+        with self._lock:
+            self._metrics(event).retries += 1
+
+    def on_cache_hit(self, event: RequestEvent):
+        with self._lock:
+            self._metrics(event).cache_hits += 1
+
+    def on_token_refresh(self, api_key: str | None, elapsed: float):
+        with self._lock:
+            self.token_refreshes += 1
+            self.token_refresh_seconds += elapsed
+
+    def latency_quantile(self, country: str, endpoint: str, q: float) -> float | None:
+        """Estimate a latency quantile from the histogram (upper bound of the matching bucket)"""
+        with self._lock:
+            metrics = self.endpoints.get((country, endpoint))
+            if metrics is None or metrics.requests == 0:
+                return None
+            target = q * metrics.requests
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), metrics.latency_buckets):
+                cumulative += count
+                if cumulative >= target:
+                    return bound
+            return float("inf")
+
+    def snapshot(self) -> dict:
+        """Return a copy of all metrics as plain dictionaries"""
+        with self._lock:
+            return {
+                "endpoints": {
+                    f"{country}/{endpoint}": {
+                        **vars(metrics),
+                        "latency_buckets": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], metrics.latency_buckets)),
+                        "status_codes": dict(metrics.status_codes),
+                    }
+                    for (country, endpoint), metrics in self.endpoints.items()
+                },
+                "token_refreshes": self.token_refreshes,
+                "token_refresh_seconds": self.token_refresh_seconds,
+            }
+
+    def to_prometheus(self, prefix: str = "idealista") -> str:
+        """Render the metrics in the Prometheus text exposition format.
+
+        Samples are grouped by metric family, each preceded by its `# TYPE` line.
+        """
+        counters = {
+            "requests_total": "requests",
+            "errors_total": "errors",
+            "retries_total": "retries",
+            "cache_hits_total": "cache_hits",
+            "bytes_sent_total": "bytes_sent",
+            "bytes_received_total": "bytes_received",
+            "wire_bytes_received_total": "wire_bytes_received",
+        }
+        lines = []
+        with self._lock:
+            endpoints = [(f'country="{country}",endpoint="{endpoint}"', m) for (country, endpoint), m in sorted(self.endpoints.items())]
+            for family, attribute in counters.items():
+                lines.append(f"# TYPE {prefix}_{family} counter")
+                for labels, m in endpoints:
+                    lines.append(f"{prefix}_{family}{{{labels}}} {getattr(m, attribute)}")
+            lines.append(f"# TYPE {prefix}_responses_total counter")
+            for labels, m in endpoints:
+                for status, count in sorted(m.status_codes.items()):
+                    lines.append(f'{prefix}_responses_total{{{labels},status="{status}"}} {count}')
+            lines.append(f"# TYPE {prefix}_request_duration_seconds histogram")
+            for labels, m in endpoints:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), m.latency_buckets):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else str(bound)
+                    lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {m.latency_sum}")
+                lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {m.requests}")
+            lines.append(f"# TYPE {prefix}_token_refreshes_total counter")
+            lines.append(f"{prefix}_token_refreshes_total {self.token_refreshes}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryHooks(Hooks):
+    """Hooks recording request metrics with OpenTelemetry.
+
+    Requires the `opentelemetry-api` package; metrics go to the globally configured meter
+    provider unless a `meter` is given.
+    """
+
+    def __init__(self, meter=None):
+        try:
+            from opentelemetry import metrics
+        except ImportError as e:
+            raise ImportError("OpenTelemetryHooks requires the 'opentelemetry-api' package.") from e
+        meter = meter or metrics.get_meter("idealista_api")
+        self._duration = meter.create_histogram("idealista.request.duration", unit="s", description="Duration of API requests")
+        self._bytes = meter.create_counter("idealista.response.size", unit="By", description="Bytes received from the API, decoded")
+        self._wire_bytes = meter.create_counter("idealista.response.wire_size", unit="By", description="Bytes received from the API, as transferred")
+        self._errors = meter.create_counter("idealista.request.errors", description="Failed API requests")
+        self._retries = meter.create_counter("idealista.request.retries", description="Retried API requests")
+        self._cache_hits = meter.create_counter("idealista.cache.hits", description="Requests answered from a cache")
+        self._token_refreshes = meter.create_counter("idealista.token.refreshes", description="Bearer tokens obtained")
+
+    def on_request_end(self, event: RequestEvent):
+        attributes = {"country": event.country, "endpoint": event.endpoint, "status_code": event.status_code or 0}
+        self._duration.record(event.elapsed, attributes)
+        self._bytes.add(event.bytes_received, attributes)
+        self._wire_bytes.add(event.wire_bytes_received, attributes)
+        if event.error is not None or (event.status_code or 0) >= 400:
+            self._errors.add(1, attributes)
+
+    def on_retry(self, event: RequestEvent, delay: float):
+        self._retries.add(1, {"country": event.country, "endpoint": event.endpoint})
+
+    def on_cache_hit(self, event: RequestEvent):
+        self._cache_hits.add(1, {"country": event.country, "endpoint": event.endpoint})
+
+    def on_token_refresh(self, api_key: str | None, elapsed: float):
+        self._token_refreshes.add(1)
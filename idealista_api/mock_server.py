@@ -0,0 +1,314 @@
+import base64
+import gzip
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from . import consts
+
+SEARCH_PATH = re.compile(r"^/3\.5/(?P<country>[a-z]{2})/search$")
+
+_MUNICIPALITIES = {
+    "es": [("Madrid", "Madrid", 40.4168, -3.7038), ("Barcelona", "Barcelona", 41.3874, 2.1686), ("Valencia", "Valencia", 39.4699, -0.3763)],
+    "pt": [("Lisboa", "Lisboa", 38.7223, -9.1393), ("Porto", "Porto", 41.1579, -8.6291), ("Braga", "Braga", 41.5454, -8.4265)],
+    "it": [("Roma", "Roma", 41.9028, 12.4964), ("Milano", "Milano", 45.4642, 9.19), ("Napoli", "Napoli", 40.8518, 14.2681)],
+}
+_TYPOLOGIES = ["flat", "penthouse", "duplex", "studio", "chalet"]
+_STREETS = ["Rua Augusta", "Calle Mayor", "Via Roma", "Avenida da Liberdade", "Gran Vía", "Corso Italia"]
+
+
+@dataclass
+class MockServerStats:
+    """Requests served by a `MockIdealistaServer`"""
+
+    token_requests: int = 0
+    search_requests: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    status_codes: dict[int, int] = field(default_factory=dict)
+
+
+class MockIdealistaServer:
+    """Local stand-in for the Idealista API, for tests and benchmarks without network access.
+
+    Implements `/oauth/token` and `/3.5/{country}/search` over deterministic synthetic listings.
+    The same search always returns the same listings, while latency, random server errors and
+    `429` rate limiting can be configured to reproduce real-world conditions.
+
+    Args:
+        listings (int): Number of listings matching each search.
+        latency (float): Seconds added to every search response.
+        jitter (float): Random extra latency, up to this many seconds.
+        error_rate (float): Fraction of searches answered with a `500` error.
+        rate_limit (float | None): Searches per second above which requests get a `429`.
+        seed (int): Seed for the synthetic data and the random errors.
+        compress (bool): Gzip responses to clients that accept it, like the real API.
+        host (str): Interface to listen on.
+        port (int): Port to listen on (0 picks a free port).
+    """
+
+    def __init__(
+        self,
+        listings: int = 1000,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: float | None = None,
+        seed: int = 0,
+        compress: bool = True,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.listings = listings
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.seed = seed
+        self.compress = compress
+        self.stats = MockServerStats()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens: set[str] = set()
+        self._window_start = 0.0
+        self._window_count = 0
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Return the server's base URL"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def search_url(self) -> str:
+        """Return the search URL template, in the same format as `consts.URL`"""
+        return self.url + "/3.5/{country}/search"
+
+    @property
+    def token_url(self) -> str:
+        """Return the OAuth token URL"""
+        return self.url + "/oauth/token"
+
+    def start(self) -> "MockIdealistaServer":
+        """Start serving requests in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockIdealistaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @contextmanager
+    def patch_urls(self) -> Iterator["MockIdealistaServer"]:
+        """Point `consts.URL` and `consts.TOKEN_URL` at this server while the context is active"""
+        previous = consts.URL, consts.TOKEN_URL
+        consts.URL, consts.TOKEN_URL = self.search_url, self.token_url
+        try:
+            yield self
+        finally:
+            consts.URL, consts.TOKEN_URL = previous
+
+    def issue_token(self) -> str:
+        """Create a token accepted by the search endpoint"""
+        with self._lock:
+            token = f"mock-token-{len(self._tokens) + 1}"
+            self._tokens.add(token)
+            return token
+
+    def _count(self, status: int):
+        with self._lock:
+            self.stats.status_codes[status] = self.stats.status_codes.get(status, 0) + 1
+
+    def _is_rate_limited(self) -> bool:
+        if self.rate_limit is None:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            return self._window_count > self.rate_limit
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def _delay(self) -> float:
+        with self._lock:
+            return self.latency + self._random.random() * self.jitter
+
+    def handle_token(self, headers) -> tuple[int, dict]:
+        with self._lock:
+            self.stats.token_requests += 1
+        authorization = headers.get("Authorization", "")
+        try:
+            api_key, _, secret = base64.b64decode(authorization.removeprefix("Basic ")).decode().partition(":")
+        except ValueError:
+            api_key, secret = "", ""
+        if not authorization.startswith("Basic ") or not api_key or not secret:
+            return 401, {"error": "invalid_client", "error_description": "Bad client credentials"}
+        return 200, {"access_token": self.issue_token(), "token_type": "bearer", "expires_in": 43200, "scope": "read"}
+
+    def handle_search(self, country: str, headers, form: dict[str, str]) -> tuple[int, dict]:
+        with self._lock:
+            self.stats.search_requests += 1
+        if headers.get("Authorization", "").removeprefix("Bearer ") not in self._tokens:
+            return 401, {"error": "invalid_token", "error_description": "Invalid access token"}
+        if self._is_rate_limited():
+            with self._lock:
+                self.stats.rate_limited += 1
+            return 429, {"message": "Too many requests"}
+
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        if self._should_fail():
+            with self._lock:
+                self.stats.errors += 1
+            return 500, {"message": "Internal server error"}
+
+        try:
+            max_items = min(max(int(form.get("maxItems", 20)), 1), 50)
+            page = max(int(form.get("numPage", 1)), 1)
+        except ValueError as e:
+            return 400, {"error": "invalid_request", "message": f"Invalid pagination parameter: {e}"}
+        total_pages = max(math.ceil(self.listings / max_items), 1)
+        first = (page - 1) * max_items
+        last = min(first + max_items, self.listings)
+        return 200, {
+            "actualPage": page,
+            "itemsPerPage": max_items,
+            "lowerRangePosition": first,
+            "upperRangePosition": last,
+            "paginable": total_pages > 1,
+            "summary": [f"{self.listings} listings"],
+            "total": self.listings,
+            "totalPages": total_pages,
+            "elementList": [self.listing(country, form, i) for i in range(first, last)],
+        }
+
+    def listing(self, country: str, form: dict[str, str], index: int) -> dict:
+        """Build the synthetic listing at position `index` of a search's results"""
+        return synthetic_listing(country, form, index, seed=self.seed)
+
+
+def synthetic_listing(country: str, form: dict[str, str], index: int, seed: int = 0) -> dict:
+    """Build the synthetic listing at position `index` of the results of a search.
+
+    Args:
+        country (str): Country of the search.
+        form (dict[str, str]): Search form fields, as sent to the API (e.g. `Search.to_json()`).
+        index (int): Position of the listing in the results.
+        seed (int): Seed for the synthetic data.
+    """
+    # Seed from the search and position, so listings are stable across calls and processes
+    search_key = "|".join((country, form.get("operation", ""), form.get("propertyType", ""), form.get("locationId", ""), form.get("center", "")))
+    rng = random.Random(zlib.crc32(search_key.encode()) ^ (seed << 32) ^ index)
+    municipality, province, lat, lon = rng.choice(_MUNICIPALITIES.get(country, _MUNICIPALITIES["es"]))
+    if form.get("center"):
+        # Spread listings over the requested circle
+        c_lat, c_lon = (float(v) for v in form["center"].split(","))
+        distance = float(form.get("distance", 1000)) * math.sqrt(rng.random())
+        angle = rng.random() * 2 * math.pi
+        lat = c_lat + math.degrees(distance * math.cos(angle) / 6371008.8)
+        lon = c_lon + math.degrees(distance * math.sin(angle) / (6371008.8 * math.cos(math.radians(c_lat))))
+    else:
+        lat += rng.uniform(-0.05, 0.05)
+        lon += rng.uniform(-0.05, 0.05)
+
+    operation = form.get("operation", "sale")
+    size = round(rng.uniform(30, 250))
+    price_per_area = rng.lognormvariate(math.log(3000 if operation == "sale" else 14), 0.35)
+    code = str(10000000 + zlib.crc32(f"{search_key}|{index}".encode()) % 90000000)
+    typology = rng.choice(_TYPOLOGIES)
+    rooms = rng.randint(0, 5)
+    return {
+        "propertyCode": code,
+        "thumbnail": f"https://img.example.com/{code}.jpg",
+        "numPhotos": rng.randint(0, 40),
+        "floor": str(rng.randint(0, 10)),
+        "price": round(size * price_per_area),
+        "priceByArea": round(price_per_area),
+        "propertyType": form.get("propertyType", "homes").rstrip("s"),
+        "operation": operation,
+        "size": size,
+        "rooms": rooms,
+        "bathrooms": rng.randint(1, 3),
+        "address": f"{rng.choice(_STREETS)}, {rng.randint(1, 200)}",
+        "province": province,
+        "municipality": municipality,
+        "country": country,
+        "latitude": round(lat, 7),
+        "longitude": round(lon, 7),
+        "showAddress": rng.random() < 0.5,
+        "url": f"https://www.idealista.com/inmueble/{code}/",
+        "description": f"Synthetic {typology} with {rooms} rooms. Energy certificate {rng.choice('ABCDEFG')}.",
+        "hasVideo": rng.random() < 0.2,
+        "status": rng.choice(["good", "renew", "newdevelopment"]),
+        "newDevelopment": False,
+        "detailedType": {"typology": typology},
+        "suggestedTexts": {"subtitle": f"{municipality}, {province}", "title": f"{typology.capitalize()} in {municipality}"},
+        "hasPlan": rng.random() < 0.5,
+        "has3DTour": False,
+        "has360": False,
+        "hasStaging": False,
+        "topNewDevelopment": False,
+    }
+
+
+def _handler_for(server: MockIdealistaServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are separate writes; with Nagle's algorithm the body waits for the
+        # client's delayed ACK, adding ~40 ms to every request
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+            form = {key: values[-1] for key, values in parse_qs(body).items()}
+            match = SEARCH_PATH.match(self.path)
+            if self.path == "/oauth/token":
+                status, payload = server.handle_token(self.headers)
+            elif match:
+                status, payload = server.handle_search(match["country"], self.headers, form)
+            else:
+                status, payload = 404, {"message": f"Unknown path {self.path}"}
+            server._count(status)
+
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            if server.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+                data = gzip.compress(data, compresslevel=5)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
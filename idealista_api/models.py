@@ -1,4 +1,20 @@
-from dataclasses import dataclass, field
+import functools
+from dataclasses import dataclass, field, fields
+from urllib.parse import urlencode
+
+# Types accepted as `custom_filters` values
+FILTER_VALUE_TYPES = (str, bool, int, float)
+
+
+@functools.cache
+def _field_keys(cls: type) -> tuple[tuple[str, str], ...]:
+    """Return the (attribute, API parameter) pairs of a search class, e.g. ("max_items", "maxItems")"""
+    keys = []
+    for f in fields(cls):
+        if f.name != "custom_filters":
+            first, *rest = f.name.split("_")
+            keys.append((f.name, first + "".join(part.capitalize() for part in rest)))
+    return tuple(keys)
 
 
 @dataclass
@@ -26,19 +42,46 @@ class Search:
     # Other, per-property type, filters:
     custom_filters: dict[str, str | bool | int | float] = field(default_factory=dict)
 
-    def to_json(self) -> dict[str, str | bool | int | float]:
-        """Convert the search query to a JSON-serializable dictionary"""
-        data = {}
+    def __post_init__(self):
+        for key, value in self.custom_filters.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Custom filter names must be strings, got {key!r}")
+            if value is not None and not isinstance(value, FILTER_VALUE_TYPES):
+                raise TypeError(f"Custom filter '{key}' must be a str, bool, int or float, got {type(value).__name__}")
 
-        for element in self.__dict__:
-            if element != "custom_filters":
-                keys = element.split("_")
-                key = keys[0] + "".join([k.capitalize() for k in keys[1:]])
-                data[key] = getattr(self, element)
-        if self.custom_filters:
-            data.update(self.custom_filters)
-        # Remove None values and exclude 'custom_filters' key
-        return {k: v for k, v in data.items() if v is not None and k != "custom_filters"}
+    def to_json(self) -> dict[str, str | bool | int | float]:
+        """Convert the search query to a JSON-serializable dictionary, without None values"""
+        data = {key: value for name, key in _field_keys(type(self)) if (value := getattr(self, name)) is not None}
+        for key, value in self.custom_filters.items():
+            # Custom filters take precedence over attributes, and a None filter removes the parameter
+            if value is None:
+                data.pop(key, None)
+            else:
+                data[key] = value
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict[str, str | bool | int | float]) -> "Search":
+        """Build a search from API parameters, the inverse of `to_json`.
+
+        Parameters that aren't attributes of the class go to `custom_filters`.
+        """
+        names = {key: name for name, key in _field_keys(cls)}
+        attributes = {}
+        custom_filters = {}
+        for key, value in data.items():
+            if key in names:
+                attributes[names[key]] = value
+            else:
+                custom_filters[key] = value
+        return cls(**attributes, custom_filters=custom_filters)
+
+    def canonical_bytes(self) -> bytes:
+        """Return the form-encoded parameters sorted by name.
+
+        Equal searches always give the same bytes, so they can be used as cache or deduplication keys.
+        """
+        return urlencode(sorted(self.to_json().items()), doseq=True).encode()
 
 
 class Property:
@@ -96,9 +139,10 @@ class Response:
     total: int
     total_pages: int
     element_list: list[Property]
+    raw_data: dict
 
     def __init__(self, raw_data: dict):
-        print(raw_data)
+        self.raw_data = raw_data
         self.actual_page = raw_data.get("actualPage", 1)
         self.items_per_page = raw_data.get("itemsPerPage", 0)
         self.lower_range_position = raw_data.get("lowerRangePosition", 0)
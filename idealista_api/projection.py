@@ -0,0 +1,138 @@
+"""Declarative projection of listing payloads into flat rows.
+
+A `Projection` is a list of `Field`s, each reading a value from the listing payload by dotted
+path (`suggestedTexts.title`), with a default for missing values and an optional type. Fields
+are compiled once into a single function, so projecting a listing is one pass over the fields,
+without copying the payload. The same projection drives the CSV export, the Parquet and
+SQLite crawl sinks and the GUI results view.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+from .models import Property
+
+# Types a field spec can name, see `Field.parse`
+FIELD_TYPES: dict[str, type] = {"str": str, "int": int, "float": float, "bool": bool}
+
+
+@dataclass(frozen=True)
+class Field:
+    """Column of a `Projection`.
+
+    Args:
+        name (str): Column name.
+        path (str | None): Dotted path of the value in the listing payload (defaults to `name`).
+        default: Value of the column when the path is missing, null, or goes through a non-object.
+        type (type | None): Type the value is converted to. Values that can't be converted get the
+            default. If None, values are kept as they are.
+    """
+
+    name: str
+    path: str | None = None
+    default: object = ""
+    type: "type | None" = None  # Shadows the builtin in the class body, hence the string
+
+    @classmethod
+    def parse(cls, spec: str) -> "Field":
+        """Build a field from a `[name=]path[:type]` spec, e.g. `title=suggestedTexts.title:str`.
+
+        Without a name, the column is named after the path with dots replaced by underscores.
+        Missing values default to an empty string, or to None for `int`, `float` and `bool` fields.
+        """
+        name, sep, path = spec.partition("=")
+        if not sep:
+            name, path = "", spec
+        path, sep, type_name = path.partition(":")
+        if sep and type_name not in FIELD_TYPES:
+            raise ValueError(f"Unknown field type '{type_name}' in '{spec}', expected one of {', '.join(FIELD_TYPES)}.")
+        if not path:
+            raise ValueError(f"Field spec '{spec}' has no path.")
+        convert = FIELD_TYPES[type_name] if sep else None
+        return cls(name or path.replace(".", "_"), path, "" if convert in (None, str) else None, convert)
+
+
+def _convert(convert: type, value, default):
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _compile(fields: tuple[Field, ...]) -> Callable[[dict], list]:
+    """Generate one function returning the values of all fields of a payload.
+
+    Each field becomes an inline expression of dict lookups, so a row costs a single call
+    instead of one per field (the approach `dataclasses` uses for `__init__`).
+    """
+    namespace = {"_convert": _convert, "isinstance": isinstance, "dict": dict}
+    values = []
+    for i, field in enumerate(fields):
+        first, *rest = (field.path or field.name).split(".")
+        lookup = f"raw.get({first!r})"
+        for depth, key in enumerate(rest):
+            parent = f"_p{i}_{depth}"
+            lookup = f"({parent}.get({key!r}) if isinstance({parent} := {lookup}, dict) else None)"
+        namespace[f"_d{i}"] = field.default
+        value = f"_v{i}"
+        if field.type is not None:
+            namespace[f"_c{i}"] = field.type
+            value = f"_convert(_c{i}, _v{i}, _d{i})"
+        values.append(f"(_d{i} if (_v{i} := {lookup}) is None else {value})")
+    source = "def project(raw):\n    return [\n" + "".join(f"        {value},\n" for value in values) + "    ]\n"
+    exec(source, namespace)
+    return namespace["project"]
+
+
+class Projection:
+    """Ordered set of fields turning listings into flat rows.
+
+    Args:
+        fields (Iterable[Field | str]): Columns, as `Field`s or `[name=]path[:type]` specs.
+    """
+
+    def __init__(self, fields: Iterable[Field | str]):
+        self.fields = tuple(field if isinstance(field, Field) else Field.parse(field) for field in fields)
+        names = [field.name for field in self.fields]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate column names: {', '.join(duplicates)}")
+        self.columns = names
+        self._project = _compile(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __add__(self, other: "Projection | Iterable[Field | str]") -> "Projection":
+        return Projection(self.fields + tuple(other.fields if isinstance(other, Projection) else other))
+
+    def with_extras(self, properties: Iterable[Property | dict]) -> "Projection":
+        """Return this projection plus a column for each top-level key of `properties` it doesn't read.
+
+        Extra columns are sorted by name and keep their values as returned, so fields the API adds
+        (or that only some listings have) aren't dropped from exports.
+        """
+        read = {(field.path or field.name).split(".", 1)[0] for field in self.fields} | set(self.columns)
+        keys = set()
+        for prop in properties:
+            keys.update(prop.raw_data if isinstance(prop, Property) else prop)
+        return self + [Field(key) for key in sorted(keys - read)]
+
+    def row(self, prop: Property | dict) -> list:
+        """Return the values of a listing, in column order"""
+        return self._project(prop.raw_data if isinstance(prop, Property) else prop)
+
+    def rows(self, properties: Iterable[Property | dict]) -> Iterator[list]:
+        """Project listings one by one"""
+        project = self._project
+        for prop in properties:
+            yield project(prop.raw_data if isinstance(prop, Property) else prop)
+
+    def as_dict(self, prop: Property | dict) -> dict:
+        """Return the values of a listing by column name"""
+        return dict(zip(self.columns, self.row(prop)))
+
+    def columnar(self, properties: Iterable[Property | dict]) -> list[list]:
+        """Return the values of several listings as one list per column, e.g. for Arrow tables"""
+        columns = list(zip(*self.rows(properties)))
+        return [list(column) for column in columns] if columns else [[] for _ in self.fields]
@@ -0,0 +1,48 @@
+import multiprocessing
+import threading
+import time
+from types import SimpleNamespace
+
+
+class RateLimiter:
+    """Spaces out requests so that at most `rate` of them start per second.
+
+    A limiter created with `shared=True` keeps its state in shared memory, so it can be
+    passed to worker processes (e.g. as a `multiprocessing.Pool` initializer argument)
+    and enforce a single request budget across all of them.
+    """
+
+    def __init__(self, rate: float, shared: bool = False):
+        if rate <= 0:
+            raise ValueError("Rate must be a positive number of requests per second.")
+        self.rate = rate
+        self.interval = 1.0 / rate
+        if shared:
+            self._next_slot = multiprocessing.Value("d", 0.0)
+            self._lock = self._next_slot.get_lock()
+        else:
+            self._next_slot = SimpleNamespace(value=0.0)
+            self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next request slot without waiting for it.
+
+        Returns:
+            float: Seconds the caller must wait before making its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot.value, now)
+            self._next_slot.value = slot + self.interval
+        return max(slot - now, 0.0)
+
+    def acquire(self) -> float:
+        """Block until the caller may make a request.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+from urllib.parse import parse_qsl
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Headers that no longer apply once the body is stored decoded
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def _request_key(method: str, url: str, body: bytes | str | None) -> str:
+    """Identify a request by method, URL and form fields (in a stable order)"""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    fields = sorted(parse_qsl(body or "", keep_blank_values=True))
+    return json.dumps([method.upper(), url, fields])
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that records every exchange to a cassette file.
+
+    Mount it on a client's session to capture real API traffic, e.g.
+    `client.session.mount("https://", RecordingAdapter("cassette.json"))`, then call `save()`.
+    """
+
+    def __init__(self, path: str | os.PathLike, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.interactions: list[dict] = []
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        interaction = {
+            "key": _request_key(request.method, request.url, request.body),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS},
+            "body": response.text,
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+        return response
+
+    def save(self):
+        """Write the recorded exchanges to the cassette file"""
+        with self._lock:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.interactions, f, ensure_ascii=False, indent=1)
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter that answers requests from a cassette file, without network access.
+
+    Requests are matched by method, URL and form fields. When the same request was recorded
+    several times, the recorded responses are replayed in order, repeating the last one.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        super().__init__()
+        with open(path, "r", encoding="utf-8") as f:
+            interactions = json.load(f)
+        self._responses: dict[str, list[dict]] = {}
+        for interaction in interactions:
+            self._responses.setdefault(interaction["key"], []).append(interaction)
+        self._positions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        key = _request_key(request.method, request.url, request.body)
+        with self._lock:
+            recorded = self._responses.get(key)
+            if not recorded:
+                raise requests.ConnectionError(f"No recorded response for {request.method} {request.url}", request=request)
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            interaction = recorded[min(position, len(recorded) - 1)]
+
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction["reason"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response._content = interaction["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
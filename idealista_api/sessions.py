@@ -0,0 +1,257 @@
+import socket
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+SHARD_MODES = (None, "country", "thread")
+
+
+@dataclass
+class ConnectionStats:
+    """Connection reuse of the requests made to one host"""
+
+    requests: int = 0
+    new_connections: int = 0  # Each one a new TCP (and, for HTTPS, TLS) handshake
+
+    @property
+    def reused(self) -> int:
+        """Return the number of requests sent over an already open connection"""
+        return max(self.requests - self.new_connections, 0)
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Return the fraction of requests that didn't need a new connection"""
+        return self.reused / self.requests if self.requests else 0.0
+
+
+def _keepalive_options(idle: float) -> list[tuple[int, int, int]]:
+    """Return socket options enabling TCP keep-alive probes after `idle` seconds without traffic"""
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # Probe timing options are platform-specific
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, max(int(idle), 1)))
+    elif hasattr(socket, "TCP_KEEPALIVE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, max(int(idle), 1)))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(int(idle) // 3, 1)))
+    return options
+
+
+class PooledAdapter(HTTPAdapter):
+    """`HTTPAdapter` with keep-alive tuning and connection reuse statistics.
+
+    Args:
+        pool_connections (int): Number of hosts to keep connection pools for.
+        pool_maxsize (int): Connections kept open per host. Should be at least the number of
+            threads sharing the adapter, or connections get closed after each burst.
+        keepalive_idle (float | None): Send TCP keep-alive probes after this many idle seconds,
+            so idle connections aren't silently dropped by NATs and load balancers.
+        idle_timeout (float | None): Close pooled connections when the adapter has been idle
+            for longer than this, instead of risking a request on a connection the server has
+            already closed.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["keepalive_idle", "idle_timeout"]
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keepalive_idle: float | None = None,
+        idle_timeout: float | None = None,
+        **kwargs,
+    ):
+        self.keepalive_idle = keepalive_idle
+        self.idle_timeout = idle_timeout
+        self._last_used = time.monotonic()
+        self._stats_lock = threading.Lock()
+        self._closed_stats: dict[str, ConnectionStats] = {}
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.keepalive_idle is not None:
+            pool_kwargs["socket_options"] = HTTPConnection.default_socket_options + _keepalive_options(self.keepalive_idle)
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        pools = self.poolmanager.pools
+        dispose = pools.dispose_func
+
+        # Keep the counters of pools evicted from the pool manager
+        def dispose_func(pool):
+            self._record_closed(pool)
+            if dispose is not None:
+                dispose(pool)
+
+        pools.dispose_func = dispose_func
+
+    def __setstate__(self, state):
+        # Pickled adapters are rebuilt through init_poolmanager; restore the extra attributes first
+        self._stats_lock = threading.Lock()
+        self._closed_stats = {}
+        self._last_used = time.monotonic()
+        super().__setstate__(state)
+
+    def _record_closed(self, pool):
+        with self._stats_lock:
+            stats = self._closed_stats.setdefault(_pool_name(pool), ConnectionStats())
+            stats.requests += pool.num_requests
+            stats.new_connections += pool.num_connections
+
+    def send(self, request, **kwargs):
+        now = time.monotonic()
+        if self.idle_timeout is not None and now - self._last_used > self.idle_timeout:
+            self.poolmanager.clear()
+        self._last_used = now
+        return super().send(request, **kwargs)
+
+    def connection_stats(self) -> dict[str, ConnectionStats]:
+        """Return connection reuse counters per host (e.g. "https://api.idealista.com:443")"""
+        pools = self.poolmanager.pools
+        with self._stats_lock:
+            stats = {host: ConnectionStats(s.requests, s.new_connections) for host, s in self._closed_stats.items()}
+        with pools.lock:
+            open_pools = [pools._container[key] for key in list(pools._container)]
+        for pool in open_pools:
+            host_stats = stats.setdefault(_pool_name(pool), ConnectionStats())
+            host_stats.requests += pool.num_requests
+            host_stats.new_connections += pool.num_connections
+        return stats
+
+
+def _fresh_adapter(adapter):
+    """Return an adapter with the settings of `adapter` and its own connection pool.
+
+    Only plain `HTTPAdapter`s and `PooledAdapter`s are rebuilt. Other adapters may hold state that
+    must stay in one place (e.g. a `RecordingAdapter`'s recordings), so they are shared as is.
+    """
+    if type(adapter) not in (HTTPAdapter, PooledAdapter):
+        return adapter
+    options = {
+        "pool_connections": adapter._pool_connections,
+        "pool_maxsize": adapter._pool_maxsize,
+        "pool_block": adapter._pool_block,
+        "max_retries": adapter.max_retries,
+    }
+    if type(adapter) is PooledAdapter:
+        options.update(keepalive_idle=adapter.keepalive_idle, idle_timeout=adapter.idle_timeout)
+    return type(adapter)(**options)
+
+
+def _pool_name(pool) -> str:
+    return f"{pool.scheme}://{pool.host}:{pool.port}"
+
+
+class SessionPool:
+    """Hands out the `requests.Session` to use for each request.
+
+    Sessions can be sharded, so threads don't contend for the same connection pool:
+
+    - `None`: one session for every request (the default).
+    - `"country"`: one session per country.
+    - `"thread"`: one session per thread.
+
+    Args:
+        shard_by (str | None): How requests are spread across sessions.
+        pool_connections (int): Number of hosts each session keeps connection pools for.
+        pool_maxsize (int): Connections each session keeps open per host.
+        keepalive_idle (float | None): Seconds before TCP keep-alive probes are sent on idle connections.
+        idle_timeout (float | None): Seconds of inactivity after which pooled connections are closed.
+        session_factory (Callable[[], requests.Session] | None): Creates the sessions, e.g. a
+            `requests.Session` subclass or one with preset proxies, certificates or auth.
+    """
+
+    def __init__(
+        self,
+        shard_by: str | None = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keepalive_idle: float | None = None,
+        idle_timeout: float | None = None,
+        session_factory: Callable[[], requests.Session] | None = None,
+    ):
+        if shard_by not in SHARD_MODES:
+            raise ValueError(f"shard_by must be one of {', '.join(str(mode) for mode in SHARD_MODES)}")
+        self.shard_by = shard_by
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keepalive_idle = keepalive_idle
+        self.idle_timeout = idle_timeout
+        self.session_factory = session_factory or requests.Session
+        self._lock = threading.Lock()
+        self._shards: dict[object, requests.Session] = {}
+        # Keyed by thread object, so a shard goes away (and is closed) with its thread
+        self._thread_shards: weakref.WeakKeyDictionary[threading.Thread, requests.Session] = weakref.WeakKeyDictionary()
+        # Default session, also the template for the headers and adapters of the shards
+        self.session = self.new_session()
+
+    def new_session(self) -> requests.Session:
+        """Create a session with this pool's connection settings"""
+        session = self.session_factory()
+        adapter_options = {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "keepalive_idle": self.keepalive_idle,
+            "idle_timeout": self.idle_timeout,
+        }
+        session.mount("https://", PooledAdapter(**adapter_options))
+        session.mount("http://", PooledAdapter(**adapter_options))
+        return session
+
+    def get(self, country: str | None = None) -> requests.Session:
+        """Return the session to use for a request to `country`"""
+        if self.shard_by is None:
+            return self.session
+        if self.shard_by == "thread":
+            shards, key = self._thread_shards, threading.current_thread()
+        else:
+            shards, key = self._shards, country
+        session = shards.get(key)
+        if session is None:
+            with self._lock:
+                session = shards.get(key)
+                if session is None:
+                    session = self._new_shard()
+                    shards[key] = session
+                    if self.shard_by == "thread":
+                        weakref.finalize(key, session.close)
+        return session
+
+    def _new_shard(self) -> requests.Session:
+        """Create a session with the headers and mounted adapters of the default session"""
+        session = self.session_factory()
+        session.headers.update(self.session.headers)
+        fresh = {}
+        for prefix, adapter in self.session.adapters.items():
+            if id(adapter) not in fresh:
+                fresh[id(adapter)] = _fresh_adapter(adapter)
+            session.mount(prefix, fresh[id(adapter)])
+        return session
+
+    @property
+    def sessions(self) -> list[requests.Session]:
+        """Return every session created so far"""
+        with self._lock:
+            return [self.session, *self._shards.values(), *self._thread_shards.values()]
+
+    def connection_stats(self) -> dict[str, ConnectionStats]:
+        """Return connection reuse counters per host, across all sessions"""
+        totals: dict[str, ConnectionStats] = {}
+        for session in self.sessions:
+            for adapter in set(session.adapters.values()):
+                if not isinstance(adapter, PooledAdapter):
+                    continue
+                for host, stats in adapter.connection_stats().items():
+                    total = totals.setdefault(host, ConnectionStats())
+                    total.requests += stats.requests
+                    total.new_connections += stats.new_connections
+        return totals
+
+    def close(self):
+        """Close every session and its connections"""
+        for session in self.sessions:
+            session.close()
@@ -0,0 +1,177 @@
+import heapq
+import math
+from collections import defaultdict
+
+from .geo import EARTH_RADIUS, BoundingBox, haversine
+from .models import Property
+
+# Default grid cell size, in degrees of latitude (~550 m)
+DEFAULT_CELL_SIZE = 0.005
+
+
+class SpatialIndex:
+    """In-memory grid index over property coordinates.
+
+    Properties are bucketed into fixed-size latitude/longitude cells, so radius, bounding box and
+    nearest-neighbour queries only look at the cells around the query instead of every listing.
+    Properties can be added at any time (e.g. as pages are fetched); a property whose
+    `propertyCode` is already indexed replaces the previous version. Listings without
+    `latitude`/`longitude` are ignored.
+    """
+
+    def __init__(self, properties: list[Property] | None = None, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], dict[str, tuple[float, float, Property]]] = defaultdict(dict)
+        self._cell_of: dict[str, tuple[int, int]] = {}
+        if properties:
+            self.extend(properties)
+
+    def __len__(self) -> int:
+        return len(self._cell_of)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_size), math.floor(lon / self.cell_size)
+
+    def add(self, prop: Property) -> bool:
+        """Index a property.
+
+        Returns:
+            bool: Whether the property had coordinates and was indexed.
+        """
+        lat, lon = prop["latitude"], prop["longitude"]
+        if lat is None or lon is None:
+            return False
+        lat, lon = float(lat), float(lon)
+        code = prop.property_code
+        previous = self._cell_of.get(code)
+        if previous is not None:
+            self._discard(previous, code)
+        cell = self._cell(lat, lon)
+        self._cells[cell][code] = (lat, lon, prop)
+        self._cell_of[code] = cell
+        return True
+
+    def extend(self, properties: list[Property]):
+        """Index several properties"""
+        for prop in properties:
+            self.add(prop)
+
+    def remove(self, property_code: str):
+        """Remove a property from the index, if present"""
+        cell = self._cell_of.pop(property_code, None)
+        if cell is not None:
+            self._discard(cell, property_code)
+
+    def _discard(self, cell: tuple[int, int], property_code: str):
+        entries = self._cells[cell]
+        del entries[property_code]
+        if not entries:
+            del self._cells[cell]
+
+    def _cells_in(self, bbox: BoundingBox):
+        min_row, min_col = self._cell(bbox.min_lat, bbox.min_lon)
+        max_row, max_col = self._cell(bbox.max_lat, bbox.max_lon)
+        if (max_row - min_row + 1) * (max_col - min_col + 1) > len(self._cells):
+            # Query larger than the indexed area: scanning the occupied cells is cheaper
+            for (row, col), entries in self._cells.items():
+                if min_row <= row <= max_row and min_col <= col <= max_col:
+                    yield entries
+            return
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                entries = self._cells.get((row, col))
+                if entries:
+                    yield entries
+
+    def within_bbox(self, bbox: BoundingBox) -> list[Property]:
+        """Return the properties inside a bounding box"""
+        return [
+            prop
+            for entries in self._cells_in(bbox)
+            for lat, lon, prop in entries.values()
+            if bbox.min_lat <= lat <= bbox.max_lat and bbox.min_lon <= lon <= bbox.max_lon
+        ]
+
+    def within_radius(self, lat: float, lon: float, radius: float) -> list[tuple[float, Property]]:
+        """Return the properties within `radius` meters of a point, closest first.
+
+        Returns:
+            list[tuple[float, Property]]: `(distance in meters, property)` pairs.
+        """
+        d_lat = math.degrees(radius / EARTH_RADIUS)
+        d_lon = math.degrees(radius / (EARTH_RADIUS * max(math.cos(math.radians(lat)), 1e-6)))
+        bbox = BoundingBox(lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon)
+
+        found = []
+        for entries in self._cells_in(bbox):
+            for p_lat, p_lon, prop in entries.values():
+                distance = haversine(lat, lon, p_lat, p_lon)
+                if distance <= radius:
+                    found.append((distance, prop))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> list[tuple[float, Property]]:
+        """Return the `k` properties closest to a point, closest first.
+
+        Cells are searched in growing rings around the point until no unvisited cell can hold
+        anything closer than the current k-th result.
+
+        Returns:
+            list[tuple[float, Property]]: `(distance in meters, property)` pairs.
+        """
+        if k <= 0 or not self._cell_of:
+            return []
+        center_row, center_col = self._cell(lat, lon)
+        # Smallest width of a cell (longitude cells shrink towards the poles)
+        cell_meters = math.radians(self.cell_size) * EARTH_RADIUS * max(math.cos(math.radians(abs(lat) + self.cell_size)), 1e-6)
+
+        heap: list[tuple[float, int, Property]] = []  # Max-heap on distance, via negation
+
+        def visit(entries):
+            for p_lat, p_lon, prop in entries.values():
+                distance = haversine(lat, lon, p_lat, p_lon)
+                item = (-distance, id(prop), prop)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif distance < -heap[0][0]:
+                    heapq.heapreplace(heap, item)
+
+        ring = 0
+        while True:
+            if len(heap) == k and -heap[0][0] <= (ring - 1) * cell_meters:
+                break
+            if (2 * ring + 1) ** 2 > len(self._cells):
+                # The rings now span more cells than are occupied: visit the remaining occupied
+                # cells directly, nearest rings first
+                remaining = [
+                    (max(abs(row - center_row), abs(col - center_col)), entries)
+                    for (row, col), entries in self._cells.items()
+                ]
+                remaining.sort(key=lambda item: item[0])
+                for cell_ring, entries in remaining:
+                    if cell_ring < ring:
+                        continue
+                    if len(heap) == k and -heap[0][0] <= (cell_ring - 1) * cell_meters:
+                        break
+                    visit(entries)
+                break
+            for row, col in _ring_cells(center_row, center_col, ring):
+                entries = self._cells.get((row, col))
+                if entries:
+                    visit(entries)
+            ring += 1
+        return sorted(((-d, prop) for d, _, prop in heap), key=lambda item: item[0])
+
+
+def _ring_cells(row: int, col: int, ring: int):
+    """Yield the cells at exactly `ring` steps (Chebyshev distance) from a cell"""
+    if ring == 0:
+        yield row, col
+        return
+    for c in range(col - ring, col + ring + 1):
+        yield row - ring, c
+        yield row + ring, c
+    for r in range(row - ring + 1, row + ring):
+        yield r, col - ring
+        yield r, col + ring
@@ -0,0 +1,263 @@
+from collections.abc import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None
+
+from .models import Property
+
+METRICS = ("price", "size", "price_per_area")
+GROUP_KEYS = ("municipality", "province", "typology")
+
+# Value range covered by the streaming histograms of each metric (log-spaced bins)
+HISTOGRAM_RANGES = {
+    "price": (10.0, 1e9),
+    "size": (1.0, 1e6),
+    "price_per_area": (0.01, 1e6),
+}
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for market statistics. Install it with `pip install idealista_api[analytics]`.")
+
+
+def _group_of(prop: Property, by: str | None) -> str:
+    if by is None:
+        return "all"
+    if by == "typology":
+        detailed_type = prop["detailedType"]
+        value = detailed_type.get("typology") if isinstance(detailed_type, dict) else None
+    else:
+        value = prop[by]
+    return value if value is not None else "unknown"
+
+
+def _columns(properties: Iterable[Property], by: str | None) -> tuple[list[str], "np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Extract the group labels and the price, size and price-by-area columns in a single pass."""
+    groups = []
+    prices = []
+    sizes = []
+    price_by_area = []
+    for prop in properties:
+        raw = prop.raw_data
+        groups.append(_group_of(prop, by))
+        prices.append(raw.get("price"))
+        sizes.append(raw.get("size"))
+        price_by_area.append(raw.get("priceByArea"))
+    prices = np.array(prices, dtype=float)
+    sizes = np.array(sizes, dtype=float)
+    price_by_area = np.array(price_by_area, dtype=float)
+    # Fill in price per area from price and size where the API didn't provide it
+    with np.errstate(divide="ignore", invalid="ignore"):
+        computed = np.where(sizes > 0, prices / sizes, np.nan)
+    price_by_area = np.where(np.isnan(price_by_area), computed, price_by_area)
+    return groups, prices, sizes, price_by_area
+
+
+def _check_metric(metric: str):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}'. Supported metrics are: {', '.join(METRICS)}")
+
+
+def _check_group_key(by: str | None):
+    if by is not None and by not in GROUP_KEYS:
+        raise ValueError(f"Unknown grouping key '{by}'. Supported keys are: {', '.join(GROUP_KEYS)}")
+
+
+def _metric_values(prices, sizes, price_by_area, metric: str) -> "np.ndarray":
+    _check_metric(metric)
+    return {"price": prices, "size": sizes, "price_per_area": price_by_area}[metric]
+
+
+def describe(
+    properties: Iterable[Property],
+    by: str | None = "municipality",
+    metric: str = "price_per_area",
+    quantiles: tuple[float, ...] = (0.25, 0.5, 0.75),
+) -> dict[str, dict]:
+    """Compute exact per-group statistics of a metric over a set of listings.
+
+    Args:
+        properties (Iterable[Property]): Listings to aggregate.
+        by (str | None): Grouping key (`"municipality"`, `"province"`, `"typology"`), or None for a single group.
+        metric (str): `"price"`, `"size"` or `"price_per_area"`.
+        quantiles (tuple[float, ...]): Quantiles to compute, between 0 and 1.
+
+    Returns:
+        dict[str, dict]: For each group, its `count`, `mean`, `min`, `max`, `median` and `quantiles`.
+
+    Raises:
+        ValueError: If `by` or `metric` isn't supported.
+    """
+    _require_numpy()
+    _check_group_key(by)
+    _check_metric(metric)
+    groups, prices, sizes, price_by_area = _columns(properties, by)
+    values = _metric_values(prices, sizes, price_by_area, metric)
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return {}
+    labels, group_idx = np.unique(np.array(groups, dtype=object)[valid], return_inverse=True)
+    values = values[valid]
+
+    # Sort by group, then by value, so each group is a contiguous sorted slice
+    order = np.lexsort((values, group_idx))
+    values = values[order]
+    counts = np.bincount(group_idx, minlength=len(labels))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    sums = np.add.reduceat(values, starts)
+
+    qs = np.asarray((0.5,) + tuple(quantiles), dtype=float)
+    # Linear interpolation between the closest ranks, for every group and quantile at once
+    positions = starts[:, None] + qs[None, :] * (counts[:, None] - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.ceil(positions).astype(int)
+    fraction = positions - lower
+    results = values[lower] * (1 - fraction) + values[upper] * fraction
+
+    return {
+        str(label): {
+            "count": int(counts[i]),
+            "mean": float(sums[i] / counts[i]),
+            "min": float(values[starts[i]]),
+            "max": float(values[starts[i] + counts[i] - 1]),
+            "median": float(results[i, 0]),
+            "quantiles": {q: float(v) for q, v in zip(quantiles, results[i, 1:])},
+        }
+        for i, label in enumerate(labels)
+    }
+
+
+class MarketStats:
+    """Running per-group market statistics, updated page by page during a crawl.
+
+    Instead of keeping every listing, each group keeps counts, sums, minimum, maximum and a
+    log-spaced histogram per metric, so memory doesn't grow with the number of listings.
+    Quantiles are estimated from the histograms (within about 1% with the default bins).
+    """
+
+    def __init__(self, by: str | None = "municipality", bins: int = 1024):
+        _require_numpy()
+        _check_group_key(by)
+        self.by = by
+        self.bins = bins
+        self.edges = {
+            metric: np.geomspace(low, high, bins + 1) for metric, (low, high) in HISTOGRAM_RANGES.items()
+        }
+        self.groups: dict[str, int] = {}
+        # One row per group; histograms have an extra bin on each side for out-of-range values
+        self._count = {m: np.zeros(0, dtype=np.int64) for m in METRICS}
+        self._sum = {m: np.zeros(0) for m in METRICS}
+        self._min = {m: np.zeros(0) for m in METRICS}
+        self._max = {m: np.zeros(0) for m in METRICS}
+        self._histograms = {m: np.zeros((0, bins + 2), dtype=np.int64) for m in METRICS}
+
+    def _grow(self, size: int):
+        extra = size - len(self._count["price"])
+        if extra <= 0:
+            return
+        for m in METRICS:
+            self._count[m] = np.concatenate((self._count[m], np.zeros(extra, dtype=np.int64)))
+            self._sum[m] = np.concatenate((self._sum[m], np.zeros(extra)))
+            self._min[m] = np.concatenate((self._min[m], np.full(extra, np.inf)))
+            self._max[m] = np.concatenate((self._max[m], np.full(extra, -np.inf)))
+            self._histograms[m] = np.vstack((self._histograms[m], np.zeros((extra, self.bins + 2), dtype=np.int64)))
+
+    def update(self, properties: Iterable[Property]):
+        """Add a batch of listings (e.g. one page) to the statistics"""
+        groups, prices, sizes, price_by_area = _columns(properties, self.by)
+        if not groups:
+            return
+        for group in groups:
+            if group not in self.groups:
+                self.groups[group] = len(self.groups)
+        self._grow(len(self.groups))
+        group_idx = np.fromiter((self.groups[g] for g in groups), dtype=np.int64, count=len(groups))
+
+        for metric in METRICS:
+            values = _metric_values(prices, sizes, price_by_area, metric)
+            valid = ~np.isnan(values)
+            idx, values = group_idx[valid], values[valid]
+            np.add.at(self._count[metric], idx, 1)
+            np.add.at(self._sum[metric], idx, values)
+            np.minimum.at(self._min[metric], idx, values)
+            np.maximum.at(self._max[metric], idx, values)
+            bins = np.searchsorted(self.edges[metric], values, side="right")
+            np.add.at(self._histograms[metric], (idx, bins), 1)
+
+    def histogram(self, group: str, metric: str = "price_per_area") -> tuple["np.ndarray", "np.ndarray"]:
+        """Return a group's histogram counts and bin edges for a metric.
+
+        Values outside the histogram range are counted in the first and last bins.
+        """
+        _check_metric(metric)
+        counts = self._histograms[metric][self.groups[group]].copy()
+        counts[1] += counts[0]
+        counts[-2] += counts[-1]
+        return counts[1:-1], self.edges[metric]
+
+    def quantiles(self, metric: str, qs: tuple[float, ...]) -> dict[str, dict[float, float]]:
+        """Estimate quantiles of a metric for every group"""
+        _check_metric(metric)
+        histograms = self._histograms[metric]
+        edges = self.edges[metric]
+        counts = self._count[metric]
+        cumulative = np.cumsum(histograms, axis=1)
+
+        result = {}
+        for group, i in self.groups.items():
+            if counts[i] == 0:
+                continue
+            estimates = {}
+            for q in qs:
+                target = q * counts[i]
+                b = int(np.searchsorted(cumulative[i], target, side="left"))
+                b = min(b, self.bins + 1)
+                if b == 0 or b == self.bins + 1:
+                    # Out of the histogram range: the best estimate is the observed extreme
+                    value = self._min[metric][i] if b == 0 else self._max[metric][i]
+                else:
+                    below = cumulative[i, b - 1]
+                    in_bin = histograms[i, b]
+                    fraction = (target - below) / in_bin if in_bin else 0.0
+                    # Geometric interpolation, since bins are log-spaced
+                    value = edges[b - 1] * (edges[b] / edges[b - 1]) ** fraction
+                estimates[q] = float(np.clip(value, self._min[metric][i], self._max[metric][i]))
+            result[group] = estimates
+        return result
+
+    def summary(self, metric: str = "price_per_area", quantiles: tuple[float, ...] = (0.25, 0.5, 0.75)) -> dict[str, dict]:
+        """Return per-group statistics of a metric, in the same format as `describe`"""
+        estimates = self.quantiles(metric, (0.5,) + tuple(quantiles))
+        counts = self._count[metric]
+        return {
+            group: {
+                "count": int(counts[i]),
+                "mean": float(self._sum[metric][i] / counts[i]),
+                "min": float(self._min[metric][i]),
+                "max": float(self._max[metric][i]),
+                "median": estimates[group][0.5],
+                "quantiles": {q: estimates[group][q] for q in quantiles},
+            }
+            for group, i in self.groups.items()
+            if counts[i]
+        }
+
+    def outliers(self, properties: Iterable[Property], metric: str = "price_per_area", k: float = 1.5) -> list[Property]:
+        """Return the listings whose metric is outside their group's Tukey fences.
+
+        A value is an outlier when it is below `Q1 - k * IQR` or above `Q3 + k * IQR`.
+        """
+        properties = list(properties)
+        groups, prices, sizes, price_by_area = _columns(properties, self.by)
+        values = _metric_values(prices, sizes, price_by_area, metric)
+        quartiles = self.quantiles(metric, (0.25, 0.75))
+
+        low = np.array([quartiles.get(g, {}).get(0.25, np.nan) for g in groups])
+        high = np.array([quartiles.get(g, {}).get(0.75, np.nan) for g in groups])
+        iqr = high - low
+        with np.errstate(invalid="ignore"):
+            mask = (values < low - k * iqr) | (values > high + k * iqr)
+        return [prop for prop, is_outlier in zip(properties, mask) if is_outlier]
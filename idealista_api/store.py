@@ -0,0 +1,310 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import zlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from .models import Property, Response
+
+
+def canonical_payload(raw: dict) -> bytes:
+    """Serialize a listing with sorted keys, so equal listings always give the same bytes"""
+    return json.dumps(raw, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def payload_hash(raw: dict) -> str:
+    """Return the content hash of a listing"""
+    return hashlib.blake2b(canonical_payload(raw), digest_size=16).hexdigest()
+
+
+class PayloadPool:
+    """Keeps one copy of each distinct listing payload in memory.
+
+    Interning the listings of repeated fetches makes identical listings share a single dict, so
+    caches holding many snapshots only pay for the content that changed.
+    """
+
+    def __init__(self):
+        self._payloads: dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._payloads
+
+    def intern(self, raw: dict) -> tuple[str, dict]:
+        """Return the hash of a payload and the shared copy of it"""
+        digest = payload_hash(raw)
+        shared = self._payloads.get(digest)
+        if shared is None:
+            self._payloads[digest] = shared = raw
+            self.misses += 1
+        else:
+            self.hits += 1
+        return digest, shared
+
+    def intern_properties(self, properties: Iterable[Property]) -> list[Property]:
+        """Return the properties rebuilt over shared payloads"""
+        return [Property(self.intern(prop.to_dict())[1]) for prop in properties]
+
+    def get(self, digest: str) -> dict | None:
+        """Return the payload with this hash, if known"""
+        return self._payloads.get(digest)
+
+    def add(self, digest: str, raw: dict):
+        """Add a payload whose hash is already known (e.g. read from a `ListingStore`)"""
+        self._payloads.setdefault(digest, raw)
+
+
+@dataclass
+class SnapshotInfo:
+    """Summary of a stored snapshot"""
+
+    id: int
+    name: str | None
+    created_at: float
+    listings: int
+    new_payloads: int  # Payloads stored for the first time by this snapshot
+
+
+class ListingStore:
+    """SQLite archive of listing snapshots, storing each distinct listing payload once.
+
+    Every snapshot references its listings by content hash, so listings that come back
+    unchanged in later crawls take a few bytes instead of a full copy. Payloads are stored
+    compressed.
+
+    Args:
+        path (str | os.PathLike): Database file (created if needed).
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS payloads (hash TEXT PRIMARY KEY, body BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT,
+                created_at REAL NOT NULL,
+                listings INTEGER NOT NULL,
+                new_payloads INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS snapshot_listings (
+                snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+                property_code TEXT,
+                hash TEXT NOT NULL REFERENCES payloads(hash)
+            );
+            CREATE INDEX IF NOT EXISTS snapshot_listings_snapshot ON snapshot_listings(snapshot_id);
+            """
+        )
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "ListingStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_snapshot(self, properties: Iterable[Property], name: str | None = None) -> SnapshotInfo:
+        """Store a snapshot of listings, e.g. every property fetched by a crawl.
+
+        Returns:
+            SnapshotInfo: The new snapshot, with how many payloads weren't already stored.
+        """
+        rows = []
+        payloads = {}
+        for prop in properties:
+            body = canonical_payload(prop.to_dict())
+            digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+            payloads[digest] = body
+            rows.append((prop.property_code, digest))
+
+        with self.connection:
+            # Only compress and write the payloads that aren't stored yet
+            known = self._known_hashes(payloads)
+            new = [(digest, zlib.compress(body)) for digest, body in payloads.items() if digest not in known]
+            self.connection.executemany("INSERT INTO payloads (hash, body) VALUES (?, ?)", new)
+            created_at = time.time()
+            cursor = self.connection.execute(
+                "INSERT INTO snapshots (name, created_at, listings, new_payloads) VALUES (?, ?, ?, ?)",
+                (name, created_at, len(rows), len(new)),
+            )
+            snapshot_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO snapshot_listings (snapshot_id, property_code, hash) VALUES (?, ?, ?)",
+                [(snapshot_id, code, digest) for code, digest in rows],
+            )
+        return SnapshotInfo(snapshot_id, name, created_at, len(rows), len(new))
+
+    def _known_hashes(self, digests: Iterable[str]) -> set[str]:
+        digests = list(digests)
+        known = set()
+        # Stay under SQLite's limit on query parameters
+        for start in range(0, len(digests), 500):
+            chunk = digests[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            known.update(row[0] for row in self.connection.execute(f"SELECT hash FROM payloads WHERE hash IN ({placeholders})", chunk))
+        return known
+
+    def snapshots(self) -> list[SnapshotInfo]:
+        """Return every stored snapshot, oldest first"""
+        rows = self.connection.execute("SELECT id, name, created_at, listings, new_payloads FROM snapshots ORDER BY id")
+        return [SnapshotInfo(*row) for row in rows]
+
+    def load_snapshot(self, snapshot_id: int, pool: PayloadPool | None = None) -> list[Property]:
+        """Return the listings of a snapshot.
+
+        Args:
+            snapshot_id (int): Snapshot to load.
+            pool (PayloadPool | None): Pool of already decoded payloads. Pass the same pool when
+                loading several snapshots, so payloads they share are decoded and kept only once.
+        """
+        pool = pool if pool is not None else PayloadPool()
+        rows = self.connection.execute(
+            "SELECT l.hash, p.body FROM snapshot_listings l JOIN payloads p ON p.hash = l.hash WHERE l.snapshot_id = ? ORDER BY l.rowid",
+            (snapshot_id,),
+        )
+        properties = []
+        for digest, body in rows:
+            raw = pool.get(digest)
+            if raw is None:
+                raw = json.loads(zlib.decompress(body))
+                pool.add(digest, raw)
+            properties.append(Property(raw))
+        return properties
+
+    def get_payload(self, digest: str) -> dict | None:
+        """Return a stored payload by hash"""
+        row = self.connection.execute("SELECT body FROM payloads WHERE hash = ?", (digest,)).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def stats(self) -> dict:
+        """Return storage statistics: snapshots, listings referenced, distinct payloads and their size"""
+        snapshots, listings = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(listings), 0) FROM snapshots").fetchone()
+        payloads, payload_bytes = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM payloads").fetchone()
+        return {
+            "snapshots": snapshots,
+            "listings": listings,
+            "distinct_payloads": payloads,
+            "payload_bytes": payload_bytes,
+            "dedup_ratio": listings / payloads if payloads else 0.0,
+        }
+
+
+class PageStore:
+    """Sequence of result pages that keeps only the most recent ones in memory.
+
+    Older pages are spilled, compressed, to a SQLite file and read back when accessed, so a
+    long multi-page fetch can be browsed and exported without holding every listing in memory.
+    It supports `len`, indexing and iteration like a list of `Response`. It isn't thread-safe: a
+    thread may iterate over it while no other thread modifies it.
+
+    Args:
+        max_in_memory (int): Pages kept in memory.
+        path (str | os.PathLike | None): Spill file. If None, a temporary file deleted by `close()`.
+    """
+
+    def __init__(self, max_in_memory: int = 20, path: str | os.PathLike | None = None):
+        if max_in_memory < 1:
+            raise ValueError("max_in_memory must be at least 1.")
+        self.max_in_memory = max_in_memory
+        self.path = path
+        self.property_count = 0
+        self._recent: deque[Response] = deque()
+        self._spilled = 0  # Pages [0, _spilled) are on disk
+        self._connection: sqlite3.Connection | None = None  # Opened on the first spill
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._recent)
+
+    @property
+    def pages_on_disk(self) -> int:
+        """Return how many pages have been spilled to disk"""
+        return self._spilled
+
+    def append(self, response: Response):
+        """Add a page, spilling the oldest page in memory if the window is full"""
+        self._recent.append(response)
+        self.property_count += len(response.element_list)
+        while len(self._recent) > self.max_in_memory:
+            self._spill(self._recent.popleft())
+
+    def _spill(self, response: Response):
+        if self._connection is None:
+            if self.path is None:
+                fd, self.path = tempfile.mkstemp(prefix="idealista_pages_", suffix=".sqlite")
+                os.close(fd)
+                self._temporary = True
+            else:
+                self._temporary = False
+            # Pages may be read from another thread (e.g. a background export), never concurrently with writes
+            self._connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            # A scratch file: durability isn't worth an fsync per page
+            self._connection.executescript(
+                """
+                PRAGMA journal_mode = OFF;
+                PRAGMA synchronous = OFF;
+                DROP TABLE IF EXISTS pages;
+                CREATE TABLE pages (position INTEGER PRIMARY KEY, body BLOB NOT NULL);
+                """
+            )
+        body = zlib.compress(json.dumps(response.raw_data, ensure_ascii=False).encode(), 1)
+        self._connection.execute("INSERT INTO pages (position, body) VALUES (?, ?)", (self._spilled, body))
+        self._spilled += 1
+
+    def __getitem__(self, index: int) -> Response:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+        if index >= self._spilled:
+            return self._recent[index - self._spilled]
+        row = self._connection.execute("SELECT body FROM pages WHERE position = ?", (index,)).fetchone()
+        return Response(json.loads(zlib.decompress(row[0])))
+
+    def __iter__(self) -> Iterator[Response]:
+        if self._spilled:
+            rows = self._connection.execute("SELECT body FROM pages WHERE position < ? ORDER BY position", (self._spilled,))
+            for (body,) in rows:
+                yield Response(json.loads(zlib.decompress(body)))
+        yield from list(self._recent)
+
+    def properties(self) -> Iterator[Property]:
+        """Iterate over the properties of every page, in order"""
+        for response in self:
+            yield from response.element_list
+
+    def clear(self):
+        """Remove every page"""
+        self._recent.clear()
+        self.property_count = 0
+        if self._connection is not None:
+            self._connection.execute("DELETE FROM pages")
+        self._spilled = 0
+
+    def close(self):
+        """Remove every page and release the spill file"""
+        self.clear()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            if self._temporary:
+                os.remove(self.path)
+                self.path = None
+
+    def __enter__(self) -> "PageStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
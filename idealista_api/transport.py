@@ -0,0 +1,153 @@
+import asyncio
+import json
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+import requests
+
+from .exceptions import TransportError
+from .sessions import SessionPool
+
+
+@dataclass
+class TransportResponse:
+    """HTTP response returned by a transport"""
+
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes  # Decoded body
+    wire_bytes: int = 0  # Body size as transferred, possibly compressed
+
+    def json(self) -> dict:
+        return json.loads(self.content)
+
+
+class Transport:
+    """Sends the client's HTTP requests.
+
+    Implement `post` to use another HTTP stack; connection-level failures must be raised as
+    `TransportError`, so the client can retry them.
+    """
+
+    def post(self, url: str, body: bytes, headers: Mapping[str, str], country: str | None = None) -> TransportResponse:
+        """Send a POST request.
+
+        Args:
+            url (str): Request URL.
+            body (bytes): Form-encoded request body.
+            headers (Mapping[str, str]): Request headers.
+            country (str | None): Country of a search request, for transports that shard by country.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release the transport's connections"""
+
+
+class RequestsTransport(Transport):
+    """Transport based on `requests`, with pooled and optionally sharded sessions.
+
+    Args:
+        sessions (SessionPool | None): Sessions to send requests through (a default pool if None).
+        session_factory (Callable[[], requests.Session] | None): Creates the sessions of the default pool.
+    """
+
+    def __init__(self, sessions: SessionPool | None = None, session_factory: Callable[[], requests.Session] | None = None):
+        self.sessions = sessions or SessionPool(session_factory=session_factory)
+
+    def post(self, url: str, body: bytes, headers: Mapping[str, str], country: str | None = None) -> TransportResponse:
+        try:
+            response = self.sessions.get(country).post(url, data=body, headers=headers)
+            content = response.content
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise TransportError(f"{type(e).__name__}: {e}") from e
+        tell = getattr(response.raw, "tell", None)
+        # Responses not read from a socket (e.g. replayed ones) have no wire size
+        wire_bytes = tell() if tell is not None else len(content)
+        return TransportResponse(response.status_code, response.headers, content, wire_bytes)
+
+    def close(self):
+        self.sessions.close()
+
+
+class AsyncTransport:
+    """Sends the async client's HTTP requests. Failures must be raised as `TransportError`."""
+
+    async def post(self, url: str, body: bytes, headers: Mapping[str, str], country: str | None = None) -> TransportResponse:
+        """Send a POST request, see `Transport.post`"""
+        raise NotImplementedError
+
+    async def aclose(self):
+        """Release the transport's connections"""
+
+
+class ThreadedTransport(AsyncTransport):
+    """Runs a synchronous transport in worker threads, so it can be awaited.
+
+    Args:
+        transport (Transport | None): Transport to wrap (a `RequestsTransport` if None).
+    """
+
+    def __init__(self, transport: Transport | None = None):
+        self.transport = transport or RequestsTransport()
+
+    async def post(self, url: str, body: bytes, headers: Mapping[str, str], country: str | None = None) -> TransportResponse:
+        return await asyncio.to_thread(self.transport.post, url, body, headers, country)
+
+    async def aclose(self):
+        self.transport.close()
+
+
+class LoopTransport(Transport):
+    """Sends requests from worker threads through an async transport running on an event loop.
+
+    The inverse of `ThreadedTransport`: `post` blocks until the loop has sent the request, so it
+    must not be called from the loop's own thread. Meant for native async transports; a
+    `ThreadedTransport` would need a free executor thread to send the request.
+
+    Args:
+        transport (AsyncTransport): Transport to send requests with.
+        loop (asyncio.AbstractEventLoop): Event loop the transport runs on.
+    """
+
+    def __init__(self, transport: AsyncTransport, loop: asyncio.AbstractEventLoop):
+        self.transport = transport
+        self.loop = loop
+
+    def post(self, url: str, body: bytes, headers: Mapping[str, str], country: str | None = None) -> TransportResponse:
+        return asyncio.run_coroutine_threadsafe(self.transport.post(url, body, headers, country), self.loop).result()
+
+
+class HttpxTransport(AsyncTransport):
+    """Native async transport based on `httpx`, multiplexing requests over HTTP/2 when available.
+
+    Requires the `httpx` package (`pip install idealista_api[async]`).
+
+    Args:
+        client_factory (Callable[[], httpx.AsyncClient] | None): Creates the `httpx.AsyncClient` to
+            use, e.g. to set limits, timeouts or a custom transport for tests.
+        max_connections (int): Connection limit of the default client.
+        http2 (bool): Negotiate HTTP/2 with the default client (requires the `h2` package).
+    """
+
+    def __init__(self, client_factory: Callable[[], object] | None = None, max_connections: int = 100, http2: bool = False):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("HttpxTransport requires the 'httpx' package (pip install idealista_api[async]).") from e
+        self._httpx = httpx
+        if client_factory is None:
+            limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+            self.client = httpx.AsyncClient(limits=limits, http2=http2, timeout=30.0)
+        else:
+            self.client = client_factory()
+
+    async def post(self, url: str, body: bytes, headers: Mapping[str, str], country: str | None = None) -> TransportResponse:
+        try:
+            response = await self.client.post(url, content=body, headers=headers)
+        except self._httpx.TransportError as e:
+            raise TransportError(f"{type(e).__name__}: {e}") from e
+        return TransportResponse(response.status_code, response.headers, response.content, response.num_bytes_downloaded)
+
+    async def aclose(self):
+        await self.client.aclose()
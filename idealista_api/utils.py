@@ -1,31 +1,65 @@
 import base64
 import requests
 
+from idealista_api import consts
 from idealista_api.exceptions import AuthenticationException
 
+TOKEN_FORM = b"grant_type=client_credentials&scope=read"
 
-def get_bearer_token(api_key: str, secret: str) -> str:
+
+def get_bearer_token(api_key: str, secret: str, token_url: str | None = None, transport=None) -> str:
     """Request a Bearer token for OAuth authentication.
 
     Args:
         api_key (str): API key
         secret (str): secret
+        token_url (str | None): OAuth token URL (defaults to `consts.TOKEN_URL`)
+        transport (Transport | None): Transport to send the request with (plain `requests` if None)
+    """
+    return request_token(api_key=api_key, secret=secret, token_url=token_url, transport=transport)[0]
+
+
+def request_token(api_key: str, secret: str, token_url: str | None = None, transport=None) -> tuple[str, int]:
+    """Request a Bearer token for OAuth authentication, along with its lifetime.
+
+    Args:
+        api_key (str): API key
+        secret (str): secret
+        token_url (str | None): OAuth token URL (defaults to `consts.TOKEN_URL`)
+        transport (Transport | None): Transport to send the request with (plain `requests` if None)
+
+    Returns:
+        tuple[str, int]: The token and the number of seconds until it expires.
+    """
+    url = token_url or consts.TOKEN_URL
+    headers = token_headers(api_key, secret)
+    if transport is None:
+        req = requests.post(url, TOKEN_FORM, headers=headers).json()
+    else:
+        req = transport.post(url, TOKEN_FORM, headers).json()
+    return parse_token_response(req)
+
+
+def token_headers(api_key: str, secret: str) -> dict[str, str]:
+    """Return the headers of a token request"""
+    return {
+        "Authorization": f"Basic {encode_values(api_key + ':' + secret)}",
+        "Content-Type": "application/x-www-form-urlencoded",
+    }
+
+
+def parse_token_response(req: dict) -> tuple[str, int]:
+    """Return the token and its lifetime from a token response.
+
+    Raises:
+        AuthenticationException: If the response has no token.
     """
-    credentials = encode_values(api_key + ":" + secret)
-    req = requests.post(
-        "https://api.idealista.com/oauth/token",
-        "grant_type=client_credentials&scope=read",
-        headers={
-            "Authorization": f"Basic {credentials}",
-            "Content-Type": "application/x-www-form-urlencoded",
-        },
-    ).json()
     if "access_token" not in req:
         raise AuthenticationException(
             f"Error obtaining bearer token: {req.get('error', 'Unknown error')} - {req.get('error_description', 'No description available')}",
             response=req,
         )
-    return req["access_token"]
+    return req["access_token"], int(req.get("expires_in", 0))
 
 
 def encode_values(credentials: str):
@@ -1,6 +1,5 @@
 import sys
 import json
-import csv
 from pathlib import Path
 from datetime import datetime
 from PySide6.QtWidgets import (
@@ -11,6 +10,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QThread, Signal
 from idealista_api import Idealista, Search
+from idealista_api.export import LISTING_PROJECTION, write_csv
 
 
 class ApiWorker(QThread):
@@ -454,20 +454,9 @@ class IdealistaGUI(QMainWindow):
 
         if file_path:
             try:
-                # Collect all unique keys from all properties
-                all_keys = set()
-                for prop in self.last_response.element_list:
-                    all_keys.update(prop.to_dict().keys())
-                
-                # Sort keys for consistent column order
-                fieldnames = sorted(all_keys)
-
-                with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    
-                    for prop in self.last_response.element_list:
-                        writer.writerow(prop.to_dict())
+                # One column per listing field, with nested objects flattened, plus any other key
+                properties = self.last_response.element_list
+                write_csv(file_path, properties, projection=LISTING_PROJECTION.with_extras(properties))
 
                 QMessageBox.information(self, "Success",
                                       f"Results exported to:\n{file_path}")
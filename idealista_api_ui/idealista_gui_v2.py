@@ -1,8 +1,9 @@
 import sys
 import json
-import csv
 import os
 import logging
+import time
+import unicodedata
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
@@ -10,11 +11,20 @@ from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QComboBox, QSpinBox, QDoubleSpinBox, QCheckBox,
     QPushButton, QTextEdit, QGroupBox, QFormLayout, QFileDialog,
-    QMessageBox, QProgressBar, QTabWidget, QScrollArea
+    QMessageBox, QProgressBar, QTabWidget, QScrollArea, QCompleter,
+    QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView
 )
-from PySide6.QtCore import Qt, QThread, Signal
-from idealista_api import Idealista, Search
+from PySide6.QtCore import (
+    Qt, QThread, QTimer, Signal, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QStringListModel,
+    QObject, QRunnable, QThreadPool
+)
+from idealista_api import Idealista, RateLimiter, Search
+from idealista_api.models import Property, Response
+from idealista_api.store import PageStore, payload_hash
 from idealista_api.consts import URL
+from idealista_api.export import ExportCancelled, match_keywords, write_csv, write_json
+from idealista_api.projection import Field, Projection
+from idealista_api.spatial import SpatialIndex
 
 # Configure logging
 logging.basicConfig(
@@ -24,6 +34,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Time to interactive above which the startup report is logged as a warning
+STARTUP_BUDGET_SECONDS = 1.0
+
+# Result pages kept in memory; older ones are spilled to a temporary file
+RESULT_PAGES_IN_MEMORY = 20
+# Properties written to the results view (exports always include every property)
+MAX_DISPLAYED_PROPERTIES = 2000
+# Fields listed for each property in the results view, named by their translation key
+RESULT_FIELDS = Projection([
+    Field('code', 'propertyCode', None),
+    Field('type', 'propertyType', None),
+    Field('address', None, None),
+    Field('price', None, None),
+    Field('operation', None, None),
+])
+# Fields kept in the spatial index, enough to list the properties found in a region
+SPATIAL_INDEX_FIELDS = Projection(
+    Field(key, None, None) for key in ('propertyCode', 'latitude', 'longitude', 'propertyType', 'address', 'price', 'operation'))
+
 
 # Translations
 TRANSLATIONS = {
@@ -33,6 +62,9 @@ TRANSLATIONS = {
         'search_tab': 'Filtros de Pesquisa',
         'results_tab': 'Resultados',
         'not_connected': 'Não conectado',
+        'connecting': 'A conectar...',
+        'connected': 'Conectado',
+        'loading_locations': 'A carregar localizações...',
         'auth_group': 'Autenticação API',
         'api_key': 'Chave API:',
         'api_secret': 'Segredo API:',
@@ -111,6 +143,9 @@ TRANSLATIONS = {
         'exported_csv': 'Exportado para CSV: {}',
         'export_error': 'Erro de Exportação',
         'export_failed': 'Falha ao exportar: {}',
+        'exporting': 'A exportar... {} de {} propriedades',
+        'cancel_export': 'Cancelar Exportação',
+        'export_cancelled': 'Exportação cancelada, o ficheiro não foi alterado',
         'language': 'Idioma:',
         'not_set': 'Não definido',
         'asc': 'Ascendente',
@@ -134,6 +169,36 @@ TRANSLATIONS = {
         'highlight_matches': 'Destacar correspondências',
         'matched_keywords': 'Palavras-chave encontradas: {}',
         'properties_matched': '{} propriedades com correspondências',
+        'region_filter': 'Filtro de Região',
+        'radius': 'Raio:',
+        'apply_region_filter': 'Filtrar',
+        'clear_region_filter': 'Limpar',
+        'region_matches': '{} propriedades num raio de {} m',
+        'invalid_center': 'Centro inválido. Use o formato lat,lon.',
+        'jobs_tab': 'Fila de Pesquisas',
+        'add_to_queue': 'Adicionar à Fila',
+        'job_batch': 'Lote de Pesquisas',
+        'batch_locations': 'IDs de Localização (um por linha):',
+        'batch_locations_placeholder': 'Vazio: usar a localização dos filtros',
+        'batch_operations': 'Operações:',
+        'add_batch': 'Adicionar Lote',
+        'parallel_jobs': 'Pesquisas em paralelo:',
+        'requests_per_second': 'Pedidos por segundo:',
+        'job_search': 'Pesquisa',
+        'job_status': 'Estado',
+        'job_pages': 'Páginas',
+        'job_properties': 'Propriedades',
+        'job_queued': 'Em fila',
+        'job_running': 'Em curso',
+        'job_done': 'Concluída',
+        'job_failed': 'Falhou',
+        'job_cancelled': 'Cancelada',
+        'cancel_selected': 'Cancelar Selecionadas',
+        'cancel_all': 'Cancelar Todas',
+        'show_merged': 'Mostrar Resultados Combinados',
+        'jobs_added': '{} pesquisas adicionadas à fila',
+        'merged_summary': '{} propriedades únicas ({} duplicadas) de {} pesquisas',
+        'more_properties': '... e mais {} propriedades (exporte para ver todas)',
     },
     'en': {
         'window_title': 'Idealista API Client',
@@ -141,6 +206,9 @@ TRANSLATIONS = {
         'search_tab': 'Search Filters',
         'results_tab': 'Results',
         'not_connected': 'Not connected',
+        'connecting': 'Connecting...',
+        'connected': 'Connected',
+        'loading_locations': 'Loading locations...',
         'auth_group': 'API Authentication',
         'api_key': 'API Key:',
         'api_secret': 'API Secret:',
@@ -219,6 +287,9 @@ TRANSLATIONS = {
         'exported_csv': 'Exported to CSV: {}',
         'export_error': 'Export Error',
         'export_failed': 'Failed to export: {}',
+        'exporting': 'Exporting... {} of {} properties',
+        'cancel_export': 'Cancel Export',
+        'export_cancelled': 'Export cancelled, the file was not changed',
         'language': 'Language:',
         'not_set': 'Not set',
         'asc': 'Ascending',
@@ -242,10 +313,161 @@ TRANSLATIONS = {
         'highlight_matches': 'Highlight matches',
         'matched_keywords': 'Keywords found: {}',
         'properties_matched': '{} properties with matches',
+        'region_filter': 'Region Filter',
+        'radius': 'Radius:',
+        'apply_region_filter': 'Filter',
+        'clear_region_filter': 'Clear',
+        'region_matches': '{} properties within {} m',
+        'invalid_center': 'Invalid center. Use the lat,lon format.',
+        'jobs_tab': 'Search Queue',
+        'add_to_queue': 'Add to Queue',
+        'job_batch': 'Search Batch',
+        'batch_locations': 'Location IDs (one per line):',
+        'batch_locations_placeholder': 'Empty: use the location from the filters',
+        'batch_operations': 'Operations:',
+        'add_batch': 'Add Batch',
+        'parallel_jobs': 'Parallel searches:',
+        'requests_per_second': 'Requests per second:',
+        'job_search': 'Search',
+        'job_status': 'Status',
+        'job_pages': 'Pages',
+        'job_properties': 'Properties',
+        'job_queued': 'Queued',
+        'job_running': 'Running',
+        'job_done': 'Done',
+        'job_failed': 'Failed',
+        'job_cancelled': 'Cancelled',
+        'cancel_selected': 'Cancel Selected',
+        'cancel_all': 'Cancel All',
+        'show_merged': 'Show Merged Results',
+        'jobs_added': '{} searches added to the queue',
+        'merged_summary': '{} unique properties ({} duplicates) from {} searches',
+        'more_properties': '... and {} more properties (export to see them all)',
     }
 }
 
 
+def fold_text(text):
+    """Lowercase text without accents, so 'agueda' matches 'Águeda'"""
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c)).casefold()
+
+
+class LocationModel(QAbstractListModel):
+    """Location catalog shared by the location picker and its completer"""
+    TypeRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.set_locations([])
+
+    def set_locations(self, locations):
+        """Replace the catalog, and rebuild the accent-insensitive search index"""
+        self.beginResetModel()
+        self.ids = [loc['id'] for loc in locations]
+        self.types = [loc.get('type', '') for loc in locations]
+        self.labels = [f"{loc['name']} ({loc.get('type', '')})" for loc in locations]
+        self.search_keys = [fold_text(f"{loc['name']} {loc['id']}") for loc in locations]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.labels[row]
+        if role == Qt.UserRole:
+            return self.ids[row]
+        if role == self.TypeRole:
+            return self.types[row]
+        return None
+
+    def search(self, query, location_type=None, limit=50):
+        """Return the rows whose name or ID contain every word of the query, ignoring case and accents.
+
+        Rows whose name starts with the query come first, then those with a word starting with it.
+        """
+        words = fold_text(query).split()
+        if not words:
+            return []
+        prefix = ' '.join(words)
+        ranked = []
+        for row, key in enumerate(self.search_keys):
+            if (location_type is None or self.types[row] == location_type) and all(word in key for word in words):
+                rank = 0 if key.startswith(prefix) else 1 if ' ' + words[0] in key else 2
+                ranked.append((rank, row))
+        ranked.sort()
+        return [row for _, row in ranked[:limit]]
+
+
+class LocationTypeProxy(QSortFilterProxyModel):
+    """Shows the locations of one type (or all of them) without copying the catalog"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.location_type = None
+
+    def set_location_type(self, location_type):
+        # beginFilterChange replaces invalidateFilter from Qt 6.10
+        if hasattr(self, 'beginFilterChange'):
+            self.beginFilterChange()
+            self.location_type = location_type
+            self.endFilterChange()
+        else:
+            self.location_type = location_type
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.location_type is None or self.sourceModel().types[source_row] == self.location_type
+
+
+class StartupTimer:
+    """Records when each startup phase finished, relative to the timer's creation"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = {}
+
+    def mark(self, phase):
+        """Record the end of a phase (only its first occurrence counts)"""
+        self.marks.setdefault(phase, time.perf_counter() - self.start)
+
+    def report(self):
+        """Return the phases in the order they finished, e.g. 'window 40 ms, interactive 65 ms'"""
+        return ", ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in sorted(self.marks.items(), key=lambda item: item[1]))
+
+
+class CatalogWorker(QThread):
+    """Worker thread to parse the location catalog without blocking startup"""
+    loaded = Signal(list)  # Emits the list of locations
+
+    def __init__(self, loader):
+        super().__init__()
+        self.loader = loader
+
+    def run(self):
+        self.loaded.emit(self.loader())
+
+
+class ConnectWorker(QThread):
+    """Worker thread to request the OAuth token without blocking the UI"""
+    connected = Signal(object)  # Emits the Idealista client
+    error = Signal(str)  # Emits error message
+
+    def __init__(self, api_key, api_secret):
+        super().__init__()
+        self.api_key = api_key
+        self.api_secret = api_secret
+
+    def run(self):
+        try:
+            self.connected.emit(Idealista(api_key=self.api_key, api_secret=self.api_secret))
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class ApiWorker(QThread):
     """Worker thread to handle API calls without blocking the UI"""
     finished = Signal(object)  # Emits the Response object
@@ -267,7 +489,8 @@ class ApiWorker(QThread):
 class MultiPageWorker(QThread):
     """Worker thread to handle multi-page API calls with delay"""
     progress = Signal(int, int, int)  # current_page, total_pages, properties_count
-    finished = Signal(list)  # Emits list of all Response objects
+    page_fetched = Signal(object)  # Emits each Response as soon as it is fetched
+    finished = Signal(int)  # Emits the number of pages fetched; the pages themselves go through page_fetched
     error = Signal(str)  # Emits error message
     
     def __init__(self, idealista_client, search_params, delay_seconds=2):
@@ -285,15 +508,16 @@ class MultiPageWorker(QThread):
         import time
         from idealista_api import Search
         
-        all_responses = []
+        pages_fetched = 0
         total_properties = 0
         
         try:
             # First request to get total pages
             first_search = Search(**self.search_params)
             first_response = self.idealista_client.query(first_search)
-            all_responses.append(first_response)
+            pages_fetched += 1
             total_properties += len(first_response.element_list)
+            self.page_fetched.emit(first_response)
             
             total_pages = first_response.total_pages
             logger.info(f"Total pages to fetch: {total_pages}")
@@ -315,31 +539,165 @@ class MultiPageWorker(QThread):
                 
                 search = Search(**page_params)
                 response = self.idealista_client.query(search)
-                all_responses.append(response)
+                pages_fetched += 1
                 total_properties += len(response.element_list)
+                self.page_fetched.emit(response)
                 
                 logger.info(f"Fetched page {page}/{total_pages} - {len(response.element_list)} properties")
                 self.progress.emit(page, total_pages, total_properties)
             
-            self.finished.emit(all_responses)
+            self.finished.emit(pages_fetched)
             
         except Exception as e:
             logger.error(f"Error in multi-page fetch: {e}")
             self.error.emit(str(e))
 
 
+class ExportWorker(QThread):
+    """Worker thread writing an export file, so large results don't freeze the UI"""
+    progress = Signal(int)  # Properties written
+    finished = Signal(str)  # Emits the file path
+    cancelled = Signal()
+    error = Signal(str)  # Emits error message
+
+    def __init__(self, write, file_path, *args, **kwargs):
+        super().__init__()
+        self.write = write  # write_json or write_csv
+        self.file_path = file_path
+        self.args = args
+        self.kwargs = kwargs
+        self.should_cancel = False
+
+    def cancel(self):
+        """Stop the export, leaving any existing file untouched"""
+        self.should_cancel = True
+
+    def run(self):
+        try:
+            self.write(self.file_path, *self.args, progress=self.progress.emit,
+                       should_cancel=lambda: self.should_cancel, **self.kwargs)
+            self.finished.emit(self.file_path)
+        except ExportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            logger.error(f"Error exporting to {self.file_path}: {e}")
+            self.error.emit(str(e))
+
+
+class JobSignals(QObject):
+    """Signals of a SearchJob (a QRunnable can't emit signals itself)"""
+    started = Signal(int)  # job_id
+    page_fetched = Signal(int, object)  # job_id, Response
+    progress = Signal(int, int, int, int)  # job_id, current_page, total_pages, properties_count
+    finished = Signal(int)  # job_id
+    error = Signal(int, str)  # job_id, error message
+
+
+class SearchJob(QRunnable):
+    """One search of the job queue, fetching every page under a rate limit shared with the other jobs"""
+
+    def __init__(self, job_id, idealista_client, search_params, rate_limiter):
+        super().__init__()
+        # Kept alive by the window, so it can be cancelled or taken back from the pool
+        self.setAutoDelete(False)
+        self.job_id = job_id
+        self.idealista_client = idealista_client
+        self.search_params = search_params
+        self.rate_limiter = rate_limiter
+        self.signals = JobSignals()
+        self.should_cancel = False
+        self.status = 'job_queued'
+        self.pages = (0, 0)  # Fetched, total
+        self.properties = 0
+        self.error = None
+
+    def cancel(self):
+        """Stop after the page being fetched"""
+        self.should_cancel = True
+
+    def run(self):
+        self.signals.started.emit(self.job_id)
+        page = self.search_params.get('num_page') or 1
+        properties_count = 0
+        try:
+            while not self.should_cancel:
+                self.rate_limiter.acquire()
+                response = self.idealista_client.query(Search(**{**self.search_params, 'num_page': page}))
+                properties_count += len(response.element_list)
+                self.signals.page_fetched.emit(self.job_id, response)
+                self.signals.progress.emit(self.job_id, page, response.total_pages, properties_count)
+                if page >= response.total_pages:
+                    break
+                page += 1
+            self.signals.finished.emit(self.job_id)
+        except Exception as e:
+            logger.error(f"Error in job {self.job_id}: {e}")
+            self.signals.error.emit(self.job_id, str(e))
+
+
 class IdealistaGUI(QMainWindow):
-    def __init__(self):
+    def __init__(self, startup_timer=None):
         super().__init__()
+        self.startup_timer = startup_timer or StartupTimer()
+        # Phases still running; the startup report is logged when the last one finishes
+        self.startup_pending = {'interactive', 'catalog', 'connect'}
         self.idealista_client = None
         self.last_response = None
-        self.all_responses = []  # Store all responses from multi-page fetch
+        # Pages of the last multi-page fetch (or merged queue results), spilled to disk beyond a window
+        self.all_responses = PageStore(RESULT_PAGES_IN_MEMORY)
+        self.spatial_index = SpatialIndex()  # Coordinates of the fetched properties
         self.current_language = 'pt'  # Default to Portuguese
-        self.locations_data = self.load_locations()
+        self.locations_data = []  # Filled by the catalog worker
+        self.location_model = LocationModel(self)
+        self.catalog_ready = False
         self.multi_page_worker = None  # Track multi-page worker
+        self.export_worker = None
+        self.connect_worker = None
+        # Job queue: searches run in parallel, under one shared rate limit
+        self.jobs = []  # SearchJob per table row
+        self.job_pool = QThreadPool(self)
+        self.job_pool.setMaxThreadCount(4)
+        self.job_rate_limiter = RateLimiter(1.0)
+        self.merged_properties = {}  # Property code (or payload hash) -> raw listing
+        self.merged_duplicates = 0
+        self.connection_state = 'not_connected'
+        self.search_btn_key = 'search'
+        self.translated_texts = []  # (setter, key) of every text to update on a language change
         self.init_ui()
-        # Automatically connect to API after UI is initialized
+        self.startup_timer.mark('window')
+
+        # Parse the catalog and request the token in the background, so the window shows at once
+        self.catalog_worker = CatalogWorker(self.load_locations)
+        self.catalog_worker.loaded.connect(self.on_catalog_loaded)
+        self.catalog_worker.start()
         self.auto_connect_api()
+        # Runs on the first event loop iteration, once the window can respond to input
+        QTimer.singleShot(0, lambda: self.mark_startup('interactive'))
+
+    def mark_startup(self, phase):
+        """Record the end of a startup phase, and log the report once every phase is done"""
+        if phase not in self.startup_pending:
+            return
+        self.startup_pending.discard(phase)
+        self.startup_timer.mark(phase)
+        if not self.startup_pending:
+            interactive = self.startup_timer.marks['interactive']
+            log = logger.warning if interactive > STARTUP_BUDGET_SECONDS else logger.info
+            log(f"Startup: {self.startup_timer.report()}")
+
+    def closeEvent(self, event):
+        """Let the startup workers finish, so their threads aren't destroyed while running"""
+        for worker in (self.catalog_worker, self.connect_worker):
+            if worker is not None:
+                worker.wait()
+        self.cancel_jobs(self.jobs)
+        self.job_pool.waitForDone()
+        if self.multi_page_worker is not None:
+            self.multi_page_worker.cancel()
+            self.multi_page_worker.wait()
+        self.stop_export()
+        self.all_responses.close()
+        super().closeEvent(event)
 
     def tr(self, key):
         """Translate a key to the current language"""
@@ -359,27 +717,11 @@ class IdealistaGUI(QMainWindow):
         Returns:
             tuple: (has_match: bool, matched_keywords: list)
         """
-        keywords = self.get_keywords()
-        if not keywords:
-            return False, []
-        
-        # Get description from property
-        description = prop.raw_data.get('description', '')
-        if not description:
-            return False, []
-        
-        # Check case sensitivity
-        case_sensitive = self.case_sensitive_check.isChecked()
-        
-        matched = []
-        for keyword in keywords:
-            if case_sensitive:
-                if keyword in description:
-                    matched.append(keyword)
-            else:
-                if keyword.lower() in description.lower():
-                    matched.append(keyword)
-        
+        matched = match_keywords(
+            prop.raw_data.get('description', ''),
+            self.get_keywords(),
+            self.case_sensitive_check.isChecked()
+        )
         return len(matched) > 0, matched
 
     def load_locations(self):
@@ -404,12 +746,6 @@ class IdealistaGUI(QMainWindow):
             types.add(loc.get('type', ''))
         return sorted(types)
 
-    def filter_locations_by_type(self, location_type):
-        """Filter locations by type"""
-        if not location_type or location_type == self.tr('all_types'):
-            return self.locations_data
-        return [loc for loc in self.locations_data if loc.get('type') == location_type]
-
     def load_env_credentials(self):
         """Load API credentials from .env file"""
         # Get project root directory (parent of idealista_api_ui)
@@ -431,19 +767,64 @@ class IdealistaGUI(QMainWindow):
             # Populate the input fields
             self.api_key_input.setText(api_key)
             self.api_secret_input.setText(api_secret)
-            
-            try:
-                self.idealista_client = Idealista(api_key=api_key, api_secret=api_secret)
-                self.statusBar().showMessage(self.tr('auto_connect_success'))
-                self.search_btn.setEnabled(True)
-            except Exception as e:
-                self.statusBar().showMessage(self.tr('auto_connect_failed'))
-                print(f"Auto-connection error: {e}")
+            self.start_connect(api_key, api_secret, auto=True)
         else:
             self.statusBar().showMessage(self.tr('env_not_found'))
+            self.mark_startup('connect')
+
+    def start_connect(self, api_key, api_secret, auto=False):
+        """Request a token in the background; `auto` reports the outcome in the status bar only"""
+        self.set_connection_state('connecting')
+        self.connect_btn.setEnabled(False)
+        self.connect_worker = ConnectWorker(api_key, api_secret)
+        self.connect_worker.connected.connect(lambda client: self.on_connected(client, auto))
+        self.connect_worker.error.connect(lambda error: self.on_connect_error(error, auto))
+        self.connect_worker.start()
+
+    def on_connected(self, client, auto):
+        """Handle a successful connection"""
+        self.idealista_client = client
+        self.set_connection_state('connected')
+        self.connect_btn.setEnabled(True)
+        if hasattr(self, 'search_btn'):
+            self.search_btn.setEnabled(True)
+            self.add_to_queue_btn.setEnabled(True)
+        if auto:
+            self.statusBar().showMessage(self.tr('auto_connect_success'))
+        else:
+            self.statusBar().showMessage(self.tr('connected_success'))
+            QMessageBox.information(self, self.tr('success'), self.tr('connected_msg'))
+        self.mark_startup('connect')
+
+    def on_connect_error(self, error_msg, auto):
+        """Handle a failed connection"""
+        self.set_connection_state('connection_failed')
+        self.connect_btn.setEnabled(True)
+        if auto:
+            self.statusBar().showMessage(self.tr('auto_connect_failed'))
+            logger.error(f"Auto-connection error: {error_msg}")
+        else:
+            QMessageBox.critical(self, self.tr('connection_error'), f"{self.tr('connection_failed_msg')}: {error_msg}")
+            self.statusBar().showMessage(self.tr('connection_failed'))
+        self.mark_startup('connect')
+
+    def set_connection_state(self, state):
+        """Show the connection state in the status bar indicator"""
+        self.connection_state = state
+        self.connection_label.setText(self.tr(state))
+
+    def on_catalog_loaded(self, locations):
+        """Fill the location widgets once the catalog has been parsed"""
+        self.locations_data = locations
+        self.catalog_ready = True
+        self.location_model.set_locations(locations)
+        if hasattr(self, 'location_type_combo'):
+            self.location_type_combo.addItems(self.get_location_types())
+            self.update_location_placeholder()
+        self.mark_startup('catalog')
 
     def init_ui(self):
-        self.setWindowTitle(self.tr('window_title'))
+        self.translate(self.setWindowTitle, 'window_title')
         self.setMinimumSize(900, 700)
 
         # Central widget and main layout
@@ -453,7 +834,7 @@ class IdealistaGUI(QMainWindow):
 
         # Language selector at top
         lang_layout = QHBoxLayout()
-        lang_layout.addWidget(QLabel(self.tr('language')))
+        lang_layout.addWidget(self.translated(QLabel(), 'language'))
         self.language_combo = QComboBox()
         self.language_combo.addItems(['Português', 'English'])
         self.language_combo.setCurrentIndex(0)  # Portuguese as default
@@ -465,68 +846,87 @@ class IdealistaGUI(QMainWindow):
         # Create tabs
         self.tabs = QTabWidget()
         main_layout.addWidget(self.tabs)
+        self.tabs.currentChanged.connect(self.ensure_tab)
+        self.add_tabs()
 
-        # Authentication tab
-        self.auth_tab = self.create_auth_tab()
-        self.tabs.addTab(self.auth_tab, self.tr('auth_tab'))
-
-        # Search filters tab
-        self.search_tab = self.create_search_tab()
-        self.tabs.addTab(self.search_tab, self.tr('search_tab'))
-
-        # Results tab
-        self.results_tab = self.create_results_tab()
-        self.tabs.addTab(self.results_tab, self.tr('results_tab'))
-
-        # Status bar
+        # Status bar, with a permanent connection indicator
+        self.connection_label = QLabel()
+        self.statusBar().addPermanentWidget(self.connection_label)
+        self.set_connection_state(self.connection_state)
         self.statusBar().showMessage(self.tr('not_connected'))
 
+    def add_tabs(self):
+        """Add the tabs as empty pages; each one is built the first time it's shown"""
+        self.tab_builders = [
+            ('auth_tab', self.create_auth_tab),
+            ('search_tab', self.create_search_tab),
+            ('results_tab', self.create_results_tab),
+            ('jobs_tab', self.create_jobs_tab),
+        ]
+        self.built_tabs = set()
+        for index, (key, _) in enumerate(self.tab_builders):
+            page = QWidget()
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(page, "")
+            self.translate(lambda text, index=index: self.tabs.setTabText(index, text), key)
+        # The authentication tab holds the credentials, and is needed right away
+        self.ensure_tab(0)
+
+    def ensure_tab(self, index):
+        """Build a tab's widgets if they haven't been built yet"""
+        if index < 0 or index in self.built_tabs:
+            return
+        self.built_tabs.add(index)
+        key, builder = self.tab_builders[index]
+        widget = builder()
+        setattr(self, key, widget)
+        self.tabs.widget(index).layout().addWidget(widget)
+
     def change_language(self, index):
         """Change the application language"""
         self.current_language = 'pt' if index == 0 else 'en'
-        self.refresh_ui()
+        self.retranslate_ui()
 
-    def refresh_ui(self):
-        """Refresh all UI text with current language"""
-        self.setWindowTitle(self.tr('window_title'))
-        self.statusBar().showMessage(self.tr('not_connected') if not self.idealista_client else self.tr('connected_success'))
-        
-        # Update tab titles
-        self.tabs.setTabText(0, self.tr('auth_tab'))
-        self.tabs.setTabText(1, self.tr('search_tab'))
-        self.tabs.setTabText(2, self.tr('results_tab'))
-        
-        # Recreate tabs with new language
-        current_tab = self.tabs.currentIndex()
-        
-        # Store current values before refresh
-        api_key = getattr(self, 'api_key_input', None)
-        api_secret = getattr(self, 'api_secret_input', None)
-        old_key = api_key.text() if api_key else ""
-        old_secret = api_secret.text() if api_secret else ""
-        
-        # Remove old tabs
-        while self.tabs.count() > 0:
-            self.tabs.removeTab(0)
-        
-        # Create new tabs
-        self.auth_tab = self.create_auth_tab()
-        self.tabs.addTab(self.auth_tab, self.tr('auth_tab'))
-        
-        # Restore auth values
-        if old_key:
-            self.api_key_input.setText(old_key)
-        if old_secret:
-            self.api_secret_input.setText(old_secret)
-        
-        self.search_tab = self.create_search_tab()
-        self.tabs.addTab(self.search_tab, self.tr('search_tab'))
-        
-        self.results_tab = self.create_results_tab()
-        self.tabs.addTab(self.results_tab, self.tr('results_tab'))
-        
-        # Restore tab selection
-        self.tabs.setCurrentIndex(current_tab)
+    def translate(self, setter, key):
+        """Set a text from TRANSLATIONS, and again whenever the language changes"""
+        self.translated_texts.append((setter, key))
+        setter(self.tr(key))
+
+    def translated(self, widget, key, method='setText'):
+        """Register one of a widget's texts for translation, and return the widget"""
+        self.translate(getattr(widget, method), key)
+        return widget
+
+    def translated_item(self, combo, key, data=...):
+        """Add a combo item with a translated text and, unless given, its key as data"""
+        index = combo.count()
+        combo.addItem("", key if data is ... else data)
+        self.translate(lambda text: combo.setItemText(index, text), key)
+
+    def retranslate_ui(self):
+        """Update the texts of the existing widgets to the current language.
+
+        Widgets keep their values, results stay on screen and running workers are left alone;
+        tabs that haven't been built yet pick up the language when they are.
+        """
+        for setter, key in self.translated_texts:
+            setter(self.tr(key))
+        self.set_connection_state(self.connection_state)
+        if hasattr(self, 'search_btn'):
+            self.search_btn.setText(self.tr(self.search_btn_key))
+        if hasattr(self, 'location_id_combo'):
+            self.update_location_placeholder()
+        if hasattr(self, 'jobs_table'):
+            for job in self.jobs:
+                self.update_job_row(job)
+        if hasattr(self, 'results_info') and not (self.last_response or self.all_responses or self.is_fetching()):
+            self.results_info.setText(self.tr('no_results'))
+
+    def is_fetching(self):
+        """Return whether a search is running"""
+        workers = (getattr(self, 'worker', None), self.multi_page_worker)
+        return any(worker is not None and worker.isRunning() for worker in workers)
 
     def create_auth_tab(self):
         """Create authentication tab"""
@@ -534,21 +934,22 @@ class IdealistaGUI(QMainWindow):
         layout = QVBoxLayout(widget)
 
         # Auth group
-        auth_group = QGroupBox(self.tr('auth_group'))
+        auth_group = self.translated(QGroupBox(), 'auth_group', 'setTitle')
         auth_layout = QFormLayout()
 
         self.api_key_input = QLineEdit()
-        self.api_key_input.setPlaceholderText(self.tr('api_key_placeholder'))
-        auth_layout.addRow(self.tr('api_key'), self.api_key_input)
+        self.translated(self.api_key_input, 'api_key_placeholder', 'setPlaceholderText')
+        auth_layout.addRow(self.translated(QLabel(), 'api_key'), self.api_key_input)
 
         self.api_secret_input = QLineEdit()
-        self.api_secret_input.setPlaceholderText(self.tr('api_secret_placeholder'))
+        self.translated(self.api_secret_input, 'api_secret_placeholder', 'setPlaceholderText')
         self.api_secret_input.setEchoMode(QLineEdit.Password)
-        auth_layout.addRow(self.tr('api_secret'), self.api_secret_input)
+        auth_layout.addRow(self.translated(QLabel(), 'api_secret'), self.api_secret_input)
 
         # Connect button
-        self.connect_btn = QPushButton(self.tr('connect'))
+        self.connect_btn = self.translated(QPushButton(), 'connect')
         self.connect_btn.clicked.connect(self.connect_api)
+        self.connect_btn.setEnabled(self.connection_state != 'connecting')
         auth_layout.addRow("", self.connect_btn)
 
         auth_group.setLayout(auth_layout)
@@ -567,166 +968,171 @@ class IdealistaGUI(QMainWindow):
         layout = QVBoxLayout(widget)
 
         # Required fields
-        required_group = QGroupBox(self.tr('required_fields'))
+        required_group = self.translated(QGroupBox(), 'required_fields', 'setTitle')
         required_layout = QFormLayout()
 
         self.country_combo = QComboBox()
         self.country_combo.addItems(["es", "pt", "it"])
         self.country_combo.setCurrentText("pt")  # Default to Portugal
-        required_layout.addRow(self.tr('country'), self.country_combo)
+        required_layout.addRow(self.translated(QLabel(), 'country'), self.country_combo)
 
         self.operation_combo = QComboBox()
-        operation_items = {
-            'sale': self.tr('sale'),
-            'rent': self.tr('rent')
-        }
-        for key, value in operation_items.items():
-            self.operation_combo.addItem(value, key)
-        required_layout.addRow(self.tr('operation'), self.operation_combo)
+        for key in ('sale', 'rent'):
+            self.translated_item(self.operation_combo, key)
+        required_layout.addRow(self.translated(QLabel(), 'operation'), self.operation_combo)
 
         self.property_type_combo = QComboBox()
-        property_types = {
-            'homes': self.tr('homes'),
-            'offices': self.tr('offices'),
-            'premises': self.tr('premises'),
-            'garages': self.tr('garages'),
-            'bedrooms': self.tr('bedrooms')
-        }
-        for key, value in property_types.items():
-            self.property_type_combo.addItem(value, key)
-        required_layout.addRow(self.tr('property_type'), self.property_type_combo)
+        for key in ('homes', 'offices', 'premises', 'garages', 'bedrooms'):
+            self.translated_item(self.property_type_combo, key)
+        required_layout.addRow(self.translated(QLabel(), 'property_type'), self.property_type_combo)
 
         required_group.setLayout(required_layout)
         layout.addWidget(required_group)
 
         # Location fields
-        location_group = QGroupBox(self.tr('location'))
+        location_group = self.translated(QGroupBox(), 'location', 'setTitle')
         location_layout = QFormLayout()
 
         # Location type filter
         self.location_type_combo = QComboBox()
-        self.location_type_combo.addItem(self.tr('all_types'))
+        self.translated_item(self.location_type_combo, 'all_types', None)
+        # Until the catalog worker is done, the list stays empty and IDs can be typed in
         if self.locations_data:
             self.location_type_combo.addItems(self.get_location_types())
-        self.location_type_combo.currentTextChanged.connect(self.on_location_type_changed)
-        location_layout.addRow(self.tr('location_type'), self.location_type_combo)
+        # By index, so retranslating the "all types" entry doesn't refill the locations
+        self.location_type_combo.currentIndexChanged.connect(self.on_location_type_changed)
+        location_layout.addRow(self.translated(QLabel(), 'location_type'), self.location_type_combo)
 
         # Location ID dropdown
+        # Backed by the shared catalog model; the type filter and completer never copy it
+        self.location_type_proxy = LocationTypeProxy(self)
+        self.location_type_proxy.setSourceModel(self.location_model)
         self.location_id_combo = QComboBox()
         self.location_id_combo.setEditable(True)
-        self.location_id_combo.lineEdit().setPlaceholderText(self.tr('select_location'))
-        self.populate_location_combo()
-        location_layout.addRow(self.tr('location_id'), self.location_id_combo)
+        self.location_id_combo.setInsertPolicy(QComboBox.NoInsert)
+        self.location_id_combo.setModel(self.location_type_proxy)
+        self.update_location_placeholder()
+
+        # Type-ahead over the accent-insensitive index, showing the best matches only
+        self.completion_rows = []
+        self.completion_model = QStringListModel(self)
+        self.location_completer = QCompleter(self.completion_model, self)
+        self.location_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.location_completer.activated[QModelIndex].connect(self.on_location_completed)
+        self.location_id_combo.setCompleter(self.location_completer)
+        self.location_id_combo.lineEdit().textEdited.connect(self.update_location_completions)
+        location_layout.addRow(self.translated(QLabel(), 'location_id'), self.location_id_combo)
 
         self.center_input = QLineEdit()
-        self.center_input.setPlaceholderText(self.tr('center_placeholder'))
-        location_layout.addRow(self.tr('center'), self.center_input)
+        self.translated(self.center_input, 'center_placeholder', 'setPlaceholderText')
+        location_layout.addRow(self.translated(QLabel(), 'center'), self.center_input)
 
         self.distance_spin = QDoubleSpinBox()
         self.distance_spin.setRange(0, 100000)
         self.distance_spin.setSuffix(" m")
         self.distance_spin.setSpecialValueText("")
-        location_layout.addRow(self.tr('distance'), self.distance_spin)
+        location_layout.addRow(self.translated(QLabel(), 'distance'), self.distance_spin)
 
         location_group.setLayout(location_layout)
         layout.addWidget(location_group)
 
         # Price fields
-        price_group = QGroupBox(self.tr('price_range'))
+        price_group = self.translated(QGroupBox(), 'price_range', 'setTitle')
         price_layout = QFormLayout()
 
         self.min_price_spin = QSpinBox()
         self.min_price_spin.setRange(0, 100000000)
         self.min_price_spin.setSuffix(" €")
         self.min_price_spin.setSpecialValueText("")
-        price_layout.addRow(self.tr('min_price'), self.min_price_spin)
+        price_layout.addRow(self.translated(QLabel(), 'min_price'), self.min_price_spin)
 
         self.max_price_spin = QSpinBox()
         self.max_price_spin.setRange(0, 100000000)
         self.max_price_spin.setSuffix(" €")
         self.max_price_spin.setSpecialValueText("")
-        price_layout.addRow(self.tr('max_price'), self.max_price_spin)
+        price_layout.addRow(self.translated(QLabel(), 'max_price'), self.max_price_spin)
 
         price_group.setLayout(price_layout)
         layout.addWidget(price_group)
 
         # Pagination fields
-        pagination_group = QGroupBox(self.tr('pagination'))
+        pagination_group = self.translated(QGroupBox(), 'pagination', 'setTitle')
         pagination_layout = QFormLayout()
 
         self.max_items_spin = QSpinBox()
         self.max_items_spin.setRange(1, 50)
         self.max_items_spin.setValue(20)
-        pagination_layout.addRow(self.tr('max_items'), self.max_items_spin)
+        pagination_layout.addRow(self.translated(QLabel(), 'max_items'), self.max_items_spin)
 
         self.num_page_spin = QSpinBox()
         self.num_page_spin.setRange(1, 1000)
         self.num_page_spin.setValue(1)
-        pagination_layout.addRow(self.tr('page_number'), self.num_page_spin)
+        pagination_layout.addRow(self.translated(QLabel(), 'page_number'), self.num_page_spin)
 
         # Auto-pagination controls
-        self.auto_fetch_check = QCheckBox(self.tr('enable_auto_fetch'))
+        self.auto_fetch_check = self.translated(QCheckBox(), 'enable_auto_fetch')
         pagination_layout.addRow("", self.auto_fetch_check)
 
         self.delay_spin = QSpinBox()
         self.delay_spin.setRange(1, 10)
         self.delay_spin.setValue(2)
         self.delay_spin.setSuffix(" s")
-        pagination_layout.addRow(self.tr('delay_seconds'), self.delay_spin)
+        pagination_layout.addRow(self.translated(QLabel(), 'delay_seconds'), self.delay_spin)
 
         pagination_group.setLayout(pagination_layout)
         layout.addWidget(pagination_group)
 
         # Other fields
-        other_group = QGroupBox(self.tr('other_filters'))
+        other_group = self.translated(QGroupBox(), 'other_filters', 'setTitle')
         other_layout = QFormLayout()
 
         self.locale_combo = QComboBox()
         self.locale_combo.addItems(["", "es_ES", "ca_ES", "en_GB", "pt_PT", "it_IT"])
-        other_layout.addRow(self.tr('locale'), self.locale_combo)
+        other_layout.addRow(self.translated(QLabel(), 'locale'), self.locale_combo)
 
         self.since_date_input = QLineEdit()
-        self.since_date_input.setPlaceholderText(self.tr('since_date_placeholder'))
-        other_layout.addRow(self.tr('since_date'), self.since_date_input)
+        self.translated(self.since_date_input, 'since_date_placeholder', 'setPlaceholderText')
+        other_layout.addRow(self.translated(QLabel(), 'since_date'), self.since_date_input)
 
         self.order_combo = QComboBox()
-        order_items = ["", self.tr('asc'), self.tr('desc')]
-        self.order_combo.addItems(order_items)
-        other_layout.addRow(self.tr('order'), self.order_combo)
+        self.order_combo.addItem("", None)
+        for key in ('asc', 'desc'):
+            self.translated_item(self.order_combo, key)
+        other_layout.addRow(self.translated(QLabel(), 'order'), self.order_combo)
 
         self.sort_combo = QComboBox()
         self.sort_combo.addItems(["", "price", "publicationDate", "size", "floor"])
-        other_layout.addRow(self.tr('sort_by'), self.sort_combo)
+        other_layout.addRow(self.translated(QLabel(), 'sort_by'), self.sort_combo)
 
         self.has_multimedia_check = QCheckBox()
-        other_layout.addRow(self.tr('has_multimedia'), self.has_multimedia_check)
+        other_layout.addRow(self.translated(QLabel(), 'has_multimedia'), self.has_multimedia_check)
 
         self.bank_offer_check = QCheckBox()
-        other_layout.addRow(self.tr('bank_offer'), self.bank_offer_check)
+        other_layout.addRow(self.translated(QLabel(), 'bank_offer'), self.bank_offer_check)
 
         self.ad_ids_input = QLineEdit()
-        self.ad_ids_input.setPlaceholderText(self.tr('ad_ids_placeholder'))
-        other_layout.addRow(self.tr('ad_ids'), self.ad_ids_input)
+        self.translated(self.ad_ids_input, 'ad_ids_placeholder', 'setPlaceholderText')
+        other_layout.addRow(self.translated(QLabel(), 'ad_ids'), self.ad_ids_input)
 
         other_group.setLayout(other_layout)
         layout.addWidget(other_group)
 
         # Keyword filters
-        keyword_group = QGroupBox(self.tr('keyword_filters'))
+        keyword_group = self.translated(QGroupBox(), 'keyword_filters', 'setTitle')
         keyword_layout = QVBoxLayout()
 
-        keyword_label = QLabel(self.tr('keywords'))
+        keyword_label = self.translated(QLabel(), 'keywords')
         keyword_layout.addWidget(keyword_label)
 
         self.keywords_input = QTextEdit()
-        self.keywords_input.setPlaceholderText(self.tr('keywords_placeholder'))
+        self.translated(self.keywords_input, 'keywords_placeholder', 'setPlaceholderText')
         self.keywords_input.setMaximumHeight(100)
         keyword_layout.addWidget(self.keywords_input)
 
-        self.case_sensitive_check = QCheckBox(self.tr('case_sensitive'))
+        self.case_sensitive_check = self.translated(QCheckBox(), 'case_sensitive')
         keyword_layout.addWidget(self.case_sensitive_check)
 
-        self.highlight_matches_check = QCheckBox(self.tr('highlight_matches'))
+        self.highlight_matches_check = self.translated(QCheckBox(), 'highlight_matches')
         self.highlight_matches_check.setChecked(True)  # Default enabled
         keyword_layout.addWidget(self.highlight_matches_check)
 
@@ -734,10 +1140,16 @@ class IdealistaGUI(QMainWindow):
         layout.addWidget(keyword_group)
 
         # Search button
-        self.search_btn = QPushButton(self.tr('search'))
+        self.search_btn = QPushButton(self.tr(self.search_btn_key))
         self.search_btn.clicked.connect(self.perform_search)
-        self.search_btn.setEnabled(False)
-        layout.addWidget(self.search_btn)
+        self.search_btn.setEnabled(self.idealista_client is not None)
+        self.add_to_queue_btn = self.translated(QPushButton(), 'add_to_queue')
+        self.add_to_queue_btn.clicked.connect(lambda: self.enqueue_searches([self.build_search_params()]))
+        self.add_to_queue_btn.setEnabled(self.idealista_client is not None)
+        search_buttons = QHBoxLayout()
+        search_buttons.addWidget(self.search_btn)
+        search_buttons.addWidget(self.add_to_queue_btn)
+        layout.addLayout(search_buttons)
 
         layout.addStretch()
 
@@ -746,22 +1158,27 @@ class IdealistaGUI(QMainWindow):
         container_layout.addWidget(scroll)
         return container
 
-    def populate_location_combo(self, location_type=None):
-        """Populate location combo with filtered locations"""
-        self.location_id_combo.clear()
-        
-        filtered_locations = self.filter_locations_by_type(location_type)
-        
-        for loc in filtered_locations:
-            display_text = f"{loc['name']} ({loc['type']})"
-            self.location_id_combo.addItem(display_text, loc['id'])
+    def update_location_completions(self, text):
+        """Offer the locations matching the typed text, within the selected type"""
+        self.completion_rows = self.location_model.search(text, self.location_type_proxy.location_type)
+        self.completion_model.setStringList([self.location_model.labels[row] for row in self.completion_rows])
+        if self.completion_rows:
+            self.location_completer.complete()
+
+    def on_location_completed(self, index):
+        """Select the location picked in the completer"""
+        source_index = self.location_model.index(self.completion_rows[index.row()])
+        self.location_id_combo.setCurrentIndex(self.location_type_proxy.mapFromSource(source_index).row())
+
+    def update_location_placeholder(self):
+        """Hint that the locations are still loading, or invite to pick one"""
+        self.location_id_combo.lineEdit().setPlaceholderText(
+            self.tr('select_location') if self.catalog_ready else self.tr('loading_locations'))
 
-    def on_location_type_changed(self, location_type):
+    def on_location_type_changed(self, index):
         """Handle location type filter change"""
-        if location_type == self.tr('all_types'):
-            self.populate_location_combo(None)
-        else:
-            self.populate_location_combo(location_type)
+        self.location_type_proxy.set_location_type(None if index <= 0 else self.location_type_combo.itemText(index))
+        self.location_id_combo.setCurrentIndex(0)
 
     def create_results_tab(self):
         """Create results display tab"""
@@ -778,6 +1195,33 @@ class IdealistaGUI(QMainWindow):
         self.progress_bar.setVisible(False)
         layout.addWidget(self.progress_bar)
 
+        # Region filter
+        region_group = self.translated(QGroupBox(), 'region_filter', 'setTitle')
+        region_layout = QHBoxLayout()
+
+        region_layout.addWidget(self.translated(QLabel(), 'center'))
+        self.region_center_input = QLineEdit()
+        self.translated(self.region_center_input, 'center_placeholder', 'setPlaceholderText')
+        region_layout.addWidget(self.region_center_input)
+
+        region_layout.addWidget(self.translated(QLabel(), 'radius'))
+        self.region_radius_spin = QSpinBox()
+        self.region_radius_spin.setRange(1, 100000)
+        self.region_radius_spin.setValue(500)
+        self.region_radius_spin.setSuffix(" m")
+        region_layout.addWidget(self.region_radius_spin)
+
+        self.region_filter_btn = self.translated(QPushButton(), 'apply_region_filter')
+        self.region_filter_btn.clicked.connect(self.filter_results_by_region)
+        region_layout.addWidget(self.region_filter_btn)
+
+        self.region_clear_btn = self.translated(QPushButton(), 'clear_region_filter')
+        self.region_clear_btn.clicked.connect(self.clear_region_filter)
+        region_layout.addWidget(self.region_clear_btn)
+
+        region_group.setLayout(region_layout)
+        layout.addWidget(region_group)
+
         # Results text area
         self.results_text = QTextEdit()
         self.results_text.setReadOnly(True)
@@ -786,20 +1230,212 @@ class IdealistaGUI(QMainWindow):
         # Export buttons
         export_layout = QHBoxLayout()
         
-        self.export_json_btn = QPushButton(self.tr('export_json'))
+        self.export_json_btn = self.translated(QPushButton(), 'export_json')
         self.export_json_btn.clicked.connect(self.export_json)
         self.export_json_btn.setEnabled(False)
         export_layout.addWidget(self.export_json_btn)
 
-        self.export_csv_btn = QPushButton(self.tr('export_csv'))
+        self.export_csv_btn = self.translated(QPushButton(), 'export_csv')
         self.export_csv_btn.clicked.connect(self.export_csv)
         self.export_csv_btn.setEnabled(False)
         export_layout.addWidget(self.export_csv_btn)
 
+        self.export_progress = QProgressBar()
+        self.export_progress.setVisible(False)
+        export_layout.addWidget(self.export_progress)
+
+        self.cancel_export_btn = self.translated(QPushButton(), 'cancel_export')
+        self.cancel_export_btn.clicked.connect(self.cancel_export)
+        self.cancel_export_btn.setVisible(False)
+        export_layout.addWidget(self.cancel_export_btn)
+
         layout.addLayout(export_layout)
 
         return widget
 
+    def create_jobs_tab(self):
+        """Create the job queue tab"""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        # Batch: locations x operations, with the other filters from the search tab
+        batch_group = self.translated(QGroupBox(), 'job_batch', 'setTitle')
+        batch_layout = QFormLayout()
+
+        self.batch_locations_input = QTextEdit()
+        self.translated(self.batch_locations_input, 'batch_locations_placeholder', 'setPlaceholderText')
+        self.batch_locations_input.setMaximumHeight(100)
+        batch_layout.addRow(self.translated(QLabel(), 'batch_locations'), self.batch_locations_input)
+
+        operations_layout = QHBoxLayout()
+        self.batch_operation_checks = {}
+        for key in ('sale', 'rent'):
+            check = self.translated(QCheckBox(), key)
+            check.setChecked(True)
+            self.batch_operation_checks[key] = check
+            operations_layout.addWidget(check)
+        operations_layout.addStretch()
+        batch_layout.addRow(self.translated(QLabel(), 'batch_operations'), operations_layout)
+
+        self.add_batch_btn = self.translated(QPushButton(), 'add_batch')
+        self.add_batch_btn.clicked.connect(self.enqueue_batch)
+        batch_layout.addRow("", self.add_batch_btn)
+
+        self.parallel_jobs_spin = QSpinBox()
+        self.parallel_jobs_spin.setRange(1, 16)
+        self.parallel_jobs_spin.setValue(self.job_pool.maxThreadCount())
+        self.parallel_jobs_spin.valueChanged.connect(self.job_pool.setMaxThreadCount)
+        batch_layout.addRow(self.translated(QLabel(), 'parallel_jobs'), self.parallel_jobs_spin)
+
+        self.requests_per_second_spin = QDoubleSpinBox()
+        self.requests_per_second_spin.setRange(0.1, 20)
+        self.requests_per_second_spin.setSingleStep(0.5)
+        self.requests_per_second_spin.setValue(self.job_rate_limiter.rate)
+        # Applies to the searches added from now on
+        self.requests_per_second_spin.valueChanged.connect(lambda rate: setattr(self, 'job_rate_limiter', RateLimiter(rate)))
+        batch_layout.addRow(self.translated(QLabel(), 'requests_per_second'), self.requests_per_second_spin)
+
+        batch_group.setLayout(batch_layout)
+        layout.addWidget(batch_group)
+
+        # Queue
+        self.jobs_table = QTableWidget(0, 4)
+        for column, key in enumerate(('job_search', 'job_status', 'job_pages', 'job_properties')):
+            self.translate(lambda text, column=column: self.jobs_table.setHorizontalHeaderItem(column, QTableWidgetItem(text)), key)
+        self.jobs_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.jobs_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.jobs_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.jobs_table)
+
+        self.jobs_summary = QLabel()
+        layout.addWidget(self.jobs_summary)
+
+        buttons_layout = QHBoxLayout()
+        cancel_selected_btn = self.translated(QPushButton(), 'cancel_selected')
+        cancel_selected_btn.clicked.connect(
+            lambda: self.cancel_jobs([self.jobs[index.row()] for index in self.jobs_table.selectionModel().selectedRows()]))
+        buttons_layout.addWidget(cancel_selected_btn)
+        cancel_all_btn = self.translated(QPushButton(), 'cancel_all')
+        cancel_all_btn.clicked.connect(lambda: self.cancel_jobs(self.jobs))
+        buttons_layout.addWidget(cancel_all_btn)
+        show_merged_btn = self.translated(QPushButton(), 'show_merged')
+        show_merged_btn.clicked.connect(self.show_merged_results)
+        buttons_layout.addWidget(show_merged_btn)
+        layout.addLayout(buttons_layout)
+
+        return widget
+
+    def enqueue_batch(self):
+        """Queue a search per location and operation, with the other filters from the search tab"""
+        self.ensure_tab(1)
+        base_params = self.build_search_params()
+        location_ids = [line.strip() for line in self.batch_locations_input.toPlainText().splitlines() if line.strip()]
+        operations = [key for key, check in self.batch_operation_checks.items() if check.isChecked()]
+        searches = []
+        for location_id in location_ids or [base_params.get('location_id')]:
+            for operation in operations:
+                params = {**base_params, 'operation': operation}
+                if location_id:
+                    params['location_id'] = location_id
+                searches.append(params)
+        self.enqueue_searches(searches)
+
+    def enqueue_searches(self, searches):
+        """Add searches to the job queue; they start as soon as the pool has a free thread"""
+        if not self.idealista_client:
+            QMessageBox.warning(self, self.tr('not_connected'), self.tr('not_connected_msg'))
+            return
+        self.ensure_tab(3)
+        for search_params in searches:
+            job = SearchJob(len(self.jobs), self.idealista_client, search_params, self.job_rate_limiter)
+            job.signals.started.connect(self.on_job_started)
+            job.signals.page_fetched.connect(self.on_job_page_fetched)
+            job.signals.progress.connect(self.on_job_progress)
+            job.signals.finished.connect(self.on_job_finished)
+            job.signals.error.connect(self.on_job_error)
+            self.jobs.append(job)
+
+            row = self.jobs_table.rowCount()
+            self.jobs_table.insertRow(row)
+            for column in range(4):
+                self.jobs_table.setItem(row, column, QTableWidgetItem())
+            self.update_job_row(job)
+            self.job_pool.start(job)
+        self.statusBar().showMessage(self.tr('jobs_added').format(len(searches)))
+
+    def update_job_row(self, job):
+        """Show a job's search, status and progress in the queue table"""
+        params = job.search_params
+        location = params.get('location_id') or params.get('center', '')
+        self.jobs_table.item(job.job_id, 0).setText(
+            f"{params['country']} · {self.tr(params['operation'])} · {self.tr(params['property_type'])} · {location}")
+        self.jobs_table.item(job.job_id, 1).setText(self.tr(job.status))
+        self.jobs_table.item(job.job_id, 1).setToolTip(job.error or "")
+        self.jobs_table.item(job.job_id, 2).setText("{}/{}".format(*job.pages) if job.pages[1] else "")
+        self.jobs_table.item(job.job_id, 3).setText(str(job.properties) if job.properties else "")
+
+    def cancel_jobs(self, jobs):
+        """Cancel jobs: queued ones are taken back from the pool, running ones stop after their current page"""
+        for job in jobs:
+            if job.status == 'job_queued' and self.job_pool.tryTake(job):
+                job.status = 'job_cancelled'
+                self.update_job_row(job)
+            elif job.status in ('job_queued', 'job_running'):
+                job.cancel()
+
+    def on_job_started(self, job_id):
+        job = self.jobs[job_id]
+        job.status = 'job_running'
+        self.update_job_row(job)
+
+    def on_job_page_fetched(self, job_id, response):
+        """Merge a page into the deduplicated results of the queue"""
+        for prop in response.element_list:
+            key = prop.property_code or payload_hash(prop.raw_data)
+            if key in self.merged_properties:
+                self.merged_duplicates += 1
+            else:
+                self.merged_properties[key] = prop.raw_data
+        self.update_jobs_summary()
+
+    def on_job_progress(self, job_id, current_page, total_pages, properties_count):
+        job = self.jobs[job_id]
+        job.pages = (current_page, total_pages)
+        job.properties = properties_count
+        self.update_job_row(job)
+
+    def on_job_finished(self, job_id):
+        job = self.jobs[job_id]
+        job.status = 'job_cancelled' if job.should_cancel else 'job_done'
+        self.update_job_row(job)
+
+    def on_job_error(self, job_id, error_msg):
+        job = self.jobs[job_id]
+        job.status = 'job_failed'
+        job.error = error_msg
+        self.update_job_row(job)
+
+    def update_jobs_summary(self):
+        self.jobs_summary.setText(
+            self.tr('merged_summary').format(len(self.merged_properties), self.merged_duplicates, len(self.jobs)))
+
+    def show_merged_results(self):
+        """Show the deduplicated properties of every job in the results tab, ready to export"""
+        merged = Response({
+            "elementList": list(self.merged_properties.values()),
+            "total": len(self.merged_properties),
+            "totalPages": 1,
+        })
+        self.ensure_tab(2)
+        self.stop_export()
+        self.last_response = None
+        self.all_responses.clear()
+        self.all_responses.append(merged)
+        self.spatial_index = SpatialIndex()
+        self.index_properties(merged.element_list)
+        self.show_responses(self.all_responses)
+        self.tabs.setCurrentIndex(2)
+
     def connect_api(self):
         """Connect to Idealista API (manual connection)"""
         api_key = self.api_key_input.text().strip()
@@ -810,14 +1446,69 @@ class IdealistaGUI(QMainWindow):
                               self.tr('missing_credentials_msg'))
             return
 
-        try:
-            self.idealista_client = Idealista(api_key=api_key, api_secret=api_secret)
-            self.statusBar().showMessage(self.tr('connected_success'))
-            self.search_btn.setEnabled(True)
-            QMessageBox.information(self, self.tr('success'), self.tr('connected_msg'))
-        except Exception as e:
-            QMessageBox.critical(self, self.tr('connection_error'), f"{self.tr('connection_failed_msg')}: {str(e)}")
-            self.statusBar().showMessage(self.tr('connection_failed'))
+        self.start_connect(api_key, api_secret)
+
+    def build_search_params(self):
+        """Return the Search parameters set in the filters tab"""
+        search_params = {
+            "country": self.country_combo.currentText(),
+            "operation": self.operation_combo.currentData(),
+            "property_type": self.property_type_combo.currentData(),
+        }
+
+        # Location ID from combo: the selected item, unless the text has been edited since
+        combo = self.location_id_combo
+        if combo.currentData() and combo.currentText() == combo.itemText(combo.currentIndex()):
+            search_params["location_id"] = combo.currentData()
+        elif self.location_id_combo.currentText().strip():
+            # If user typed something manually
+            search_params["location_id"] = self.location_id_combo.currentText().strip()
+        
+        if self.center_input.text().strip():
+            search_params["center"] = self.center_input.text().strip()
+        
+        if self.distance_spin.value() > 0:
+            search_params["distance"] = self.distance_spin.value()
+
+        # Optional locale
+        if self.locale_combo.currentText():
+            search_params["locale"] = self.locale_combo.currentText()
+
+        # Pagination
+        search_params["max_items"] = self.max_items_spin.value()
+        search_params["num_page"] = self.num_page_spin.value()
+
+        # Price range
+        if self.min_price_spin.value() > 0:
+            search_params["min_price"] = self.min_price_spin.value()
+        
+        if self.max_price_spin.value() > 0:
+            search_params["max_price"] = self.max_price_spin.value()
+
+        # Date filter
+        if self.since_date_input.text().strip():
+            search_params["since_date"] = self.since_date_input.text().strip()
+
+        # Sorting - the items hold the API values behind the translated text
+        if self.order_combo.currentData():
+            search_params["order"] = self.order_combo.currentData()
+        
+        if self.sort_combo.currentText():
+            search_params["sort"] = self.sort_combo.currentText()
+
+        # Boolean filters
+        if self.has_multimedia_check.isChecked():
+            search_params["has_multimedia"] = True
+        
+        if self.bank_offer_check.isChecked():
+            search_params["bank_offer"] = True
+
+        # Ad IDs
+        if self.ad_ids_input.text().strip():
+            ad_ids = [id.strip() for id in self.ad_ids_input.text().split(",")]
+            search_params["ad_ids"] = ad_ids
+
+        return search_params
 
     def perform_search(self):
         """Perform search with current filters"""
@@ -826,68 +1517,15 @@ class IdealistaGUI(QMainWindow):
                               self.tr('not_connected_msg'))
             return
 
-        try:
-            # Build search parameters
-            search_params = {
-                "country": self.country_combo.currentText(),
-                "operation": self.operation_combo.currentData(),
-                "property_type": self.property_type_combo.currentData(),
-            }
-
-            # Location ID from combo
-            if self.location_id_combo.currentData():
-                search_params["location_id"] = self.location_id_combo.currentData()
-            elif self.location_id_combo.currentText().strip():
-                # If user typed something manually
-                search_params["location_id"] = self.location_id_combo.currentText().strip()
-            
-            if self.center_input.text().strip():
-                search_params["center"] = self.center_input.text().strip()
-            
-            if self.distance_spin.value() > 0:
-                search_params["distance"] = self.distance_spin.value()
-
-            # Optional locale
-            if self.locale_combo.currentText():
-                search_params["locale"] = self.locale_combo.currentText()
-
-            # Pagination
-            search_params["max_items"] = self.max_items_spin.value()
-            search_params["num_page"] = self.num_page_spin.value()
-
-            # Price range
-            if self.min_price_spin.value() > 0:
-                search_params["min_price"] = self.min_price_spin.value()
-            
-            if self.max_price_spin.value() > 0:
-                search_params["max_price"] = self.max_price_spin.value()
-
-            # Date filter
-            if self.since_date_input.text().strip():
-                search_params["since_date"] = self.since_date_input.text().strip()
-
-            # Sorting - map translated values back to API values
-            order_text = self.order_combo.currentText()
-            if order_text == self.tr('asc'):
-                search_params["order"] = "asc"
-            elif order_text == self.tr('desc'):
-                search_params["order"] = "desc"
-            
-            if self.sort_combo.currentText():
-                search_params["sort"] = self.sort_combo.currentText()
-
-            # Boolean filters
-            if self.has_multimedia_check.isChecked():
-                search_params["has_multimedia"] = True
-            
-            if self.bank_offer_check.isChecked():
-                search_params["bank_offer"] = True
-
-            # Ad IDs
-            if self.ad_ids_input.text().strip():
-                ad_ids = [id.strip() for id in self.ad_ids_input.text().split(",")]
-                search_params["ad_ids"] = ad_ids
+        # Progress and results are shown in the results tab
+        self.ensure_tab(2)
+        # The results being exported are about to be replaced; no new export until they are
+        self.stop_export()
+        self.export_json_btn.setEnabled(False)
+        self.export_csv_btn.setEnabled(False)
 
+        try:
+            search_params = self.build_search_params()
             search = Search(**search_params)
 
             # Log API request details
@@ -910,10 +1548,12 @@ class IdealistaGUI(QMainWindow):
                 # Multi-page fetch
                 self.progress_bar.setRange(0, 100)  # Determinate
                 self.results_info.setText(self.tr('searching'))
-                self.all_responses = []
+                self.all_responses.clear()
+                self.spatial_index = SpatialIndex()
                 
                 # Update button to cancel
-                self.search_btn.setText(self.tr('cancel_fetch'))
+                self.search_btn_key = 'cancel_fetch'
+                self.search_btn.setText(self.tr(self.search_btn_key))
                 self.search_btn.setEnabled(True)
                 self.search_btn.clicked.disconnect()
                 self.search_btn.clicked.connect(self.cancel_multi_page_fetch)
@@ -921,6 +1561,7 @@ class IdealistaGUI(QMainWindow):
                 delay_seconds = self.delay_spin.value()
                 self.multi_page_worker = MultiPageWorker(self.idealista_client, search_params, delay_seconds)
                 self.multi_page_worker.progress.connect(self.on_multi_page_progress)
+                self.multi_page_worker.page_fetched.connect(self.on_page_fetched)
                 self.multi_page_worker.finished.connect(self.on_multi_page_finished)
                 self.multi_page_worker.error.connect(self.on_search_error)
                 self.multi_page_worker.start()
@@ -939,12 +1580,18 @@ class IdealistaGUI(QMainWindow):
             self.progress_bar.setVisible(False)
             self.search_btn.setEnabled(True)
             self.reset_search_button()
+            self.reset_export_controls()
 
     def on_search_finished(self, response):
         """Handle successful search"""
         self.progress_bar.setVisible(False)
         self.search_btn.setEnabled(True)
         self.last_response = response
+        # Pages of an earlier multi-page fetch would otherwise shadow this result in exports
+        self.stop_export()
+        self.all_responses.clear()
+        self.spatial_index = SpatialIndex()
+        self.index_properties(response.element_list)
 
         # Check for keyword matches if keywords are provided
         keywords = self.get_keywords()
@@ -979,11 +1626,7 @@ class IdealistaGUI(QMainWindow):
             marker = " ⭐ MATCH" if has_match else ""
             
             results_text += f"{self.tr('property')} {i}{marker}:\n"
-            results_text += f"  {self.tr('code')}: {prop.property_code}\n"
-            results_text += f"  {self.tr('type')}: {prop.property_type}\n"
-            results_text += f"  {self.tr('address')}: {prop.address}\n"
-            results_text += f"  {self.tr('price')}: {prop.price}\n"
-            results_text += f"  {self.tr('operation')}: {prop.operation}\n"
+            results_text += self.describe_property(prop)
             
             if has_match:
                 results_text += f"  {self.tr('matched_keywords')}: {', '.join(matched_keywords)}\n"
@@ -998,17 +1641,24 @@ class IdealistaGUI(QMainWindow):
 
         self.statusBar().showMessage(self.tr('search_completed').format(response.total))
 
+    def describe_property(self, prop):
+        """Return the results view lines listing a property's RESULT_FIELDS"""
+        labels = [self.tr(name) for name in RESULT_FIELDS.columns]
+        return "".join(f"  {label}: {value}\n" for label, value in zip(labels, RESULT_FIELDS.row(prop)))
+
     def on_search_error(self, error_msg):
         """Handle search error"""
         self.progress_bar.setVisible(False)
         self.reset_search_button()
+        self.reset_export_controls()
         self.results_info.setText(self.tr('search_failed'))
         QMessageBox.critical(self, self.tr('search_error'), f"{self.tr('search_failed')}: {error_msg}")
         self.statusBar().showMessage(self.tr('search_failed'))
 
     def reset_search_button(self):
         """Reset search button to original state"""
-        self.search_btn.setText(self.tr('search'))
+        self.search_btn_key = 'search'
+        self.search_btn.setText(self.tr(self.search_btn_key))
         self.search_btn.setEnabled(True)
         try:
             self.search_btn.clicked.disconnect()
@@ -1033,27 +1683,51 @@ class IdealistaGUI(QMainWindow):
         self.results_info.setText(f"{status_text} | {self.tr('collected_properties').format(properties_count)}")
         logger.info(f"Progress: Page {current_page}/{total_pages} - Total properties: {properties_count}")
 
-    def on_multi_page_finished(self, all_responses):
+    def on_page_fetched(self, response):
+        """Store and index each page as soon as it arrives"""
+        self.all_responses.append(response)
+        self.index_properties(response.element_list)
+
+    def index_properties(self, properties):
+        """Add properties to the spatial index, keeping only the fields the region filter shows"""
+        self.spatial_index.extend(
+            Property(SPATIAL_INDEX_FIELDS.as_dict(prop)) for prop in properties)
+
+    def on_multi_page_finished(self, pages_fetched):
         """Handle multi-page fetch completion"""
         self.progress_bar.setVisible(False)
         self.reset_search_button()
-        self.all_responses = all_responses
-        
-        # Combine all responses
-        total_properties = sum(len(resp.element_list) for resp in all_responses)
-        
-        # Check for keyword matches if keywords are provided
+        self.show_responses(self.all_responses)
+
+    def show_responses(self, all_responses):
+        """Display the properties of several pages, reading them once (they may come from disk)"""
         keywords = self.get_keywords()
+        total_properties = 0
         matched_count = 0
-        if keywords:
-            for response in all_responses:
-                for prop in response.element_list:
-                    has_match, _ = self.match_keywords_in_property(prop)
-                    if has_match:
-                        matched_count += 1
-        
-        # Use the first response metadata
-        first_response = all_responses[0]
+        pages_count = 0
+        lines = []
+        for response in all_responses:
+            pages_count += 1
+            for prop in response.element_list:
+                total_properties += 1
+                has_match, matched_keywords = self.match_keywords_in_property(prop) if keywords else (False, [])
+                matched_count += has_match
+                # Past the limit, properties are only counted
+                if total_properties > MAX_DISPLAYED_PROPERTIES:
+                    continue
+
+                # Add marker if property matches keywords
+                marker = " ⭐ MATCH" if has_match else ""
+                
+                lines.append(f"{self.tr('property')} {total_properties}{marker}:\n")
+                lines.append(self.describe_property(prop))
+                
+                if has_match:
+                    lines.append(f"  {self.tr('matched_keywords')}: {', '.join(matched_keywords)}\n")
+                
+                lines.append(f"{'-' * 80}\n")
+        if total_properties > MAX_DISPLAYED_PROPERTIES:
+            lines.append(self.tr('more_properties').format(total_properties - MAX_DISPLAYED_PROPERTIES) + "\n")
         
         # Update info label
         info_text = self.tr('all_pages_fetched').format(total_properties)
@@ -1064,46 +1738,56 @@ class IdealistaGUI(QMainWindow):
         # Display results from all pages
         results_text = f"{self.tr('search_results')}\n"
         results_text += f"{'=' * 80}\n"
-        results_text += f"Total pages fetched: {len(all_responses)}\n"
+        results_text += f"Total pages fetched: {pages_count}\n"
         results_text += f"Total properties: {total_properties}\n"
         if keywords and matched_count > 0:
             results_text += f"Properties with keyword matches: {matched_count}\n"
         results_text += f"{'=' * 80}\n\n"
-        
-        property_num = 1
-        for response in all_responses:
-            for prop in response.element_list:
-                has_match, matched_keywords = self.match_keywords_in_property(prop)
-                
-                # Add marker if property matches keywords
-                marker = " ⭐ MATCH" if has_match else ""
-                
-                results_text += f"{self.tr('property')} {property_num}{marker}:\n"
-                results_text += f"  {self.tr('code')}: {prop.property_code}\n"
-                results_text += f"  {self.tr('type')}: {prop.property_type}\n"
-                results_text += f"  {self.tr('address')}: {prop.address}\n"
-                results_text += f"  {self.tr('price')}: {prop.price}\n"
-                results_text += f"  {self.tr('operation')}: {prop.operation}\n"
-                
-                if has_match:
-                    results_text += f"  {self.tr('matched_keywords')}: {', '.join(matched_keywords)}\n"
-                
-                results_text += f"{'-' * 80}\n"
-                property_num += 1
 
-        self.results_text.setPlainText(results_text)
+        self.results_text.setPlainText(results_text + "".join(lines))
 
         # Enable export buttons
         self.export_json_btn.setEnabled(True)
         self.export_csv_btn.setEnabled(True)
 
         self.statusBar().showMessage(self.tr('search_completed').format(total_properties))
-        logger.info(f"Multi-page fetch completed: {total_properties} properties from {len(all_responses)} pages")
+        logger.info(f"Multi-page fetch completed: {total_properties} properties from {pages_count} pages")
         if keywords and matched_count > 0:
             logger.info(f"Keyword matches: {matched_count} properties matched keywords")
 
+    def filter_results_by_region(self):
+        """Show only the fetched properties within the selected radius"""
+        try:
+            lat, lon = (float(v) for v in self.region_center_input.text().split(","))
+        except ValueError:
+            QMessageBox.warning(self, self.tr('region_filter'), self.tr('invalid_center'))
+            return
+
+        radius = self.region_radius_spin.value()
+        matches = self.spatial_index.within_radius(lat, lon, radius)
+
+        results_text = f"{self.tr('search_results')}\n"
+        results_text += f"{'=' * 80}\n\n"
+        for i, (distance, prop) in enumerate(matches, 1):
+            results_text += f"{self.tr('property')} {i} ({distance:.0f} m):\n"
+            results_text += self.describe_property(prop)
+            results_text += f"{'-' * 80}\n"
+
+        self.results_text.setPlainText(results_text)
+        self.results_info.setText(self.tr('region_matches').format(len(matches), radius))
+
+    def clear_region_filter(self):
+        """Show all fetched properties again"""
+        self.region_center_input.clear()
+        if self.all_responses:
+            self.show_responses(self.all_responses)
+        elif self.last_response:
+            self.on_search_finished(self.last_response)
+
     def export_json(self):
         """Export results to JSON"""
+        if self.is_exporting():
+            return
         # Check if we have multi-page or single-page results
         if self.all_responses:
             responses = self.all_responses
@@ -1122,60 +1806,23 @@ class IdealistaGUI(QMainWindow):
         )
 
         if file_path:
-            try:
-                # Get keywords for matching
-                keywords = self.get_keywords()
-                highlight_enabled = self.highlight_matches_check.isChecked()
-                
-                # Collect all properties from all responses and add keyword match info
-                all_properties = []
-                matched_count = 0
-                
-                for response in responses:
-                    for prop in response.element_list:
-                        prop_dict = prop.to_dict()
-                        
-                        # Add keyword matching information if keywords are provided
-                        if keywords:
-                            has_match, matched_keywords = self.match_keywords_in_property(prop)
-                            if highlight_enabled:
-                                prop_dict['keyword_match'] = has_match
-                                prop_dict['matched_keywords'] = matched_keywords if has_match else []
-                            if has_match:
-                                matched_count += 1
-                        
-                        all_properties.append(prop_dict)
-                
-                # Use first response for metadata
-                first_response = responses[0]
-                
-                data = {
-                    "metadata": {
-                        "total": sum(resp.total for resp in responses) if is_multi_page else first_response.total,
-                        "pages_fetched": len(responses),
-                        "total_pages": first_response.total_pages,
-                        "items_per_page": first_response.items_per_page,
-                        "properties_count": len(all_properties),
-                        "export_date": datetime.now().isoformat(),
-                        "multi_page_fetch": is_multi_page,
-                        "keyword_filters": keywords if keywords else None,
-                        "properties_with_matches": matched_count if keywords else None
-                    },
-                    "properties": all_properties
-                }
-
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-
-                QMessageBox.information(self, self.tr('success'), 
-                                      self.tr('export_success').format(file_path))
-                self.statusBar().showMessage(self.tr('exported_json').format(file_path))
-            except Exception as e:
-                QMessageBox.critical(self, self.tr('export_error'), 
-                                   self.tr('export_failed').format(str(e)))
+            self.start_export(
+                ExportWorker(
+                    write_json,
+                    file_path,
+                    responses,
+                    keywords=self.get_keywords(),
+                    case_sensitive=self.case_sensitive_check.isChecked(),
+                    include_matches=self.highlight_matches_check.isChecked(),
+                    multi_page=is_multi_page
+                ),
+                'exported_json'
+            )
 
     def export_csv(self):
         """Export results to CSV"""
+        if self.is_exporting():
+            return
         # Check if we have multi-page or single-page results
         if self.all_responses:
             responses = self.all_responses
@@ -1192,84 +1839,95 @@ class IdealistaGUI(QMainWindow):
         )
 
         if file_path:
-            try:
-                # Get keywords for matching
-                keywords = self.get_keywords()
-                highlight_enabled = self.highlight_matches_check.isChecked()
-                
-                # Collect all properties from all responses
-                all_properties = []
-                for response in responses:
-                    all_properties.extend(response.element_list)
-                
-                # Define the fields we want to export in order
-                base_fieldnames = ['url', 'suggested_title', 'suggested_subtitle', 'price', 'operation', 
-                                 'province', 'municipality', 'description', 'status', 'typology']
-                
-                # Prepare cleaned property dictionaries
-                cleaned_properties = []
-                
-                for prop in all_properties:
-                    prop_dict = prop.to_dict()
-                    cleaned_row = {}
-                    
-                    # Extract specified fields
-                    cleaned_row['url'] = prop_dict.get('url', '')
-                    
-                    # Extract title and subtitle from suggestedTexts
-                    suggested_texts = prop_dict.get('suggestedTexts', {})
-                    if isinstance(suggested_texts, dict):
-                        cleaned_row['suggested_title'] = suggested_texts.get('title', '')
-                        cleaned_row['suggested_subtitle'] = suggested_texts.get('subtitle', '')
-                    else:
-                        cleaned_row['suggested_title'] = ''
-                        cleaned_row['suggested_subtitle'] = ''
-                    
-                    cleaned_row['price'] = prop_dict.get('price', '')
-                    cleaned_row['operation'] = prop_dict.get('operation', '')
-                    cleaned_row['province'] = prop_dict.get('province', '')
-                    cleaned_row['municipality'] = prop_dict.get('municipality', '')
-                    cleaned_row['description'] = prop_dict.get('description', '')
-                    cleaned_row['status'] = prop_dict.get('status', '')
-                    
-                    # Extract typology from detailedType
-                    detailed_type = prop_dict.get('detailedType', {})
-                    if isinstance(detailed_type, dict):
-                        cleaned_row['typology'] = detailed_type.get('typology', '')
-                    else:
-                        cleaned_row['typology'] = ''
-                    
-                    # Add keyword matching information if keywords are provided
-                    if keywords and highlight_enabled:
-                        has_match, matched_keywords = self.match_keywords_in_property(prop)
-                        cleaned_row['matched_keywords'] = ', '.join(matched_keywords) if has_match else ''
-                    
-                    cleaned_properties.append(cleaned_row)
-                
-                # Build final fieldnames list
-                fieldnames = base_fieldnames.copy()
-                # Add matched keywords column if applicable
-                if keywords and highlight_enabled:
-                    fieldnames.append('matched_keywords')
-
-                with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-                    writer.writeheader()
-                    
-                    for row in cleaned_properties:
-                        writer.writerow(row)
+            # Add a matched keywords column only when highlighting is enabled
+            keywords = self.get_keywords() if self.highlight_matches_check.isChecked() else []
+            properties = (prop for response in responses for prop in response.element_list)
+            self.start_export(
+                ExportWorker(write_csv, file_path, properties, keywords=keywords,
+                             case_sensitive=self.case_sensitive_check.isChecked()),
+                'exported_csv'
+            )
+
+    def start_export(self, worker, done_key):
+        """Run an export in the background, showing its progress next to the export buttons"""
+        total = self.all_responses.property_count if self.all_responses else len(self.last_response.element_list)
+        self.export_json_btn.setEnabled(False)
+        self.export_csv_btn.setEnabled(False)
+        self.export_progress.setRange(0, max(total, 1))
+        self.export_progress.setValue(0)
+        self.export_progress.setVisible(True)
+        self.cancel_export_btn.setVisible(True)
+
+        # Signals are tagged with their worker, to ignore any still queued from a previous export
+        self.export_worker = worker
+        worker.progress.connect(lambda written: self.on_export_progress(worker, written, total))
+        worker.finished.connect(lambda file_path: self.on_export_finished(worker, file_path, done_key))
+        worker.cancelled.connect(lambda: self.on_export_cancelled(worker))
+        worker.error.connect(lambda error_msg: self.on_export_error(worker, error_msg))
+        worker.start()
+
+    def on_export_progress(self, worker, written, total):
+        """Update the export progress"""
+        if worker is not self.export_worker:
+            return
+        self.export_progress.setValue(written)
+        self.statusBar().showMessage(self.tr('exporting').format(written, total))
 
-                QMessageBox.information(self, self.tr('success'),
-                                      self.tr('export_success').format(file_path))
-                self.statusBar().showMessage(self.tr('exported_csv').format(file_path))
-            except Exception as e:
-                QMessageBox.critical(self, self.tr('export_error'),
-                                   self.tr('export_failed').format(str(e)))
+    def on_export_finished(self, worker, file_path, done_key):
+        """Handle a completed export"""
+        if worker is not self.export_worker:
+            return
+        self.reset_export_controls()
+        QMessageBox.information(self, self.tr('success'), 
+                              self.tr('export_success').format(file_path))
+        self.statusBar().showMessage(self.tr(done_key).format(file_path))
+
+    def on_export_cancelled(self, worker):
+        """Handle a cancelled export"""
+        if worker is not self.export_worker:
+            return
+        self.reset_export_controls()
+        self.statusBar().showMessage(self.tr('export_cancelled'))
+
+    def on_export_error(self, worker, error_msg):
+        """Handle a failed export"""
+        if worker is not self.export_worker:
+            return
+        self.reset_export_controls()
+        QMessageBox.critical(self, self.tr('export_error'), 
+                           self.tr('export_failed').format(error_msg))
+
+    def reset_export_controls(self):
+        """Hide the export progress and enable the export buttons again"""
+        self.export_progress.setVisible(False)
+        self.cancel_export_btn.setVisible(False)
+        has_results = bool(self.all_responses or self.last_response)
+        self.export_json_btn.setEnabled(has_results)
+        self.export_csv_btn.setEnabled(has_results)
+
+    def is_exporting(self):
+        """Return whether an export is running (only one runs at a time)"""
+        return self.export_worker is not None and self.export_worker.isRunning()
+
+    def cancel_export(self):
+        """Cancel the running export"""
+        if self.export_worker is not None:
+            self.export_worker.cancel()
+
+    def stop_export(self):
+        """Cancel the running export and wait for it, before the results it reads are changed"""
+        worker = self.export_worker
+        if self.is_exporting():
+            worker.cancel()
+            worker.wait()
+            self.reset_export_controls()
+            self.statusBar().showMessage(self.tr('export_cancelled'))
 
 
 def main():
+    startup_timer = StartupTimer()
     app = QApplication(sys.argv)
-    window = IdealistaGUI()
+    window = IdealistaGUI(startup_timer)
     window.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,48 @@
+from idealista_api import Search
+from idealista_api.cache import ResultCache
+from idealista_api.models import Response
+
+SEARCH = Search("es", "sale", "homes")
+
+
+class FakeClient:
+    """Serves `pages` pages of two listings, with codes tagged by `snapshot`"""
+
+    hooks = []
+
+    def __init__(self, snapshot: str, pages: int):
+        self.snapshot = snapshot
+        self.pages = pages
+
+    def query(self, search):
+        page = search.num_page
+        elements = [{"propertyCode": f"{self.snapshot}{page}-{i}"} for i in range(2)] if page <= self.pages else []
+        return Response(
+            {"total": self.pages * 2, "totalPages": self.pages, "actualPage": page, "itemsPerPage": 2, "elementList": elements}
+        )
+
+
+def snapshots(responses):
+    return [response.element_list[0]["propertyCode"].split("-")[0] for response in responses]
+
+
+def test_stale_tail_dropped_when_totals_change():
+    client = FakeClient("A", 5)
+    cache = ResultCache()
+    cache.fetch(client, SEARCH)
+
+    client.snapshot, client.pages = "B", 3
+    assert snapshots(cache.fetch(client, SEARCH, max_pages=2)) == ["B1", "B2"]
+    assert snapshots(cache.fetch(client, SEARCH)) == ["B1", "B2", "B3"]
+
+
+def test_max_age_fast_path_needs_every_page():
+    client = FakeClient("A", 5)
+    cache = ResultCache(max_age=60)
+    assert len(cache.fetch(client, SEARCH, max_pages=2)) == 2
+    requests = cache.stats.requests
+
+    assert len(cache.fetch(client, SEARCH, max_pages=2)) == 2
+    assert cache.stats.requests == requests
+    assert len(cache.fetch(client, SEARCH)) == 5
+    assert cache.stats.requests > requests
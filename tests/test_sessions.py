@@ -0,0 +1,51 @@
+import threading
+
+from requests.adapters import HTTPAdapter
+
+from idealista_api import Idealista, Search, SessionPool
+from idealista_api.mock_server import MockIdealistaServer
+from idealista_api.replay import RecordingAdapter
+from idealista_api.sessions import PooledAdapter
+
+
+def test_thread_shards_share_mounted_recorder(tmp_path):
+    recorder = RecordingAdapter(tmp_path / "cassette.json")
+    with MockIdealistaServer(listings=10) as server:
+        client = Idealista(token=server.issue_token(), sessions=SessionPool(shard_by="thread"), base_url=server.url)
+        client.session.mount("http://", recorder)
+
+        errors = []
+
+        def query():
+            try:
+                client.query(Search("es", "sale", "homes"))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=query) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        client.close()
+
+    assert errors == []
+    assert len(recorder.interactions) == 3
+    recorder.save()
+    assert (tmp_path / "cassette.json").exists()
+
+
+def test_shards_rebuild_pooled_adapters():
+    pool = SessionPool(shard_by="country", pool_maxsize=7, idle_timeout=5)
+    plain = HTTPAdapter(pool_maxsize=3, max_retries=2)
+    pool.session.mount("https://api.example.com/", plain)
+
+    shard = pool.get("es")
+    pooled = shard.adapters["https://"]
+    assert isinstance(pooled, PooledAdapter)
+    assert pooled is not pool.session.adapters["https://"]
+    assert (pooled._pool_maxsize, pooled.idle_timeout) == (7, 5)
+    rebuilt = shard.adapters["https://api.example.com/"]
+    assert rebuilt is not plain
+    assert (type(rebuilt), rebuilt._pool_maxsize, rebuilt.max_retries.total) == (HTTPAdapter, 3, 2)
+    pool.close()